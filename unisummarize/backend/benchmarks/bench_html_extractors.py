@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Compare HTML-to-text extractor backends.
+
+Usage:
+    python benchmarks/bench_html_extractors.py path/to/saved_pages [--repeat 5]
+
+Every *.html / *.htm file under the directory is extracted by each backend.
+Without a directory, a synthetic corpus of article-like pages is used.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.html_extractors import HTML_EXTRACTORS, get_html_extractor
+
+
+def synthetic_corpus(pages: int = 20):
+    """Article-like pages with navigation, scripts and boilerplate."""
+    nav = "<nav><ul>" + "".join(f'<li><a href="/s{i}">Section {i}</a></li>' for i in range(40)) + "</ul></nav>"
+    script = "<script>" + "var x = 1;" * 500 + "</script><style>body { color: black; }</style>"
+    paragraphs = "".join(
+        f"<p>Paragraph {i} discusses the findings of the study in detail, with <b>emphasis</b> "
+        f"on methodology and the results reported by the authors.</p>"
+        for i in range(300)
+    )
+    footer = "<footer>" + "".join(f'<a href="/f{i}">Link {i}</a> ' for i in range(50)) + "</footer>"
+    page = f"<html><head><title>Article</title>{script}</head><body>{nav}<article>{paragraphs}</article>{footer}</body></html>"
+    return [(f"synthetic-{i}.html", page) for i in range(pages)]
+
+
+def load_corpus(directory: Path):
+    files = sorted(p for p in directory.rglob("*") if p.suffix.lower() in (".html", ".htm"))
+    return [(str(p.relative_to(directory)), p.read_text(encoding="utf-8", errors="replace")) for p in files]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", nargs="?", type=Path, help="directory of saved HTML pages")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per page and backend")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    if not corpus:
+        sys.exit("No HTML files found")
+    total_bytes = sum(len(html.encode("utf-8")) for _, html in corpus)
+    print(f"{len(corpus)} pages, {total_bytes / 1024 / 1024:.2f} MB, {args.repeat} runs each\n")
+    print(f"{'backend':<10} {'ms/page':>10} {'MB/s':>8} {'chars out':>12}")
+
+    for name in HTML_EXTRACTORS:
+        extractor = get_html_extractor(name)
+        if extractor.name != name:
+            print(f"{name:<10} {'unavailable':>10}")
+            continue
+        chars = 0
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for _, html in corpus:
+                chars += len(extractor.extract(html))
+        elapsed = time.perf_counter() - start
+        per_page = elapsed / (len(corpus) * args.repeat) * 1000
+        throughput = total_bytes * args.repeat / elapsed / 1024 / 1024
+        # Characters extracted from the whole corpus in one run
+        print(f"{name:<10} {per_page:>10.2f} {throughput:>8.1f} {chars // args.repeat:>12}")
+
+
+if __name__ == "__main__":
+    main()
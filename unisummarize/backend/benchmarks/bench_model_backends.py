@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Compare summarization model backends (torch, quantized, onnx) on CPU.
+
+Usage:
+    python benchmarks/bench_model_backends.py [path/to/texts] [--backends torch,quantized,onnx]
+
+Every *.txt file under the directory is summarized by each backend; a file
+foo.summary.txt next to foo.txt is used as its reference summary. Without a
+directory, a small synthetic corpus is used. Each backend runs in its own
+process, so load time and peak RSS are not shared between them.
+
+Quality is reported as ROUGE-1 and ROUGE-L F1 against the fp32 torch
+output (how much quantization or export changes the summaries) and, when
+references exist, against the references.
+"""
+import argparse
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import settings
+from services.model_backends import MODEL_BACKENDS, get_model_backend
+
+GENERATION_PARAMS = {
+    "max_length": settings.max_summary_length,
+    "min_length": settings.min_summary_length,
+    "do_sample": False
+}
+
+
+def synthetic_corpus():
+    topics = [
+        ("study", "The study followed 1,200 patients over five years and found that daily exercise "
+                  "reduced the risk of heart disease by a third compared with the control group."),
+        ("contract", "The agreement obliges the supplier to deliver the goods within thirty days and "
+                     "allows the buyer to terminate the contract if the delivery is late twice."),
+        ("earnings", "Quarterly revenue grew by twelve percent, driven by the cloud division, while "
+                     "operating costs rose more slowly thanks to the consolidation of data centers."),
+    ]
+    corpus = []
+    for name, sentence in topics:
+        text = " ".join(
+            f"{sentence} Section {i} repeats the main finding with additional detail about methods and context."
+            for i in range(8)
+        )
+        corpus.append((name, text, None))
+    return corpus
+
+
+def load_corpus(directory: Path):
+    corpus = []
+    for path in sorted(directory.rglob("*.txt")):
+        if path.name.endswith(".summary.txt"):
+            continue
+        reference = path.with_name(path.stem + ".summary.txt")
+        corpus.append((
+            str(path.relative_to(directory)),
+            path.read_text(encoding="utf-8", errors="replace"),
+            reference.read_text(encoding="utf-8") if reference.exists() else None
+        ))
+    return corpus
+
+
+def _tokens(text: str):
+    return text.lower().split()
+
+
+def rouge_1(candidate: str, reference: str) -> float:
+    overlap = sum((Counter(_tokens(candidate)) & Counter(_tokens(reference))).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / len(_tokens(candidate))
+    recall = overlap / len(_tokens(reference))
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge_l(candidate: str, reference: str) -> float:
+    a, b = _tokens(candidate), _tokens(reference)
+    if not a or not b:
+        return 0.0
+    # Longest common subsequence, one row at a time
+    previous = [0] * (len(b) + 1)
+    for token in a:
+        current = [0]
+        for j, other in enumerate(b):
+            current.append(previous[j] + 1 if token == other else max(previous[j + 1], current[j]))
+        previous = current
+    lcs = previous[-1]
+    if not lcs:
+        return 0.0
+    precision, recall = lcs / len(a), lcs / len(b)
+    return 2 * precision * recall / (precision + recall)
+
+
+def run_backend(name: str, corpus_dir, repeat: int) -> dict:
+    corpus = load_corpus(Path(corpus_dir)) if corpus_dir else synthetic_corpus()
+    backend = get_model_backend(name, settings.model_cache_dir)
+    if backend.name != name:
+        return {"backend": name, "unavailable": True}
+
+    start = time.perf_counter()
+    summarizer = backend.load(settings.summarization_model)
+    load_seconds = time.perf_counter() - start
+
+    # One untimed pass so lazy initialization is not counted
+    summarizer(corpus[0][1], truncation=True, **GENERATION_PARAMS)
+    timings, summaries = [], []
+    for _, text, _ in corpus:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = summarizer(text, truncation=True, **GENERATION_PARAMS)
+            timings.append(time.perf_counter() - start)
+        summaries.append(output[0]["summary_text"])
+
+    return {
+        "backend": name,
+        "load_seconds": load_seconds,
+        "ms_per_doc": statistics.median(timings) * 1000,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "summaries": summaries
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", nargs="?", type=Path, help="directory of .txt documents")
+    parser.add_argument("--backends", default=",".join(MODEL_BACKENDS), help="comma-separated backends")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per document")
+    parser.add_argument("--backend", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.backend:
+        print(json.dumps(run_backend(args.backend, args.corpus, args.repeat)))
+        return
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    if not corpus:
+        sys.exit("No .txt files found")
+    has_references = any(reference for _, _, reference in corpus)
+    print(f"{len(corpus)} documents, model {settings.summarization_model}, {args.repeat} runs each\n")
+    header = f"{'backend':<10} {'load s':>7} {'ms/doc':>9} {'RSS MB':>8} {'R1 vs fp32':>11} {'RL vs fp32':>11}"
+    print(header + (f" {'R1 vs ref':>10} {'RL vs ref':>10}" if has_references else ""))
+
+    baseline = None
+    for name in args.backends.split(","):
+        command = [sys.executable, __file__, "--backend", name, "--repeat", str(args.repeat)]
+        if args.corpus:
+            command.append(str(args.corpus))
+        result = json.loads(
+            subprocess.run(command, check=True, capture_output=True, text=True).stdout.strip().splitlines()[-1]
+        )
+        if result.get("unavailable"):
+            print(f"{name:<10} {'unavailable':>7}")
+            continue
+
+        summaries = result["summaries"]
+        if baseline is None and name == "torch":
+            baseline = summaries
+        line = f"{name:<10} {result['load_seconds']:>7.1f} {result['ms_per_doc']:>9.0f} {result['peak_rss_mb']:>8.0f}"
+        if baseline is not None:
+            line += f" {statistics.mean(map(rouge_1, summaries, baseline)):>11.3f}"
+            line += f" {statistics.mean(map(rouge_l, summaries, baseline)):>11.3f}"
+        else:
+            line += f" {'-':>11} {'-':>11}"
+        if has_references:
+            scored = [(summary, reference) for summary, (_, _, reference) in zip(summaries, corpus) if reference]
+            line += f" {statistics.mean(rouge_1(s, r) for s, r in scored):>10.3f}"
+            line += f" {statistics.mean(rouge_l(s, r) for s, r in scored):>10.3f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
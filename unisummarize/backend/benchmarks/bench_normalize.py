@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Compare text normalization: the former two-pass regex cleaner against
+normalize_text (NFKC + one translate pass + split/join).
+
+Usage:
+    python benchmarks/bench_normalize.py [path/to/texts] [--repeat 5]
+
+Every *.txt file under the directory is normalized by each cleaner.
+Without a directory, synthetic ASCII and mixed-script documents are used.
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.normalize import normalize_text
+
+
+def regex_clean(text: str) -> str:
+    """The cleaner normalize_text replaced."""
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[^\w\s.,!?-]', '', text)
+    return text.strip()
+
+
+def synthetic_corpus(size_mb: float = 4):
+    ascii_sentence = "The committee reviewed the quarterly report (revenue rose 12%) and approved it.\n\t "
+    accented_sentence = "Le comité a approuvé le rapport, déjà prêt à l’été.\n"
+    # Emoji, zero-width space and a ligature in every sentence: the worst case for NFKC
+    mixed_sentence = "Le comité a “approuvé” le rapport — 東京の売上は12%増加 ✨​ it’s ﬁnal.  "
+    documents = []
+    for name, sentence in (("ascii", ascii_sentence), ("accented", accented_sentence), ("mixed", mixed_sentence)):
+        repeats = int(size_mb * 1024 * 1024 / len(sentence.encode("utf-8")))
+        documents.append((name, sentence * repeats))
+    return documents
+
+
+def load_corpus(directory: Path):
+    files = sorted(directory.rglob("*.txt"))
+    return [(str(p.relative_to(directory)), p.read_text(encoding="utf-8", errors="replace")) for p in files]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", nargs="?", type=Path, help="directory of text files")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per document and cleaner")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    if not corpus:
+        sys.exit("No text files found")
+    print(f"{'document':<20} {'MB':>6} {'regex ms':>10} {'normalize ms':>13} {'speedup':>8}")
+
+    for name, text in corpus:
+        timings = []
+        for cleaner in (regex_clean, normalize_text):
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                cleaner(text)
+            timings.append((time.perf_counter() - start) / args.repeat * 1000)
+        size = len(text.encode("utf-8")) / 1024 / 1024
+        print(f"{name[:20]:<20} {size:>6.2f} {timings[0]:>10.1f} {timings[1]:>13.1f} {timings[0] / timings[1]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
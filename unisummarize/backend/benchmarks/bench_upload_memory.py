@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Measure peak RSS of PDF upload ingestion.
+
+Usage:
+    python benchmarks/bench_upload_memory.py [--size-mb 8] [--concurrency 4]
+
+Compares the old path (count the size in 8 KB reads, read the whole
+upload into bytes, wrap it in BytesIO) with the spooled path (size from
+the spooled file, extractors reading an mmap of it). Each mode runs in its
+own process; uploads are spooled to disk the way Starlette spools
+multipart files larger than 1 MB, and extracted concurrently on threads.
+
+Reported per upload: the peak of Python heap allocations (tracemalloc),
+which counts every copy of the document, and the peak RSS increase. RSS
+also counts pages of the mapped spool file, which are reclaimable page
+cache rather than process memory.
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tempfile import SpooledTemporaryFile
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+SPOOL_MAX_SIZE = 1024 * 1024
+# Token budget of a default chunked summary (CHUNK_TOKENS * MAX_CHUNKS)
+MAX_TOKENS = 900 * 8
+
+
+def make_pdf(size_mb: float) -> bytes:
+    """Multi-page PDF of roughly size_mb megabytes."""
+    line = "Findings of the study are reported with methodology and results " * 4
+    page_text = " ".join([line] * 16)
+    page_count = max(1, int(size_mb * 1024 * 1024 / (len(page_text) + 200)))
+
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for _ in range(page_count):
+        stream = f"BT /F1 10 Tf 72 720 Td ({page_text}) Tj ET".encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    parts = [b"%PDF-1.4\n"]
+    length = len(parts[0])
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(length)
+        chunk = b"%d 0 obj\n%s\nendobj\n" % (number, body)
+        parts.append(chunk)
+        length += len(chunk)
+    parts.append(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    parts.extend(b"%010d 00000 n \n" % offset for offset in offsets)
+    parts.append(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF" % (len(objects) + 1, length))
+    return b"".join(parts)
+
+
+def current_rss_kb() -> int:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * resource.getpagesize() // 1024
+
+
+def spool(pdf: bytes):
+    from starlette.datastructures import UploadFile
+
+    spooled = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    spooled.write(pdf)
+    spooled.seek(0)
+    return UploadFile(spooled, size=len(pdf), filename="upload.pdf")
+
+
+def ingest_copy(upload) -> int:
+    """Previous ingestion: size by reading every chunk, then a full read."""
+    from services.extraction import extract_pdf_text
+
+    size = 0
+    while chunk := upload.file.read(8192):
+        size += len(chunk)
+    upload.file.seek(0)
+    content = upload.file.read()
+    return len(extract_pdf_text(content, MAX_TOKENS))
+
+
+def ingest_mapped(upload) -> int:
+    """Spooled ingestion: size from the spool, extraction from an mmap."""
+    from services.extraction import extract_pdf_text
+    from utils.file_handler import FileHandler
+
+    FileHandler.get_upload_size(upload)
+    with FileHandler.open_upload(upload) as stream:
+        return len(extract_pdf_text(stream, MAX_TOKENS))
+
+
+def run_mode(mode: str, size_mb: float, concurrency: int) -> dict:
+    import services.extraction  # noqa: F401  (import cost outside the measurement)
+    import PyPDF2  # noqa: F401
+
+    uploads = [spool(make_pdf(size_mb)) for _ in range(concurrency)]
+    ingest = ingest_copy if mode == "copy" else ingest_mapped
+    baseline_kb = current_rss_kb()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(ingest, uploads))
+    elapsed = time.perf_counter() - start
+    _, heap_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "mode": mode,
+        "seconds": elapsed,
+        "heap_mb_per_upload": heap_peak / 1024 / 1024 / concurrency,
+        "rss_mb_per_upload": max(0, peak_kb - baseline_kb) / 1024 / concurrency,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=8, help="size of each uploaded PDF")
+    parser.add_argument("--concurrency", type=int, default=4, help="uploads ingested at once")
+    parser.add_argument("--mode", choices=["copy", "mapped"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.size_mb, args.concurrency)))
+        return
+
+    print(f"{args.concurrency} concurrent uploads of {args.size_mb:.1f} MB\n")
+    print(f"{'mode':<8} {'heap MB/upload':>15} {'RSS MB/upload':>14} {'seconds':>9}")
+    for mode in ("copy", "mapped"):
+        # A fresh process per mode so ru_maxrss is not shared between them
+        output = subprocess.run(
+            [sys.executable, __file__, "--mode", mode,
+             "--size-mb", str(args.size_mb), "--concurrency", str(args.concurrency)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"{mode:<8} {result['heap_mb_per_upload']:>15.1f} "
+            f"{result['rss_mb_per_upload']:>14.1f} {result['seconds']:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -25,6 +25,14 @@ CORS_ORIGINS = [origin.strip() for origin in CORS_ORIGINS]
 UPLOAD_DIR = BASE_DIR / "uploads"
 TEMP_DIR = BASE_DIR / "temp"
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+# Request body limits by exact path, e.g. "/api/summarize=1048576"; other routes use MAX_FILE_SIZE (0 = no limit)
+UPLOAD_ROUTE_LIMITS = {
+    path.strip(): int(limit)
+    for path, limit in (
+        item.split("=", 1) for item in os.getenv("UPLOAD_ROUTE_LIMITS", "").split(",") if "=" in item
+    )
+}
+UPLOAD_MAX_INFLIGHT_BYTES = int(os.getenv("UPLOAD_MAX_INFLIGHT_BYTES", 8 * MAX_FILE_SIZE))  # 0 disables
 
 # Create necessary directories
 UPLOAD_DIR.mkdir(exist_ok=True)
@@ -34,10 +42,80 @@ TEMP_DIR.mkdir(exist_ok=True)
 SUMMARIZATION_MODEL = os.getenv("SUMMARIZATION_MODEL", "facebook/bart-large-cnn")
 MAX_SUMMARY_LENGTH = int(os.getenv("MAX_SUMMARY_LENGTH", 130))
 MIN_SUMMARY_LENGTH = int(os.getenv("MIN_SUMMARY_LENGTH", 30))
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "True").lower() == "true"  # load model in background at startup
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "torch").lower()  # "torch", "quantized" (int8) or "onnx"
+# Rules routing requests to other models, e.g. "sshleifer/distilbart-cnn-12-6?max_tokens=512;...?format=paragraph"
+MODEL_ROUTES = os.getenv("MODEL_ROUTES", "")
+MODEL_CACHE_DIR = os.getenv("MODEL_CACHE_DIR", str(BASE_DIR / "models"))  # exported ONNX graphs
+
+# Inference Settings
+INFERENCE_EXECUTOR = os.getenv("INFERENCE_EXECUTOR", "thread").lower()  # "thread" or "process"
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", 1))
+INFERENCE_QUEUE_SIZE = int(os.getenv("INFERENCE_QUEUE_SIZE", 32))  # max queued + running jobs
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", 8))  # max inputs per generation batch
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", 20))  # batch collection window
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", 100))  # items per /api/summarize/batch request
+BULK_CONCURRENCY = int(os.getenv("BULK_CONCURRENCY", 16))  # items of one bulk request in flight at once
+
+# Generation Settings (MAX_SUMMARY_LENGTH also caps client-requested lengths)
+GENERATION_NUM_BEAMS = int(os.getenv("GENERATION_NUM_BEAMS", 4))
+GENERATION_MAX_BEAMS = int(os.getenv("GENERATION_MAX_BEAMS", 8))  # ceiling for client-requested beams
+GENERATION_LENGTH_PENALTY = float(os.getenv("GENERATION_LENGTH_PENALTY", 2.0))
+GENERATION_EARLY_STOPPING = os.getenv("GENERATION_EARLY_STOPPING", "True").lower() == "true"
+GENERATION_NO_REPEAT_NGRAM_SIZE = int(os.getenv("GENERATION_NO_REPEAT_NGRAM_SIZE", 3))
+GENERATION_MAX_NO_REPEAT_NGRAM_SIZE = int(os.getenv("GENERATION_MAX_NO_REPEAT_NGRAM_SIZE", 6))
+
+# Long Document Settings
+CHUNKING_ENABLED = os.getenv("CHUNKING_ENABLED", "True").lower() == "true"
+CHUNK_TOKENS = int(os.getenv("CHUNK_TOKENS", 900))  # must stay below the model context (1024)
+CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", 64))
+# Caps generation cost per document. With EXTRACTIVE_PRESELECT_TOKENS enabled, long inputs are
+# shrunk to that many tokens first, so at most about PRESELECT_TOKENS / CHUNK_TOKENS chunks are
+# generated and MAX_CHUNKS only applies with pre-selection disabled (0)
+MAX_CHUNKS = int(os.getenv("MAX_CHUNKS", 64))
+
+# Extractive Settings
+EXTRACTIVE_METHOD = os.getenv("EXTRACTIVE_METHOD", "textrank").lower()  # "textrank" or "tfidf"
+# Longer inputs are shrunk to their most salient sentences before chunking (0 disables); PDF
+# extraction then stops at 4x this budget instead of CHUNK_TOKENS * MAX_CHUNKS
+EXTRACTIVE_PRESELECT_TOKENS = int(os.getenv("EXTRACTIVE_PRESELECT_TOKENS", 3600))
+EXTRACTIVE_SENTENCES = int(os.getenv("EXTRACTIVE_SENTENCES", 5))  # sentences in mode=extractive summaries
+
+# Extraction Settings
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", min(4, os.cpu_count() or 1)))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", 64))  # use the process pool above this
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", 16))
+
+# URL Fetch Settings
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", 10))  # seconds
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 100))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", 10))
+HTTP_MAX_RESPONSE_BYTES = int(os.getenv("HTTP_MAX_RESPONSE_BYTES", 5 * 1024 * 1024))  # 5MB
+
+# HTML Extraction Settings
+HTML_EXTRACTOR = os.getenv("HTML_EXTRACTOR", "lxml").lower()  # "lxml", "streaming" or "bs4"
+
+# Summary Cache Settings
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "True").lower() == "true"
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 1024))
+CACHE_TTL = int(os.getenv("CACHE_TTL", 86400))  # 24 hours in seconds
+CACHE_DISK_PATH = os.getenv("CACHE_DISK_PATH") or None  # e.g. cache/summaries.sqlite3
+CACHE_DISK_MAX_ENTRIES = int(os.getenv("CACHE_DISK_MAX_ENTRIES", 100000))  # oldest rows beyond this are pruned
+CACHE_DISK_PRUNE_INTERVAL = float(os.getenv("CACHE_DISK_PRUNE_INTERVAL", 300))  # seconds
+
+# URL Fetch Cache Settings (ETag / Last-Modified / Cache-Control)
+FETCH_CACHE_ENABLED = os.getenv("FETCH_CACHE_ENABLED", "True").lower() == "true"
+FETCH_CACHE_MAX_ENTRIES = int(os.getenv("FETCH_CACHE_MAX_ENTRIES", 256))
+FETCH_CACHE_MAX_BYTES = int(os.getenv("FETCH_CACHE_MAX_BYTES", 64 * 1024 * 1024))  # 64MB
 
 # OCR Settings
 OCR_LANGUAGES = os.getenv("OCR_LANGUAGES", "en").split(",")
 OCR_LANGUAGES = [lang.strip() for lang in OCR_LANGUAGES]
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", 1))  # number of EasyOCR reader instances
+OCR_MAX_IMAGE_SIDE = int(os.getenv("OCR_MAX_IMAGE_SIDE", 2048))  # downscale larger images
+OCR_BATCH_SIZE = int(os.getenv("OCR_BATCH_SIZE", 4))
+OCR_BATCH_WAIT_MS = float(os.getenv("OCR_BATCH_WAIT_MS", 20))
+OCR_GPU = os.getenv("OCR_GPU", "False").lower() == "true"
 
 # Security Settings
 API_KEY_HEADER = "X-API-Key"
@@ -46,10 +124,29 @@ API_KEY = os.getenv("API_KEY")
 # Rate Limiting
 RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "True").lower() == "true"
 RATE_LIMIT = int(os.getenv("RATE_LIMIT", 100))  # requests per hour
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()  # "memory", "sqlite" or "redis"
+RATE_LIMIT_SQLITE_PATH = os.getenv("RATE_LIMIT_SQLITE_PATH", str(TEMP_DIR / "rate_limits.sqlite3"))
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+RATE_LIMIT_BATCH_SIZE = int(os.getenv("RATE_LIMIT_BATCH_SIZE", 10))  # increments per shared-store write
+RATE_LIMIT_FLUSH_INTERVAL = float(os.getenv("RATE_LIMIT_FLUSH_INTERVAL", 1.0))  # seconds
+RATE_LIMIT_RETRY_INTERVAL = float(os.getenv("RATE_LIMIT_RETRY_INTERVAL", 30))  # seconds to skip a failed store
+
+# Logging Settings
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))  # records buffered for the log writer thread
+LOG_QUEUE_POLICY = os.getenv("LOG_QUEUE_POLICY", "drop").lower()  # "drop" or "block" when full
+LOG_BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE", 256))  # records written per batch
+LOG_REQUEST_DETAILS = os.getenv("LOG_REQUEST_DETAILS", "False").lower() == "true"  # log request headers
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", 0.0))  # fraction of requests logged in detail
+LOG_SLOW_REQUEST_MS = float(os.getenv("LOG_SLOW_REQUEST_MS", 2000))  # slower requests are logged in detail (0 disables)
 
 # Cleanup Settings
 TEMP_FILE_TTL = 3600  # 1 hour in seconds
 
+# Background Job Settings
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))  # jobs processed concurrently
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", 100))  # queued jobs before submissions are rejected
+JOB_DIR = os.getenv("JOB_DIR", str(TEMP_DIR / "jobs"))  # persisted job inputs and results
+
 class Settings:
     """
     Application settings class
@@ -63,14 +160,77 @@ class Settings:
         self.upload_dir = UPLOAD_DIR
         self.temp_dir = TEMP_DIR
         self.max_file_size = MAX_FILE_SIZE
+        self.upload_route_limits = UPLOAD_ROUTE_LIMITS
+        self.upload_max_inflight_bytes = UPLOAD_MAX_INFLIGHT_BYTES
         self.summarization_model = SUMMARIZATION_MODEL
         self.max_summary_length = MAX_SUMMARY_LENGTH
         self.min_summary_length = MIN_SUMMARY_LENGTH
+        self.model_warmup = MODEL_WARMUP
+        self.model_backend = MODEL_BACKEND
+        self.model_cache_dir = MODEL_CACHE_DIR
+        self.model_routes = MODEL_ROUTES
+        self.inference_executor = INFERENCE_EXECUTOR
+        self.inference_workers = INFERENCE_WORKERS
+        self.inference_queue_size = INFERENCE_QUEUE_SIZE
+        self.batch_max_size = BATCH_MAX_SIZE
+        self.batch_max_wait_ms = BATCH_MAX_WAIT_MS
+        self.bulk_max_items = BULK_MAX_ITEMS
+        self.bulk_concurrency = BULK_CONCURRENCY
+        self.generation_num_beams = GENERATION_NUM_BEAMS
+        self.generation_max_beams = GENERATION_MAX_BEAMS
+        self.generation_length_penalty = GENERATION_LENGTH_PENALTY
+        self.generation_early_stopping = GENERATION_EARLY_STOPPING
+        self.generation_no_repeat_ngram_size = GENERATION_NO_REPEAT_NGRAM_SIZE
+        self.generation_max_no_repeat_ngram_size = GENERATION_MAX_NO_REPEAT_NGRAM_SIZE
+        self.chunking_enabled = CHUNKING_ENABLED
+        self.chunk_tokens = CHUNK_TOKENS
+        self.chunk_overlap = CHUNK_OVERLAP
+        self.max_chunks = MAX_CHUNKS
+        self.extractive_method = EXTRACTIVE_METHOD
+        self.extractive_preselect_tokens = EXTRACTIVE_PRESELECT_TOKENS
+        self.extractive_sentences = EXTRACTIVE_SENTENCES
+        self.extraction_workers = EXTRACTION_WORKERS
+        self.pdf_parallel_min_pages = PDF_PARALLEL_MIN_PAGES
+        self.pdf_pages_per_task = PDF_PAGES_PER_TASK
+        self.http_timeout = HTTP_TIMEOUT
+        self.http_max_connections = HTTP_MAX_CONNECTIONS
+        self.http_max_connections_per_host = HTTP_MAX_CONNECTIONS_PER_HOST
+        self.http_max_response_bytes = HTTP_MAX_RESPONSE_BYTES
+        self.html_extractor = HTML_EXTRACTOR
+        self.cache_enabled = CACHE_ENABLED
+        self.cache_max_entries = CACHE_MAX_ENTRIES
+        self.cache_ttl = CACHE_TTL
+        self.cache_disk_path = CACHE_DISK_PATH
+        self.cache_disk_max_entries = CACHE_DISK_MAX_ENTRIES
+        self.cache_disk_prune_interval = CACHE_DISK_PRUNE_INTERVAL
+        self.fetch_cache_enabled = FETCH_CACHE_ENABLED
+        self.fetch_cache_max_entries = FETCH_CACHE_MAX_ENTRIES
+        self.fetch_cache_max_bytes = FETCH_CACHE_MAX_BYTES
         self.ocr_languages = OCR_LANGUAGES
+        self.ocr_workers = OCR_WORKERS
+        self.ocr_max_image_side = OCR_MAX_IMAGE_SIDE
+        self.ocr_batch_size = OCR_BATCH_SIZE
+        self.ocr_batch_wait_ms = OCR_BATCH_WAIT_MS
+        self.ocr_gpu = OCR_GPU
         self.api_key = API_KEY
         self.rate_limit_enabled = RATE_LIMIT_ENABLED
         self.rate_limit = RATE_LIMIT
+        self.rate_limit_backend = RATE_LIMIT_BACKEND
+        self.rate_limit_sqlite_path = RATE_LIMIT_SQLITE_PATH
+        self.rate_limit_redis_url = RATE_LIMIT_REDIS_URL
+        self.rate_limit_batch_size = RATE_LIMIT_BATCH_SIZE
+        self.rate_limit_flush_interval = RATE_LIMIT_FLUSH_INTERVAL
+        self.rate_limit_retry_interval = RATE_LIMIT_RETRY_INTERVAL
+        self.log_queue_size = LOG_QUEUE_SIZE
+        self.log_queue_policy = LOG_QUEUE_POLICY
+        self.log_batch_size = LOG_BATCH_SIZE
+        self.log_request_details = LOG_REQUEST_DETAILS
+        self.log_sample_rate = LOG_SAMPLE_RATE
+        self.log_slow_request_ms = LOG_SLOW_REQUEST_MS
         self.temp_file_ttl = TEMP_FILE_TTL
+        self.job_workers = JOB_WORKERS
+        self.job_queue_size = JOB_QUEUE_SIZE
+        self.job_dir = JOB_DIR
 
     def dict(self):
         """Return settings as dictionary"""
@@ -83,13 +243,75 @@ class Settings:
             "upload_dir": str(self.upload_dir),
             "temp_dir": str(self.temp_dir),
             "max_file_size": self.max_file_size,
+            "upload_route_limits": self.upload_route_limits,
+            "upload_max_inflight_bytes": self.upload_max_inflight_bytes,
             "summarization_model": self.summarization_model,
             "max_summary_length": self.max_summary_length,
             "min_summary_length": self.min_summary_length,
+            "model_warmup": self.model_warmup,
+            "model_backend": self.model_backend,
+            "model_cache_dir": self.model_cache_dir,
+            "model_routes": self.model_routes,
+            "inference_executor": self.inference_executor,
+            "inference_workers": self.inference_workers,
+            "inference_queue_size": self.inference_queue_size,
+            "batch_max_size": self.batch_max_size,
+            "batch_max_wait_ms": self.batch_max_wait_ms,
+            "bulk_max_items": self.bulk_max_items,
+            "bulk_concurrency": self.bulk_concurrency,
+            "generation_num_beams": self.generation_num_beams,
+            "generation_max_beams": self.generation_max_beams,
+            "generation_length_penalty": self.generation_length_penalty,
+            "generation_early_stopping": self.generation_early_stopping,
+            "generation_no_repeat_ngram_size": self.generation_no_repeat_ngram_size,
+            "generation_max_no_repeat_ngram_size": self.generation_max_no_repeat_ngram_size,
+            "chunking_enabled": self.chunking_enabled,
+            "chunk_tokens": self.chunk_tokens,
+            "chunk_overlap": self.chunk_overlap,
+            "max_chunks": self.max_chunks,
+            "extractive_method": self.extractive_method,
+            "extractive_preselect_tokens": self.extractive_preselect_tokens,
+            "extractive_sentences": self.extractive_sentences,
+            "extraction_workers": self.extraction_workers,
+            "pdf_parallel_min_pages": self.pdf_parallel_min_pages,
+            "pdf_pages_per_task": self.pdf_pages_per_task,
+            "http_timeout": self.http_timeout,
+            "http_max_connections": self.http_max_connections,
+            "http_max_connections_per_host": self.http_max_connections_per_host,
+            "http_max_response_bytes": self.http_max_response_bytes,
+            "html_extractor": self.html_extractor,
+            "cache_enabled": self.cache_enabled,
+            "cache_max_entries": self.cache_max_entries,
+            "cache_ttl": self.cache_ttl,
+            "cache_disk_path": self.cache_disk_path,
+            "cache_disk_max_entries": self.cache_disk_max_entries,
+            "cache_disk_prune_interval": self.cache_disk_prune_interval,
+            "fetch_cache_enabled": self.fetch_cache_enabled,
+            "fetch_cache_max_entries": self.fetch_cache_max_entries,
+            "fetch_cache_max_bytes": self.fetch_cache_max_bytes,
             "ocr_languages": self.ocr_languages,
+            "ocr_workers": self.ocr_workers,
+            "ocr_max_image_side": self.ocr_max_image_side,
+            "ocr_batch_size": self.ocr_batch_size,
+            "ocr_batch_wait_ms": self.ocr_batch_wait_ms,
+            "ocr_gpu": self.ocr_gpu,
             "rate_limit_enabled": self.rate_limit_enabled,
             "rate_limit": self.rate_limit,
-            "temp_file_ttl": self.temp_file_ttl
+            "rate_limit_backend": self.rate_limit_backend,
+            "rate_limit_sqlite_path": self.rate_limit_sqlite_path,
+            "rate_limit_batch_size": self.rate_limit_batch_size,
+            "rate_limit_flush_interval": self.rate_limit_flush_interval,
+            "rate_limit_retry_interval": self.rate_limit_retry_interval,
+            "log_queue_size": self.log_queue_size,
+            "log_queue_policy": self.log_queue_policy,
+            "log_batch_size": self.log_batch_size,
+            "log_request_details": self.log_request_details,
+            "log_sample_rate": self.log_sample_rate,
+            "log_slow_request_ms": self.log_slow_request_ms,
+            "temp_file_ttl": self.temp_file_ttl,
+            "job_workers": self.job_workers,
+            "job_queue_size": self.job_queue_size,
+            "job_dir": self.job_dir
         }
 
 # Create settings instance
@@ -1,15 +1,25 @@
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
 from enum import Enum
-from typing import Optional
+from typing import BinaryIO, List, Optional
+from datetime import datetime
+import json
+from contextlib import asynccontextmanager
 import uvicorn
 
 from config import settings
+from services.generation import GenerationOptions
 from services.summarizer import summarizer_service
+from services.inference_pool import InferenceQueueFull
+from services.jobs import Job, JobQueueFull, job_manager
 from utils.file_handler import FileHandler, validate_url
-from utils.logger import RequestLogMiddleware, log_error, log_info
+from utils.http_client import FetchError, http_fetcher
+from utils.logger import RequestLogMiddleware, get_log_stats, log_error, log_info, log_warning
+from utils.metrics import Gauge, registry, set_request_labels
 from middleware.auth import AuthMiddleware
+from middleware.upload_limit import UploadLimitMiddleware, upload_budget
 
 # Models
 class InputType(str, Enum):
@@ -30,20 +40,70 @@ class Format(str, Enum):
     paragraph = "paragraph"
     detailed = "detailed"
 
+class Mode(str, Enum):
+    abstractive = "abstractive"
+    extractive = "extractive"
+
+class Priority(str, Enum):
+    high = "high"
+    normal = "normal"
+    low = "low"
+
 class SummarizeRequest(BaseModel):
     input_type: InputType
     content: str
     domain: Domain
     format: Format
+    mode: Mode = Mode.abstractive
+    # Generation overrides; lengths and beams are capped by the server
+    max_length: Optional[int] = Field(None, ge=1)
+    min_length: Optional[int] = Field(None, ge=0)
+    num_beams: Optional[int] = Field(None, ge=1)
+    length_penalty: Optional[float] = Field(None, ge=-10, le=10)
+    early_stopping: Optional[bool] = None
+    no_repeat_ngram_size: Optional[int] = Field(None, ge=0)
+
+    def generation_options(self) -> Optional[GenerationOptions]:
+        """The requested generation overrides, or None to use the server's settings."""
+        requested = self.model_dump(include=set(GenerationOptions.FIELDS), exclude_none=True)
+        return GenerationOptions(**requested) if requested else None
 
 class SummarizeResponse(BaseModel):
     summary: str
 
+class BatchSummarizeRequest(BaseModel):
+    items: List[SummarizeRequest]
+
+IMAGE_EXTENSIONS = ['png', 'jpg', 'jpeg']
+
+async def run_summary_job(job: Job, content: BinaryIO) -> str:
+    """Summarize the uploaded file of a background job."""
+    is_image = FileHandler.get_file_extension(job.filename) in IMAGE_EXTENSIONS
+    set_request_labels(InputType.image if is_image else InputType.file, job.domain, job.format_type)
+    on_stage = lambda stage: job_manager.set_stage(job, stage)
+    if is_image:
+        return await summarizer_service.summarize_image(content.read(), job.domain, job.format_type, on_stage=on_stage)
+    return await summarizer_service.summarize_file(
+        content, job.filename, job.domain, job.format_type, on_stage=on_stage
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown hooks."""
+    if settings.model_warmup:
+        # Load the model in the background so the port binds immediately
+        summarizer_service.warm_up()
+    await job_manager.start(run_summary_job)
+    yield
+    await job_manager.stop()
+    await http_fetcher.close()
+
 # Create FastAPI app
 app = FastAPI(
     title="UniSummarize API",
     description="AI-powered text summarization API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add middleware
@@ -55,7 +115,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.middleware("http")(AuthMiddleware())
-app.middleware("http")(RequestLogMiddleware())
+app.add_middleware(UploadLimitMiddleware)
+app.add_middleware(RequestLogMiddleware)
 
 # Routes
 @app.post("/api/summarize", response_model=SummarizeResponse)
@@ -63,18 +124,22 @@ async def summarize(request: SummarizeRequest):
     """
     Summarize text based on input type, domain, and format.
     """
+    set_request_labels(request.input_type, request.domain, request.format)
     try:
         log_info("Processing summarization request", {
             "input_type": request.input_type,
             "domain": request.domain,
-            "format": request.format
+            "format": request.format,
+            "mode": request.mode
         })
 
         if request.input_type == InputType.text:
             summary = await summarizer_service.summarize_text(
                 request.content,
                 request.domain,
-                request.format
+                request.format,
+                request.mode,
+                request.generation_options()
             )
         elif request.input_type == InputType.url:
             # Validate URL first
@@ -82,7 +147,9 @@ async def summarize(request: SummarizeRequest):
             summary = await summarizer_service.summarize_url(
                 request.content,
                 request.domain,
-                request.format
+                request.format,
+                request.mode,
+                request.generation_options()
             )
         else:
             raise HTTPException(
@@ -93,6 +160,148 @@ async def summarize(request: SummarizeRequest):
         log_info("Summarization completed successfully")
         return {"summary": summary}
 
+    except HTTPException:
+        raise
+    except InferenceQueueFull as e:
+        log_warning(str(e), {"input_type": request.input_type})
+        raise HTTPException(status_code=503, detail=str(e))
+    except FetchError as e:
+        log_warning(str(e), {"url": request.content})
+        raise HTTPException(status_code=400, detail=f"URL not accessible: {str(e)}")
+    except Exception as e:
+        log_error(e, {
+            "input_type": request.input_type,
+            "domain": request.domain,
+            "format": request.format
+        })
+        raise HTTPException(status_code=500, detail=str(e))
+
+def item_error(error: Exception, item: SummarizeRequest) -> dict:
+    """Error entry for one item of a bulk request, mapped like the single-item endpoint."""
+    if isinstance(error, HTTPException):
+        status_code, detail = error.status_code, error.detail
+    elif isinstance(error, InferenceQueueFull):
+        log_warning(str(error), {"input_type": item.input_type})
+        status_code, detail = 503, str(error)
+    elif isinstance(error, FetchError):
+        log_warning(str(error), {"url": item.content})
+        status_code, detail = 400, f"URL not accessible: {str(error)}"
+    else:
+        log_error(error, {"input_type": item.input_type, "domain": item.domain, "format": item.format})
+        status_code, detail = 500, str(error)
+    return {"status_code": status_code, "detail": detail}
+
+@app.post("/api/summarize/batch")
+async def summarize_batch(request: BatchSummarizeRequest, stream: bool = False):
+    """
+    Summarize many text and URL items in one call.
+
+    Results keep the order of the items, and each one carries either a
+    summary or its own error. With ?stream=true results are sent as NDJSON
+    lines, in completion order, as soon as each item finishes.
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="No items to summarize")
+    if len(request.items) > settings.bulk_max_items:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many items. Maximum items per request: {settings.bulk_max_items}"
+        )
+
+    log_info("Processing bulk summarization request", {"items": len(request.items), "stream": stream})
+
+    # Items that fail validation get their error without reaching the model
+    invalid = {}
+    runnable = []
+    for index, item in enumerate(request.items):
+        try:
+            if item.input_type == InputType.url:
+                validate_url(item.content)
+            elif item.input_type != InputType.text:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Invalid input type for this endpoint. Use /api/summarize/file for file uploads."
+                )
+            runnable.append(index)
+        except HTTPException as e:
+            invalid[index] = {"index": index, "error": item_error(e, item)}
+
+    async def results():
+        for result in invalid.values():
+            yield result
+        items = [
+            (request.items[index].input_type, request.items[index].content,
+             request.items[index].domain, request.items[index].format, request.items[index].mode,
+             request.items[index].generation_options())
+            for index in runnable
+        ]
+        async for position, summary, error in summarizer_service.summarize_many(items, settings.bulk_concurrency):
+            index = runnable[position]
+            if error is None:
+                yield {"index": index, "summary": summary}
+            else:
+                yield {"index": index, "error": item_error(error, request.items[index])}
+
+    if stream:
+        async def ndjson():
+            async for result in results():
+                yield json.dumps(result) + "\n"
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    ordered = [None] * len(request.items)
+    async for result in results():
+        ordered[result["index"]] = result
+    failed = sum(1 for result in ordered if "error" in result)
+    log_info("Bulk summarization completed", {"items": len(ordered), "failed": failed})
+    return {"results": ordered}
+
+def sse_event(event: str, data: dict) -> str:
+    """Encode one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/api/summarize/stream")
+async def summarize_stream(request: SummarizeRequest):
+    """
+    Summarize text or URL content as server-sent events.
+
+    Emits "partial" events with chunk summaries (chunked mode), "delta"
+    events with pieces of the formatted summary as tokens are generated and
+    a final "done" event with the complete summary. Errors before the first
+    event are returned as normal HTTP errors; later ones as an "error" event.
+    """
+    set_request_labels(request.input_type, request.domain, request.format)
+    try:
+        log_info("Processing streaming summarization request", {
+            "input_type": request.input_type,
+            "domain": request.domain,
+            "format": request.format
+        })
+
+        if request.input_type == InputType.text:
+            text = request.content
+        elif request.input_type == InputType.url:
+            validate_url(request.content)
+            text = await summarizer_service.fetch_url_text(request.content)
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid input type for this endpoint. Use /api/summarize/file for file uploads."
+            )
+
+        events = summarizer_service.stream_summary(
+            text, request.domain, request.format, request.mode, request.generation_options()
+        )
+        # Wait for the first output so setup errors still map to status codes
+        first = await events.__anext__()
+
+    except HTTPException:
+        raise
+    except InferenceQueueFull as e:
+        log_warning(str(e), {"input_type": request.input_type})
+        raise HTTPException(status_code=503, detail=str(e))
+    except FetchError as e:
+        log_warning(str(e), {"url": request.content})
+        raise HTTPException(status_code=400, detail=f"URL not accessible: {str(e)}")
     except Exception as e:
         log_error(e, {
             "input_type": request.input_type,
@@ -101,11 +310,31 @@ async def summarize(request: SummarizeRequest):
         })
         raise HTTPException(status_code=500, detail=str(e))
 
+    async def event_stream():
+        yield sse_event(*first)
+        try:
+            async for event in events:
+                yield sse_event(*event)
+            log_info("Streaming summarization completed successfully")
+        except Exception as e:
+            log_error(e, {"input_type": request.input_type})
+            status_code = 503 if isinstance(e, InferenceQueueFull) else 500
+            yield sse_event("error", {"status_code": status_code, "detail": str(e)})
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/api/summarize/file", response_model=SummarizeResponse)
 async def summarize_file(
     file: UploadFile = File(...),
     domain: Domain = Form(...),
     format: Format = Form(...),
+    mode: Mode = Form(Mode.abstractive),
     file_handler: FileHandler = Depends(FileHandler)
 ):
     """
@@ -122,29 +351,35 @@ async def summarize_file(
         # Validate file
         await file_handler.validate_file(file)
         
-        # Read file content
-        file_content = await file.read()
         file_extension = file_handler.get_file_extension(file.filename)
+        is_image = file_extension in IMAGE_EXTENSIONS
+        set_request_labels(InputType.image if is_image else InputType.file, domain, format)
         
-        if file_extension in ['png', 'jpg', 'jpeg']:
+        if is_image:
             summary = await summarizer_service.summarize_image(
-                file_content,
-                domain,
-                format
-            )
-        else:  # pdf or docx
-            summary = await summarizer_service.summarize_file(
-                file_content,
-                file.filename,
+                await file.read(),
                 domain,
-                format
+                format,
+                mode=mode
             )
+        else:  # pdf or docx, read in place from the spooled upload
+            with file_handler.open_upload(file) as file_content:
+                summary = await summarizer_service.summarize_file(
+                    file_content,
+                    file.filename,
+                    domain,
+                    format,
+                    mode=mode
+                )
 
         log_info("File summarization completed successfully", {
             "filename": file.filename
         })
         return {"summary": summary}
         
+    except InferenceQueueFull as e:
+        log_warning(str(e), {"filename": file.filename})
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         log_error(e, {
             "filename": file.filename,
@@ -156,6 +391,76 @@ async def summarize_file(
     finally:
         await file.close()
 
+def job_status(job: Job) -> dict:
+    """Public view of a job's state."""
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "stage": job.stage,
+        "queue_position": job_manager.queue_position(job),
+        "filename": job.filename,
+        "created_at": datetime.utcfromtimestamp(job.created_at).isoformat(),
+        "started_at": datetime.utcfromtimestamp(job.started_at).isoformat() if job.started_at else None,
+        "finished_at": datetime.utcfromtimestamp(job.finished_at).isoformat() if job.finished_at else None,
+        "error": job.error,
+        "result_url": f"/api/jobs/{job.id}/result"
+    }
+
+@app.post("/api/jobs", status_code=202)
+async def submit_job(
+    file: UploadFile = File(...),
+    domain: Domain = Form(...),
+    format: Format = Form(...),
+    priority: Priority = Form(Priority.normal),
+    file_handler: FileHandler = Depends(FileHandler)
+):
+    """
+    Queue a file (PDF, DOCX, image) for background summarization.
+    Poll /api/jobs/{job_id} for progress and fetch the summary from
+    /api/jobs/{job_id}/result.
+    """
+    try:
+        await file_handler.validate_file(file)
+        with file_handler.open_upload(file) as file_content:
+            job = await job_manager.submit(file_content, file.filename, domain.value, format.value, priority.value)
+        return job_status(job)
+
+    except HTTPException:
+        raise
+    except JobQueueFull as e:
+        log_warning(str(e), {"filename": file.filename})
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        log_error(e, {"filename": file.filename})
+        raise HTTPException(status_code=500, detail=str(e))
+
+    finally:
+        await file.close()
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Report the status and progress of a background job.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or result expired")
+    return job_status(job)
+
+@app.get("/api/jobs/{job_id}/result", response_model=SummarizeResponse)
+async def get_job_result(job_id: str):
+    """
+    Return the summary of a completed background job.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or result expired")
+    if job.status == "failed":
+        raise HTTPException(status_code=409, detail=f"Job failed: {job.error}")
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    return {"summary": job.summary}
+
 # Health check endpoint
 @app.get("/api/health")
 async def health_check():
@@ -163,15 +468,15 @@ async def health_check():
     Check the health status of the API and its dependencies.
     """
     try:
-        # Check if summarizer service is ready
-        model_status = "online" if summarizer_service.summarizer is not None else "offline"
-        
+        # Report model readiness without triggering a load
         return {
             "status": "healthy",
+            "ready": summarizer_service.is_ready,
             "timestamp": datetime.utcnow().isoformat(),
             "services": {
                 "api": "online",
-                "summarizer": model_status
+                "summarizer": summarizer_service.status,
+                "inference_queue": summarizer_service.inference_pool.pending
             },
             "version": "1.0.0"
         }
@@ -182,6 +487,48 @@ async def health_check():
             "error": str(e)
         }
 
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """
+    Report summary cache and URL fetch cache counters.
+    """
+    stats = {"enabled": False}
+    if summarizer_service.cache is not None:
+        stats = {"enabled": True, **summarizer_service.cache.stats()}
+    if summarizer_service.fetch_cache is not None:
+        stats["fetch"] = summarizer_service.fetch_cache.stats()
+    return stats
+
+@app.get("/api/models/stats")
+async def model_stats():
+    """
+    Report the model routing rules and per-model traffic and latency.
+    """
+    return summarizer_service.router.stats()
+
+registry.register(Gauge(
+    "unisummarize_inference_queue_pending",
+    "Generation jobs queued or running on the inference pool.",
+    lambda: summarizer_service.inference_pool.pending
+))
+registry.register(Gauge(
+    "unisummarize_upload_bytes_in_flight",
+    "Request body bytes currently being received or processed.",
+    lambda: upload_budget.in_flight
+))
+registry.register(Gauge(
+    "unisummarize_log_records_dropped",
+    "Log records dropped because the log queue was full.",
+    lambda: get_log_stats()["dropped"]
+))
+
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Expose stage latency histograms and counters in the Prometheus text format.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 # Error handlers
 from fastapi.responses import JSONResponse
 
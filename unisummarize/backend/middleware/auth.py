@@ -1,76 +1,184 @@
 from fastapi import Request, HTTPException
+from fastapi.responses import JSONResponse
 from fastapi.security import APIKeyHeader
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
+import asyncio
+import math
 import time
 from datetime import datetime, timedelta
 import jwt
 from config import settings
+from utils.logger import log_warning
+from middleware.rate_limit_store import (
+    BatchingRateLimitStore,
+    MemoryRateLimitStore,
+    RateLimitStore,
+    RedisRateLimitStore,
+    SQLiteRateLimitStore,
+)
 
 # API Key authentication
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
-# Store for rate limiting
-# In production, this should be replaced with Redis
+# Store for rate limiting: client_id -> [window_start, current_count, previous_count]
+# Used by the in-process backend; set RATE_LIMIT_BACKEND to share limits across workers
 rate_limit_store = {}
 
+# Threads running checks against shared (sqlite, redis) stores
+RATE_LIMIT_STORE_WORKERS = 4
+
+class RateLimitResult:
+    """Outcome of a rate limit check."""
+    def __init__(self, limited: bool, limit: int, remaining: int, reset_at: float):
+        self.limited = limited
+        self.limit = limit
+        self.remaining = remaining
+        self.reset_at = reset_at
+
 class RateLimiter:
-    def __init__(self, requests_per_hour: int = 100):
+    """
+    Sliding-window-counter rate limiter.
+
+    Each client keeps only the counts of the current and previous fixed
+    windows. The request rate is estimated by weighting the previous count by
+    how much of it still overlaps the sliding window, which makes every check
+    O(1) in time and memory. Idle clients are evicted by an occasional sweep
+    rather than on every request. Counts live in a pluggable RateLimitStore.
+    """
+    def __init__(
+        self,
+        requests_per_hour: int = 100,
+        window_size: int = 3600,
+        eviction_interval: float = 60,
+        store: Optional[RateLimitStore] = None,
+        retry_interval: float = 30
+    ):
         self.requests_per_hour = requests_per_hour
-        self.window_size = 3600  # 1 hour in seconds
+        self.window_size = window_size  # 1 hour in seconds
+        self.eviction_interval = eviction_interval
+        self.store = store if store is not None else MemoryRateLimitStore(rate_limit_store)
+        self.retry_interval = retry_interval
+        self._next_eviction = 0.0
+        self._unavailable_until = 0.0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _estimate(self, window_start: float, current_count: int, previous_count: int, current_time: float) -> float:
+        """Estimated number of requests in the sliding window ending now."""
+        overlap = 1 - (current_time - window_start) / self.window_size
+        return previous_count * overlap + current_count
+
+    def _reset_time(self, window_start: float, current_count: int, previous_count: int, current_time: float) -> float:
+        """Earliest time at which the client may make another request."""
+        limit = self.requests_per_hour
+        if self._estimate(window_start, current_count, previous_count, current_time) < limit:
+            return current_time
+        if current_count < limit and previous_count > 0:
+            # Within this window, once enough of the previous window has slid out
+            return window_start + self.window_size * (1 - (limit - current_count) / previous_count)
+        # In the next window, once enough of the current window has slid out
+        next_start = window_start + self.window_size
+        if current_count <= 0:
+            return next_start
+        return next_start + self.window_size * max(0.0, 1 - limit / current_count)
+
+    def hit(self, client_id: str, current_time: Optional[float] = None) -> RateLimitResult:
+        """
+        Record a request for a client unless it is over the limit.
+        Returns the check result including remaining requests and reset time.
+        """
+        current_time = time.time() if current_time is None else current_time
+        if current_time >= self._next_eviction:
+            self._evict_idle(current_time)
+
+        window_start = current_time - (current_time % self.window_size)
+        current_count, previous_count = self.store.counts(client_id, window_start, self.window_size)
+        limited = self._estimate(window_start, current_count, previous_count, current_time) >= self.requests_per_hour
+        if not limited:
+            self.store.add(client_id, window_start)
+            current_count += 1
+
+        estimate = self._estimate(window_start, current_count, previous_count, current_time)
+        return RateLimitResult(
+            limited,
+            self.requests_per_hour,
+            max(0, int(self.requests_per_hour - estimate)),
+            self._reset_time(window_start, current_count, previous_count, current_time)
+        )
+
+    async def hit_async(self, client_id: str) -> Optional[RateLimitResult]:
+        """
+        hit() for the event loop. Stores doing blocking I/O are called on a
+        small dedicated thread pool. If the store fails, the check fails
+        open (returns None) and the store is skipped for retry_interval
+        seconds, so requests do not each wait out its timeout.
+        """
+        if not self.store.blocking:
+            return self.hit(client_id)
+        if time.monotonic() < self._unavailable_until:
+            return None
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=RATE_LIMIT_STORE_WORKERS, thread_name_prefix="rate-limit"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._hit_or_back_off, client_id)
+
+    def _hit_or_back_off(self, client_id: str) -> Optional[RateLimitResult]:
+        """Run hit() against the store unless it failed recently (runs on a store thread)."""
+        # Checks queued behind a failing call skip the store as well
+        if time.monotonic() < self._unavailable_until:
+            return None
+        try:
+            return self.hit(client_id)
+        except Exception as e:
+            self._unavailable_until = time.monotonic() + self.retry_interval
+            log_warning(
+                f"Rate limit store unavailable, failing open for {self.retry_interval:g}s: {str(e)}"
+            )
+            return None
 
     def is_rate_limited(self, client_id: str) -> bool:
         """
         Check if a client has exceeded their rate limit.
         Returns True if rate limited, False otherwise.
         """
-        current_time = time.time()
-        
-        # Clean up old entries
-        self._cleanup_old_entries(current_time)
-        
-        # Get client's request history
-        client_requests = rate_limit_store.get(client_id, {"requests": [], "count": 0})
-        
-        # Remove requests outside the current window
-        window_start = current_time - self.window_size
-        client_requests["requests"] = [
-            req_time for req_time in client_requests["requests"]
-            if req_time > window_start
-        ]
-        client_requests["count"] = len(client_requests["requests"])
-        
-        # Check if rate limit is exceeded
-        if client_requests["count"] >= self.requests_per_hour:
-            return True
-        
-        # Add current request
-        client_requests["requests"].append(current_time)
-        client_requests["count"] += 1
-        rate_limit_store[client_id] = client_requests
-        
-        return False
-
-    def _cleanup_old_entries(self, current_time: float):
-        """Remove entries older than the window size."""
-        cutoff_time = current_time - self.window_size
-        for client_id in list(rate_limit_store.keys()):
-            rate_limit_store[client_id]["requests"] = [
-                req_time for req_time in rate_limit_store[client_id]["requests"]
-                if req_time > cutoff_time
-            ]
-            rate_limit_store[client_id]["count"] = len(rate_limit_store[client_id]["requests"])
-            if rate_limit_store[client_id]["count"] == 0:
-                del rate_limit_store[client_id]
+        return self.hit(client_id).limited
+
+    def _evict_idle(self, current_time: float):
+        """Remove clients with no requests in the current or previous window."""
+        self._next_eviction = current_time + self.eviction_interval
+        self.store.evict(current_time - (current_time % self.window_size) - self.window_size)
+
+def create_rate_limit_store() -> RateLimitStore:
+    """Build the rate limit store selected by RATE_LIMIT_BACKEND."""
+    backend = settings.rate_limit_backend
+    if backend == "sqlite":
+        shared = SQLiteRateLimitStore(settings.rate_limit_sqlite_path)
+    elif backend == "redis":
+        shared = RedisRateLimitStore(settings.rate_limit_redis_url)
+    else:
+        return MemoryRateLimitStore(rate_limit_store)
+    return BatchingRateLimitStore(
+        shared,
+        batch_size=settings.rate_limit_batch_size,
+        flush_interval=settings.rate_limit_flush_interval
+    )
 
 class AuthMiddleware:
     def __init__(self):
-        self.rate_limiter = RateLimiter(settings.rate_limit)
+        self.rate_limiter = RateLimiter(
+            settings.rate_limit,
+            store=create_rate_limit_store(),
+            retry_interval=settings.rate_limit_retry_interval
+        )
 
     async def __call__(self, request: Request, call_next):
         # Skip authentication for health check
         if request.url.path == "/api/health":
             return await call_next(request)
 
+        rate_limit = None
         try:
             # Verify API key
             api_key = request.headers.get("X-API-Key")
@@ -83,7 +191,9 @@ class AuthMiddleware:
             # Check rate limit
             if settings.rate_limit_enabled:
                 client_id = request.headers.get("X-Client-ID", api_key)
-                if self.rate_limiter.is_rate_limited(client_id):
+                # None when the shared rate limit store is unavailable (fail open)
+                rate_limit = await self.rate_limiter.hit_async(client_id)
+                if rate_limit is not None and rate_limit.limited:
                     raise HTTPException(
                         status_code=429,
                         detail="Rate limit exceeded. Please try again later."
@@ -91,30 +201,42 @@ class AuthMiddleware:
 
             # Add rate limit headers to response
             response = await call_next(request)
-            if settings.rate_limit_enabled:
-                client_requests = rate_limit_store.get(client_id, {"count": 0})
-                remaining = max(0, settings.rate_limit - client_requests["count"])
-                
-                response.headers["X-RateLimit-Limit"] = str(settings.rate_limit)
-                response.headers["X-RateLimit-Remaining"] = str(remaining)
-                response.headers["X-RateLimit-Reset"] = str(int(time.time() + 3600))
+            if rate_limit is not None:
+                self._add_rate_limit_headers(response, rate_limit)
 
             return response
 
         except HTTPException as exc:
-            return {
-                "error": {
-                    "status_code": exc.status_code,
-                    "detail": exc.detail
+            response = JSONResponse(
+                status_code=exc.status_code,
+                content={
+                    "error": {
+                        "status_code": exc.status_code,
+                        "detail": exc.detail
+                    }
                 }
-            }
+            )
+            if rate_limit is not None:
+                self._add_rate_limit_headers(response, rate_limit)
+                if rate_limit.limited:
+                    response.headers["Retry-After"] = str(max(0, math.ceil(rate_limit.reset_at - time.time())))
+            return response
         except Exception as e:
-            return {
-                "error": {
-                    "status_code": 500,
-                    "detail": "Internal server error"
+            return JSONResponse(
+                status_code=500,
+                content={
+                    "error": {
+                        "status_code": 500,
+                        "detail": "Internal server error"
+                    }
                 }
-            }
+            )
+
+    @staticmethod
+    def _add_rate_limit_headers(response, rate_limit: RateLimitResult):
+        response.headers["X-RateLimit-Limit"] = str(rate_limit.limit)
+        response.headers["X-RateLimit-Remaining"] = str(rate_limit.remaining)
+        response.headers["X-RateLimit-Reset"] = str(math.ceil(rate_limit.reset_at))
 
 def get_api_key(request: Request) -> Optional[str]:
     """Helper function to get API key from request headers."""
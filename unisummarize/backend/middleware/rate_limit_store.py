@@ -0,0 +1,324 @@
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from utils.logger import log_warning
+
+
+class RateLimitStore:
+    """
+    Storage for per-client request counts in fixed windows.
+
+    The sliding-window limiter only needs the counts of the current and the
+    previous window, so every backend stores one counter per
+    (client, window_start) pair. Stores that do blocking I/O set blocking,
+    so the limiter calls them off the event loop.
+    """
+    blocking = True
+
+    def counts(self, client_id: str, window_start: float, window_size: float) -> Tuple[int, int]:
+        """Return (current_count, previous_count) for the client."""
+        raise NotImplementedError
+
+    def add(self, client_id: str, window_start: float, amount: int = 1) -> None:
+        """Add to the client's count for the window starting at window_start."""
+        raise NotImplementedError
+
+    def evict(self, before: float) -> None:
+        """Drop counters for windows that started before `before`."""
+
+    def flush(self) -> None:
+        """Write out any buffered increments."""
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """
+    In-process store. Each client holds [window_start, current_count,
+    previous_count], rolled forward when a new window starts.
+    """
+    blocking = False
+
+    def __init__(self, store: Optional[dict] = None):
+        self.store = store if store is not None else {}
+
+    def _state(self, client_id: str, window_start: float, window_size: float) -> list:
+        state = self.store.get(client_id)
+        if state is None:
+            state = [window_start, 0, 0]
+            self.store[client_id] = state
+        elif state[0] != window_start:
+            # Roll windows forward; anything older than one window is dropped
+            previous_count = state[1] if window_start - state[0] == window_size else 0
+            state[0], state[1], state[2] = window_start, 0, previous_count
+        return state
+
+    def counts(self, client_id, window_start, window_size):
+        state = self._state(client_id, window_start, window_size)
+        return state[1], state[2]
+
+    def add(self, client_id, window_start, amount=1):
+        state = self.store.get(client_id)
+        if state is not None and state[0] == window_start:
+            state[1] += amount
+
+    def evict(self, before):
+        for client_id in [cid for cid, state in self.store.items() if state[0] < before]:
+            del self.store[client_id]
+
+
+class SQLiteRateLimitStore(RateLimitStore):
+    """
+    Store shared by every worker process on a host through a local sqlite
+    database. Increments are atomic upserts.
+    """
+    def __init__(self, path: Union[str, Path]):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), timeout=5, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            "client_id TEXT NOT NULL, window_start REAL NOT NULL, count INTEGER NOT NULL, "
+            "PRIMARY KEY (client_id, window_start))"
+        )
+
+    def counts(self, client_id, window_start, window_size):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT window_start, count FROM rate_limits "
+                "WHERE client_id = ? AND window_start IN (?, ?)",
+                (client_id, window_start, window_start - window_size)
+            ).fetchall()
+        by_window = dict(rows)
+        return by_window.get(window_start, 0), by_window.get(window_start - window_size, 0)
+
+    def add(self, client_id, window_start, amount=1):
+        self.add_many({(client_id, window_start): amount})
+
+    def add_many(self, increments: Dict[Tuple[str, float], int]) -> None:
+        """Apply several increments in one transaction."""
+        with self._lock:
+            self._db.executemany(
+                "INSERT INTO rate_limits (client_id, window_start, count) VALUES (?, ?, ?) "
+                "ON CONFLICT (client_id, window_start) DO UPDATE SET count = count + excluded.count",
+                [(client_id, window_start, amount) for (client_id, window_start), amount in increments.items()]
+            )
+
+    def evict(self, before):
+        with self._lock:
+            self._db.execute("DELETE FROM rate_limits WHERE window_start < ?", (before,))
+
+
+class RESPClient:
+    """Minimal client for the Redis serialization protocol (TCP or Unix socket)."""
+    def __init__(self, url: str, timeout: float = 1.0):
+        parts = urlsplit(url)
+        self.unix_path = parts.path if parts.scheme == "unix" else None
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.db = int(parts.path.strip("/") or 0) if parts.scheme != "unix" else 0
+        self.timeout = timeout
+        self._sock = None
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self.unix_path:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.unix_path)
+        else:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._sock = sock
+        self._file = sock.makefile("rb")
+        if self.db:
+            self._send([["SELECT", self.db]])
+
+    @staticmethod
+    def _encode(command: list) -> bytes:
+        out = [b"*%d\r\n" % len(command)]
+        for arg in command:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(out)
+
+    def _read_reply(self):
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode("utf-8")
+        if kind == b"-":
+            raise RuntimeError(payload.decode("utf-8"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._file.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            return None if length < 0 else [self._read_reply() for _ in range(length)]
+        raise RuntimeError(f"Unexpected reply: {line!r}")
+
+    def _send(self, commands: List[list]) -> list:
+        self._sock.sendall(b"".join(self._encode(command) for command in commands))
+        return [self._read_reply() for _ in commands]
+
+    def pipeline(self, commands: List[list]) -> list:
+        """Send several commands in one round trip and return their replies."""
+        with self._lock:
+            if self._sock is None:
+                self._connect()
+            try:
+                return self._send(commands)
+            except (OSError, ConnectionError):
+                self.close()
+                raise
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = None
+        self._file = None
+
+
+class RedisRateLimitStore(RateLimitStore):
+    """Store on a Redis-protocol server; counters expire after two windows."""
+    def __init__(self, url: str, window_size: float = 3600, key_prefix: str = "ratelimit", timeout: float = 1.0):
+        self.client = RESPClient(url, timeout=timeout)
+        self.window_size = window_size
+        self.key_prefix = key_prefix
+
+    def _key(self, client_id: str, window_start: float) -> str:
+        return f"{self.key_prefix}:{client_id}:{int(window_start)}"
+
+    def counts(self, client_id, window_start, window_size):
+        current, previous = self.client.pipeline([
+            ["MGET", self._key(client_id, window_start), self._key(client_id, window_start - window_size)]
+        ])[0]
+        return int(current or 0), int(previous or 0)
+
+    def add(self, client_id, window_start, amount=1):
+        self.add_many({(client_id, window_start): amount})
+
+    def add_many(self, increments: Dict[Tuple[str, float], int]) -> None:
+        """Apply several increments in one pipelined round trip."""
+        commands = []
+        for (client_id, window_start), amount in increments.items():
+            key = self._key(client_id, window_start)
+            commands.append(["INCRBY", key, amount])
+            commands.append(["EXPIRE", key, int(self.window_size * 2)])
+        if commands:
+            self.client.pipeline(commands)
+
+
+class BatchingRateLimitStore(RateLimitStore):
+    """
+    Buffers increments locally and writes them to a shared store in batches.
+
+    Reads combine the shared counts (re-read at most once per flush
+    interval) with this process's unflushed increments, so the shared store
+    sees one write per batch instead of one per request. Limits may be
+    exceeded by at most batch_size requests per process. A background
+    thread flushes every flush_interval, so increments of an idle process
+    still reach the shared store.
+    """
+    def __init__(self, backend: RateLimitStore, batch_size: int = 10, flush_interval: float = 1.0):
+        self.backend = backend
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._pending: Dict[Tuple[str, float], int] = {}
+        self._pending_total = 0
+        self._shared: Dict[Tuple[str, float], Tuple[float, int, int]] = {}
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+
+    def _start_flusher(self) -> None:
+        """Start the periodic flush thread on first use."""
+        with self._lock:
+            if self._flusher is not None or self._closed.is_set():
+                return
+            self._flusher = threading.Thread(target=self._flush_periodically, name="rate-limit-flush", daemon=True)
+        self._flusher.start()
+
+    def _flush_periodically(self) -> None:
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                log_warning(f"Rate limit store flush failed: {str(e)}")
+
+    def close(self) -> None:
+        """Stop the periodic flush and write out what is still buffered."""
+        self._closed.set()
+        self.flush()
+
+    def counts(self, client_id, window_start, window_size):
+        now = time.monotonic()
+        with self._lock:
+            cached = self._shared.get((client_id, window_start))
+        if cached is None or now - cached[0] >= self.flush_interval:
+            current, previous = self.backend.counts(client_id, window_start, window_size)
+            with self._lock:
+                self._shared[(client_id, window_start)] = (now, current, previous)
+        else:
+            _, current, previous = cached
+        with self._lock:
+            current += self._pending.get((client_id, window_start), 0)
+            previous += self._pending.get((client_id, window_start - window_size), 0)
+        return current, previous
+
+    def add(self, client_id, window_start, amount=1):
+        if self._flusher is None:
+            self._start_flusher()
+        with self._lock:
+            key = (client_id, window_start)
+            self._pending[key] = self._pending.get(key, 0) + amount
+            self._pending_total += amount
+            due = (
+                self._pending_total >= self.batch_size
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending, self._pending_total = self._pending, {}, 0
+            self._last_flush = time.monotonic()
+            # Shared counts now include our increments; force a re-read
+            for key in pending:
+                self._shared.pop(key, None)
+        if not pending:
+            return
+        try:
+            if hasattr(self.backend, "add_many"):
+                self.backend.add_many(pending)
+            else:
+                for (client_id, window_start), amount in pending.items():
+                    self.backend.add(client_id, window_start, amount)
+        except Exception:
+            # Keep the increments for the next flush
+            with self._lock:
+                for key, amount in pending.items():
+                    self._pending[key] = self._pending.get(key, 0) + amount
+                    self._pending_total += amount
+            raise
+
+    def evict(self, before):
+        with self._lock:
+            for key in [key for key in self._shared if key[1] < before]:
+                del self._shared[key]
+        self.backend.evict(before)
@@ -0,0 +1,155 @@
+import json
+from typing import Dict, Optional
+
+from config import settings
+from utils.logger import log_warning
+from utils.metrics import UPLOAD_REJECTIONS
+
+
+class UploadBudget:
+    """
+    Request body bytes being received across all requests, bounded by
+    max_bytes (0 disables the cap). A request is always admitted when
+    nothing else is in flight, so a single upload can never be starved.
+    """
+    def __init__(self, max_bytes: int = 0):
+        self.max_bytes = max_bytes
+        self.in_flight = 0
+
+    def acquire(self, amount: int) -> bool:
+        """Reserve bytes for a request body; False if the cap would be exceeded."""
+        if self.max_bytes and self.in_flight and self.in_flight + amount > self.max_bytes:
+            return False
+        self.in_flight += amount
+        return True
+
+    def release(self, amount: int) -> None:
+        self.in_flight -= amount
+
+
+class _BodyRejected(Exception):
+    """Raised from receive() to stop the application reading a rejected body."""
+
+
+# Shared by every request handled by this process
+upload_budget = UploadBudget(settings.upload_max_inflight_bytes)
+
+
+class UploadLimitMiddleware:
+    """
+    ASGI middleware that rejects oversized request bodies before they are
+    received.
+
+    A declared Content-Length above the route's limit is answered with 413
+    without reading the body. Otherwise bytes are counted as they arrive
+    and the request is aborted with 413 as soon as the limit is crossed,
+    so Starlette never spools the rest. Limits come from route_limits
+    (exact path match, 0 for no limit) and default to max_body_size.
+
+    Bodies also reserve space in a shared UploadBudget until their last
+    chunk has been received, not while the request is processed;
+    requests that would push the bytes in flight over the budget get 503
+    with Retry-After.
+    """
+    def __init__(
+        self,
+        app,
+        max_body_size: Optional[int] = None,
+        route_limits: Optional[Dict[str, int]] = None,
+        budget: Optional[UploadBudget] = None
+    ):
+        self.app = app
+        self.max_body_size = settings.max_file_size if max_body_size is None else max_body_size
+        self.route_limits = dict(settings.upload_route_limits if route_limits is None else route_limits)
+        self.budget = upload_budget if budget is None else budget
+
+    def limit_for(self, path: str) -> int:
+        return self.route_limits.get(path, self.max_body_size)
+
+    @staticmethod
+    def _content_length(scope) -> Optional[int]:
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    return int(value)
+                except ValueError:
+                    return None
+        return None
+
+    async def _reject(self, scope, send, status_code: int, detail: str, received: int = 0) -> None:
+        reason = "too_large" if status_code == 413 else "busy"
+        UPLOAD_REJECTIONS.inc((reason,))
+        log_warning("Request body rejected", {
+            "path": scope["path"],
+            "status_code": status_code,
+            "received_bytes": received,
+            "in_flight_bytes": self.budget.in_flight
+        })
+        headers = [(b"content-type", b"application/json"), (b"connection", b"close")]
+        if status_code == 503:
+            headers.append((b"retry-after", b"1"))
+        await send({"type": "http.response.start", "status": status_code, "headers": headers})
+        await send({
+            "type": "http.response.body",
+            "body": json.dumps({"error": {"status_code": status_code, "detail": detail}}).encode()
+        })
+
+    def _too_large(self, limit: int):
+        return 413, f"Request body too large. Maximum size allowed: {limit/1024/1024}MB"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.limit_for(scope["path"])
+        content_length = self._content_length(scope)
+        if limit and content_length is not None and content_length > limit:
+            await self._reject(scope, send, *self._too_large(limit))
+            return
+        if content_length and not self.budget.acquire(content_length):
+            await self._reject(scope, send, 503, "Too many uploads in progress. Please try again later.")
+            return
+
+        # Bodies without a Content-Length reserve their bytes as they arrive
+        state = {"reserved": content_length or 0, "received": 0, "rejection": None, "started": False}
+
+        async def limited_receive():
+            message = await receive()
+            if message["type"] != "http.request" or state["rejection"] is not None:
+                return message
+            state["received"] += len(message.get("body", b""))
+            if limit and state["received"] > limit:
+                state["rejection"] = self._too_large(limit)
+            elif state["received"] > state["reserved"]:
+                extra = state["received"] - state["reserved"]
+                if not self.budget.acquire(extra):
+                    state["rejection"] = (503, "Too many uploads in progress. Please try again later.")
+                else:
+                    state["reserved"] += extra
+            if state["rejection"] is not None:
+                raise _BodyRejected()
+            if not message.get("more_body", False):
+                # The body is fully received; inference and streaming don't hold the budget
+                self.budget.release(state["reserved"])
+                state["reserved"] = 0
+            return message
+
+        async def guarded_send(message):
+            # Once the body is rejected, the application's own error response is replaced
+            if state["rejection"] is not None:
+                return
+            if message["type"] == "http.response.start":
+                state["started"] = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if state["rejection"] is None:
+                raise
+        finally:
+            self.budget.release(state["reserved"])
+
+        if state["rejection"] is not None and not state["started"]:
+            await self._reject(scope, send, *state["rejection"], received=state["received"])
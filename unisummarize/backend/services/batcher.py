@@ -0,0 +1,102 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Set, Tuple
+
+from utils.metrics import current_request_labels, observe_stage, set_batch_labels
+
+BatchRunner = Callable[[List[Any], dict], Awaitable[List[Any]]]
+
+
+class MicroBatcher:
+    """
+    Collects concurrent generation requests into padded batches.
+
+    Items are usually texts for the summarization model, but any input the
+    batch runner accepts works (the OCR engine batches images). Requests
+    are grouped by their generation parameters, so inputs with
+    different settings (e.g. min_length/max_length) never share a batch. A
+    group is flushed once it reaches max_batch_size or after max_wait_ms,
+    whichever comes first, and every caller receives its own result. The
+    time each caller spends waiting for its batch is recorded under the
+    metric stage given by wait_stage, and stages the runner records
+    through observe_batch_stage are recorded once per caller.
+
+    A runner that fails as a whole fails every caller of the batch; it can
+    fail a single caller by returning an exception as that item's result.
+    """
+    def __init__(
+        self,
+        run_batch: BatchRunner,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 20,
+        wait_stage: str = "batch_wait"
+    ):
+        self._run_batch = run_batch
+        self.wait_stage = wait_stage
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0, max_wait_ms) / 1000
+        self._pending: Dict[Tuple, List[Tuple[Any, asyncio.Future, float, Tuple]]] = {}
+        self._timers: Dict[Tuple, asyncio.TimerHandle] = {}
+        # The loop only keeps weak references to tasks; a collected dispatch would strand its callers
+        self._dispatches: Set[asyncio.Future] = set()
+
+    @staticmethod
+    def _batch_key(params: dict) -> Tuple:
+        """Hashable key identifying requests that may share a batch."""
+        return tuple(sorted(params.items()))
+
+    async def submit(self, item: Any, params: dict) -> Any:
+        """Queue one input and wait for its result."""
+        loop = asyncio.get_running_loop()
+        key = self._batch_key(params)
+        future = loop.create_future()
+
+        bucket = self._pending.setdefault(key, [])
+        bucket.append((item, future, time.perf_counter(), current_request_labels()))
+
+        if len(bucket) >= self.max_batch_size:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.max_wait, self._flush, key)
+
+        return await future
+
+    def _flush(self, key: Tuple) -> None:
+        """Dispatch the pending group for key as one batch."""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        bucket = self._pending.pop(key, None)
+        if bucket:
+            task = asyncio.ensure_future(self._dispatch(dict(key), bucket))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, params: dict, bucket: List[Tuple[Any, asyncio.Future, float, Tuple]]) -> None:
+        """Run a batch and resolve each caller's future with its own result."""
+        dispatched_at = time.perf_counter()
+        for _, _, submitted_at, labels in bucket:
+            observe_stage(self.wait_stage, dispatched_at - submitted_at, labels)
+        # This task runs in a copy of the flushing request's context; stages
+        # the runner records belong to every request of the batch
+        set_batch_labels([labels for *_, labels in bucket])
+
+        items = [item for item, *_ in bucket]
+        try:
+            results = await self._run_batch(items, params)
+            if len(results) != len(bucket):
+                raise RuntimeError(f"Batch runner returned {len(results)} results for {len(bucket)} inputs")
+        except Exception as e:
+            for _, future, *_ in bucket:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, *_), result in zip(bucket, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,241 @@
+import asyncio
+import hashlib
+import mmap
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional, Tuple, Union
+
+# Block size for hashing streamed content
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class SummaryCache:
+    """
+    Content-addressed cache for generated summaries.
+
+    Entries live in a bounded in-memory LRU with a TTL. When disk_path is set,
+    entries are also written to a local sqlite database so they survive
+    restarts; disk hits are promoted back into memory.
+
+    All sqlite work runs on one dedicated thread. The event loop uses
+    get_async, which only leaves the loop for disk lookups, and
+    set_deferred, which queues disk writes and commits them in batches.
+    Expired rows are pruned, and the disk tier trimmed to
+    max_disk_entries, every prune_interval seconds.
+    """
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 86400,
+        disk_path: Optional[Union[str, Path]] = None,
+        max_disk_entries: int = 100_000,
+        prune_interval: float = 300
+    ):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.max_disk_entries = max(1, max_disk_entries)
+        self.prune_interval = prune_interval
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._disk_executor: Optional[ThreadPoolExecutor] = None
+        self._pending_writes: Dict[str, Tuple[str, float]] = {}
+        self._write_scheduled = False
+        self._next_prune = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.disk_pruned = 0
+
+        if disk_path:
+            disk_path = Path(disk_path)
+            disk_path.parent.mkdir(parents=True, exist_ok=True)
+            self._disk_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summary-cache")
+            self._db = sqlite3.connect(str(disk_path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS summaries_expires_at ON summaries (expires_at)")
+            self._prune()
+
+    @staticmethod
+    def make_key(content: Union[str, bytes, BinaryIO], *parts) -> str:
+        """
+        Hash content together with everything that affects the summary.
+        Content may be text, bytes, an mmap or a seekable binary stream,
+        which is hashed block by block and rewound afterwards.
+        """
+        digest = hashlib.sha256()
+        if isinstance(content, str):
+            digest.update(content.encode("utf-8"))
+        elif isinstance(content, (bytes, bytearray, mmap.mmap)):
+            digest.update(content)
+        else:
+            content.seek(0)
+            for block in iter(lambda: content.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+            content.seek(0)
+        for part in parts:
+            digest.update(b"\x00")
+            digest.update(repr(part).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _get_memory(self, key: str, now: float) -> Optional[str]:
+        """Look key up in the in-memory tier; counts hits but not misses."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+            self.expirations += 1
+            return None
+
+    def _get_disk(self, key: str, now: float) -> Optional[str]:
+        """Look key up in the sqlite tier, promoting hits into memory (runs on the disk thread)."""
+        row = None
+        if self._db is not None:
+            # Writes still queued are newer than anything on disk
+            with self._lock:
+                pending = self._pending_writes.get(key)
+            if pending is not None:
+                row = pending
+            else:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM summaries WHERE key = ?", (key,)
+                ).fetchone()
+        with self._lock:
+            if row is not None and row[1] > now:
+                self._store(key, row[0], row[1])
+                self.hits += 1
+                self.disk_hits += 1
+                return row[0]
+            self.misses += 1
+            return None
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached summary for key, or None on a miss."""
+        now = time.time()
+        value = self._get_memory(key, now)
+        if value is not None:
+            return value
+        if self._disk_executor is None:
+            return self._get_disk(key, now)
+        return self._disk_executor.submit(self._get_disk, key, now).result()
+
+    async def get_async(self, key: str) -> Optional[str]:
+        """get() for the event loop: disk lookups run on the disk thread."""
+        now = time.time()
+        value = self._get_memory(key, now)
+        if value is not None:
+            return value
+        if self._disk_executor is None:
+            return self._get_disk(key, now)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._disk_executor, self._get_disk, key, now)
+
+    def set(self, key: str, value: str) -> None:
+        """Cache a summary under key, waiting until it is written to disk."""
+        self.set_deferred(key, value)
+        self.flush()
+
+    def set_deferred(self, key: str, value: str) -> None:
+        """Cache a summary under key; the disk write happens in the background."""
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._store(key, value, expires_at)
+            if self._db is None:
+                return
+            self._pending_writes[key] = (value, expires_at)
+            if self._write_scheduled:
+                return
+            self._write_scheduled = True
+        self._disk_executor.submit(self._write_pending)
+
+    def flush(self) -> None:
+        """Wait until every queued disk write is committed."""
+        if self._disk_executor is not None:
+            self._disk_executor.submit(self._write_pending).result()
+
+    def _write_pending(self) -> None:
+        """Commit all queued writes in one transaction (runs on the disk thread)."""
+        with self._lock:
+            pending = list(self._pending_writes.items())
+            self._write_scheduled = False
+        if pending:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO summaries (key, value, expires_at) VALUES (?, ?, ?)",
+                [(key, value, expires_at) for key, (value, expires_at) in pending]
+            )
+            self._db.commit()
+            with self._lock:
+                # Keep writes queued again for the same key meanwhile
+                for key, entry in pending:
+                    if self._pending_writes.get(key) is entry:
+                        del self._pending_writes[key]
+        if time.monotonic() >= self._next_prune:
+            self._prune()
+
+    def _prune(self) -> None:
+        """Delete expired rows and the oldest rows beyond max_disk_entries (runs on the disk thread)."""
+        self._next_prune = time.monotonic() + self.prune_interval
+        expired = self._db.execute("DELETE FROM summaries WHERE expires_at <= ?", (time.time(),)).rowcount
+        # Every entry has the same TTL, so the earliest expiry is the oldest write
+        trimmed = self._db.execute(
+            "DELETE FROM summaries WHERE key IN ("
+            "SELECT key FROM summaries ORDER BY expires_at "
+            "LIMIT max(0, (SELECT COUNT(*) FROM summaries) - ?))",
+            (self.max_disk_entries,)
+        ).rowcount
+        self._db.commit()
+        with self._lock:
+            self.disk_pruned += expired + trimmed
+
+    def _store(self, key: str, value: str, expires_at: float) -> None:
+        """Insert into the in-memory LRU, evicting the oldest entries if full."""
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all cached entries from memory and disk."""
+        with self._lock:
+            self._entries.clear()
+        if self._db is not None:
+            self.flush()
+            self._disk_executor.submit(self._clear_disk).result()
+
+    def _clear_disk(self) -> None:
+        self._db.execute("DELETE FROM summaries")
+        self._db.commit()
+
+    def stats(self) -> dict:
+        """Return cache counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "disk_enabled": self._db is not None,
+                "disk_max_entries": self.max_disk_entries,
+                "disk_pending_writes": len(self._pending_writes),
+                "disk_pruned": self.disk_pruned
+            }
@@ -0,0 +1,34 @@
+from typing import List, Sequence
+
+
+def chunk_token_ids(token_ids: Sequence[int], chunk_size: int, overlap: int = 0) -> List[List[int]]:
+    """
+    Split a token sequence into windows of at most chunk_size tokens.
+    Consecutive windows share `overlap` tokens so sentences cut at a
+    boundary still appear whole in one of the chunks.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    overlap = max(0, min(overlap, chunk_size - 1))
+    stride = chunk_size - overlap
+
+    chunks = []
+    for start in range(0, len(token_ids), stride):
+        chunks.append(list(token_ids[start:start + chunk_size]))
+        if start + chunk_size >= len(token_ids):
+            break
+    return chunks
+
+
+def count_tokens(text: str, tokenizer) -> int:
+    """Number of model tokens in text, excluding special tokens."""
+    return len(tokenizer(text, add_special_tokens=False)["input_ids"])
+
+
+def split_text(text: str, tokenizer, chunk_size: int, overlap: int = 0) -> List[str]:
+    """Split text into token-bounded chunks decoded back to strings."""
+    token_ids = tokenizer(text, add_special_tokens=False)["input_ids"]
+    return [
+        tokenizer.decode(chunk, skip_special_tokens=True).strip()
+        for chunk in chunk_token_ids(token_ids, chunk_size, overlap)
+    ]
@@ -0,0 +1,173 @@
+import io
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+
+from config import settings
+from utils.logger import log_info
+
+# Rough characters-per-token ratio used to turn a token budget into text length
+CHARS_PER_TOKEN = 4
+
+_pdf_executor: Optional[ProcessPoolExecutor] = None
+
+# Extractors take raw bytes or a seekable binary stream (an open file or an mmap)
+Source = Union[bytes, BinaryIO]
+
+
+def as_stream(source: Source) -> BinaryIO:
+    """Return a stream positioned at the start of source without copying it."""
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    source.seek(0)
+    return source
+
+
+def read_all(source: Source) -> bytes:
+    """Return the full content of source as bytes."""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    source.seek(0)
+    return source.read()
+
+
+def _get_pdf_executor() -> ProcessPoolExecutor:
+    """Process pool shared by page-parallel PDF extraction."""
+    global _pdf_executor
+    if _pdf_executor is None:
+        _pdf_executor = ProcessPoolExecutor(max_workers=settings.extraction_workers)
+    return _pdf_executor
+
+
+def iter_pdf_pages(reader, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+    """Yield the text of each page of an open PdfReader."""
+    pages = reader.pages
+    stop = len(pages) if stop is None else min(stop, len(pages))
+    for index in range(start, stop):
+        yield pages[index].extract_text() or ""
+
+
+def iter_timed_pdf_pages(reader, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[str, float]]:
+    """Yield (text, extraction seconds) for each page of an open PdfReader."""
+    page_iter = iter_pdf_pages(reader, start, stop)
+    while True:
+        started = time.perf_counter()
+        text = next(page_iter, None)
+        if text is None:
+            return
+        yield text, time.perf_counter() - started
+
+
+def _extract_page_range(content: bytes, start: int, stop: int) -> List[Tuple[str, float]]:
+    """Extract a range of pages with their timings; runs inside a worker process."""
+    import PyPDF2
+    reader = PyPDF2.PdfReader(io.BytesIO(content))
+    return list(iter_timed_pdf_pages(reader, start, stop))
+
+
+class _PageCollector:
+    """Collects extracted pages in order, tracking the character budget and the slowest page."""
+    def __init__(self, max_chars: Optional[int]):
+        self.max_chars = max_chars
+        self.pages: List[str] = []
+        self.total_chars = 0
+        self.slowest_page = 0
+        self.slowest_seconds = 0.0
+
+    def add(self, text: str, seconds: float) -> None:
+        if seconds > self.slowest_seconds:
+            self.slowest_page, self.slowest_seconds = len(self.pages), seconds
+        self.pages.append(text)
+        self.total_chars += len(text)
+
+    @property
+    def full(self) -> bool:
+        return self.max_chars is not None and self.total_chars >= self.max_chars
+
+
+def _extract_serial(reader, max_chars: Optional[int]) -> _PageCollector:
+    """Extract pages one by one, stopping once max_chars is reached."""
+    collected = _PageCollector(max_chars)
+    for text, seconds in iter_timed_pdf_pages(reader):
+        collected.add(text, seconds)
+        if collected.full:
+            break
+    return collected
+
+
+def _extract_parallel(content: bytes, page_count: int, max_chars: Optional[int]) -> _PageCollector:
+    """
+    Extract page ranges on the process pool, in order, stopping once
+    max_chars is reached. Every task ships the whole document to a worker,
+    so ranges are submitted lazily with one task per worker in flight, and
+    none are submitted after the budget is met.
+    """
+    executor = _get_pdf_executor()
+    step = max(1, settings.pdf_pages_per_task)
+    ranges = iter(range(0, page_count, step))
+    in_flight = deque()
+
+    def submit_next() -> None:
+        start = next(ranges, None)
+        if start is not None:
+            in_flight.append(executor.submit(_extract_page_range, content, start, min(start + step, page_count)))
+
+    for _ in range(max(1, settings.extraction_workers)):
+        submit_next()
+
+    collected = _PageCollector(max_chars)
+    while in_flight:
+        pages = in_flight.popleft().result()
+        for text, seconds in pages:
+            collected.add(text, seconds)
+        if collected.full:
+            for pending in in_flight:
+                pending.cancel()
+            break
+        submit_next()
+    return collected
+
+
+def extract_pdf_text(source: Source, max_tokens: Optional[int] = None) -> str:
+    """
+    Extract text from a PDF given as bytes or a seekable stream.
+
+    Pages are streamed and joined once at the end. Large PDFs are split
+    into page ranges and extracted on a process pool. Extraction stops
+    early once roughly max_tokens worth of text has been collected.
+    """
+    import PyPDF2
+    reader = PyPDF2.PdfReader(as_stream(source))
+    page_count = len(reader.pages)
+    max_chars = max_tokens * CHARS_PER_TOKEN if max_tokens else None
+
+    start = time.perf_counter()
+    if settings.extraction_workers > 1 and page_count >= settings.pdf_parallel_min_pages:
+        # Worker processes need their own copy of the document
+        collected = _extract_parallel(read_all(source), page_count, max_chars)
+        mode = "parallel"
+    else:
+        collected = _extract_serial(reader, max_chars)
+        mode = "serial"
+    elapsed = time.perf_counter() - start
+    pages = collected.pages
+
+    log_info("PDF text extracted", {
+        "mode": mode,
+        "slowest_page": collected.slowest_page,
+        "slowest_page_seconds": round(collected.slowest_seconds, 4),
+        "pages": len(pages),
+        "pages_total": page_count,
+        "seconds": round(elapsed, 4),
+        "pages_per_second": round(len(pages) / elapsed, 2) if elapsed > 0 else None,
+        "seconds_per_page": round(elapsed / len(pages), 4) if pages else None
+    })
+    return "\n".join(pages)
+
+
+def extract_docx_text(source: Source) -> str:
+    """Extract paragraph text from a DOCX file given as bytes or a seekable stream."""
+    import docx
+    doc = docx.Document(as_stream(source))
+    return "\n".join(paragraph.text for paragraph in doc.paragraphs)
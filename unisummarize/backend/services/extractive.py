@@ -0,0 +1,150 @@
+import re
+from typing import Callable, List, Optional
+
+import numpy as np
+
+# Sentence boundaries in normalized text (single spaces), after closing
+# quotes or brackets that follow the terminator
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+|(?<=[.!?]["\'”’)\]])\s+')
+WORD = re.compile(r'\w+')
+
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have
+having he her here hers him his how i if in into is it its itself just me more most my no nor not
+now of off on once only or other our ours out over own same she should so some such than that the
+their them then there these they this those through to too under until up very was we were what
+when where which while who whom why will with would you your
+""".split())
+
+# TextRank builds a dense sentence x term matrix and a sentence x sentence
+# similarity matrix; larger inputs are scored by TF-IDF
+TEXTRANK_MAX_CELLS = 4_000_000
+TEXTRANK_MAX_SENTENCES = 2_500
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_MAX_ITERATIONS = 50
+
+SentenceCounter = Callable[[List[str]], List[int]]
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split cleaned text into sentences."""
+    return [sentence for sentence in SENTENCE_SPLIT.split(text.strip()) if sentence]
+
+
+def _term_weights(sentences: List[str]):
+    """
+    Sparse TF-IDF weights as (rows, cols, values) arrays, one entry per
+    (sentence, term) pair, with sublinear term frequency and smoothed IDF.
+    """
+    vocabulary = {}
+    rows, cols = [], []
+    for row, sentence in enumerate(sentences):
+        for word in WORD.findall(sentence.lower()):
+            if word not in STOPWORDS:
+                rows.append(row)
+                cols.append(vocabulary.setdefault(word, len(vocabulary)))
+
+    size = max(1, len(vocabulary))
+    keys, counts = np.unique(
+        np.asarray(rows, dtype=np.int64) * size + np.asarray(cols, dtype=np.int64),
+        return_counts=True
+    )
+    rows, cols = keys // size, keys % size
+    document_frequency = np.bincount(cols, minlength=size)
+    idf = np.log((1 + len(sentences)) / (1 + document_frequency)) + 1
+    values = (1 + np.log(counts)) * idf[cols]
+    return rows, cols, values, size
+
+
+def _centroid_scores(rows, cols, values, sentence_count: int, vocabulary_size: int) -> np.ndarray:
+    """Cosine similarity of each sentence to the TF-IDF centroid of the document."""
+    centroid = np.bincount(cols, weights=values, minlength=vocabulary_size)
+    dots = np.bincount(rows, weights=values * centroid[cols], minlength=sentence_count)
+    norms = np.sqrt(np.bincount(rows, weights=values ** 2, minlength=sentence_count))
+    denominator = norms * np.linalg.norm(centroid)
+    return np.divide(dots, denominator, out=np.zeros(sentence_count), where=denominator > 0)
+
+
+def _textrank_scores(rows, cols, values, sentence_count: int, vocabulary_size: int) -> np.ndarray:
+    """PageRank over the cosine-similarity graph of the sentences."""
+    matrix = np.zeros((sentence_count, vocabulary_size), dtype=np.float32)
+    matrix[rows, cols] = values
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+
+    similarity = matrix @ matrix.T
+    np.fill_diagonal(similarity, 0)
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    transition = np.divide(similarity, out_weight, out=np.zeros_like(similarity), where=out_weight > 0)
+
+    scores = np.full(sentence_count, 1 / sentence_count, dtype=np.float32)
+    for _ in range(TEXTRANK_MAX_ITERATIONS):
+        updated = (1 - TEXTRANK_DAMPING) / sentence_count + TEXTRANK_DAMPING * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < 1e-6:
+            return updated
+        scores = updated
+    return scores
+
+
+def score_sentences(sentences: List[str], method: str = "textrank") -> np.ndarray:
+    """
+    Salience of each sentence: "textrank" (similarity graph) or "tfidf"
+    (similarity to the document centroid).
+    """
+    if not sentences:
+        return np.zeros(0)
+    rows, cols, values, vocabulary_size = _term_weights(sentences)
+    if len(values) == 0:
+        return np.zeros(len(sentences))
+    if (
+        method == "textrank"
+        and len(sentences) <= TEXTRANK_MAX_SENTENCES
+        and len(sentences) * vocabulary_size <= TEXTRANK_MAX_CELLS
+    ):
+        return _textrank_scores(rows, cols, values, len(sentences), vocabulary_size)
+    return _centroid_scores(rows, cols, values, len(sentences), vocabulary_size)
+
+
+def _pick(scores: np.ndarray, lengths: np.ndarray, budget: float) -> np.ndarray:
+    """Indices, in document order, of the best sentences whose lengths fit the budget."""
+    chosen = []
+    remaining = budget
+    for index in np.argsort(-scores, kind="stable"):
+        if lengths[index] <= remaining:
+            chosen.append(index)
+            remaining -= lengths[index]
+    return np.sort(np.asarray(chosen, dtype=np.int64))
+
+
+def select_salient(
+    text: str,
+    budget: int,
+    count: Optional[SentenceCounter] = None,
+    method: str = "textrank"
+) -> str:
+    """
+    Keep the most salient sentences of text, in their original order, up to
+    budget tokens. count returns the token count of each sentence; without
+    it, words are counted. Text within the budget is returned unchanged.
+    """
+    sentences = split_sentences(text)
+    if not sentences:
+        return text
+    lengths = np.asarray(
+        count(sentences) if count is not None else [len(sentence.split()) for sentence in sentences]
+    )
+    if lengths.sum() <= budget:
+        return text
+    chosen = _pick(score_sentences(sentences, method), lengths, budget)
+    return " ".join(sentences[index] for index in chosen)
+
+
+def extractive_summary(text: str, max_sentences: int = 5, method: str = "textrank") -> str:
+    """The max_sentences most salient sentences of text, in their original order."""
+    sentences = split_sentences(text)
+    if len(sentences) <= max_sentences:
+        return " ".join(sentences)
+    scores = score_sentences(sentences, method)
+    chosen = np.sort(np.argsort(-scores, kind="stable")[:max_sentences])
+    return " ".join(sentences[index] for index in chosen)
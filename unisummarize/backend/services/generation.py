@@ -0,0 +1,118 @@
+import math
+from typing import Optional
+
+from config import settings
+
+# Longest summary worth generating, as a share of the input tokens, per format
+FORMAT_LENGTH_RATIOS = {"bullet": 0.35, "paragraph": 0.5, "detailed": 0.75}
+DEFAULT_LENGTH_RATIO = FORMAT_LENGTH_RATIOS["paragraph"]
+
+# Derived summary lengths are rounded up to a multiple of this, so requests
+# of similar size share generation settings and therefore micro-batches
+LENGTH_BUCKET = 16
+
+# Average model tokens per whitespace-separated word in English text, used
+# when the exact token count of the input is not known
+TOKENS_PER_WORD = 1.3
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate model token count of text from its word count."""
+    return math.ceil(len(text.split()) * TOKENS_PER_WORD)
+
+
+class GenerationOptions:
+    """Generation settings requested by a client; unset values are derived by the server."""
+    FIELDS = ("max_length", "min_length", "num_beams", "length_penalty", "early_stopping", "no_repeat_ngram_size")
+
+    def __init__(
+        self,
+        max_length: Optional[int] = None,
+        min_length: Optional[int] = None,
+        num_beams: Optional[int] = None,
+        length_penalty: Optional[float] = None,
+        early_stopping: Optional[bool] = None,
+        no_repeat_ngram_size: Optional[int] = None
+    ):
+        self.max_length = max_length
+        self.min_length = min_length
+        self.num_beams = num_beams
+        self.length_penalty = length_penalty
+        self.early_stopping = early_stopping
+        self.no_repeat_ngram_size = no_repeat_ngram_size
+
+    @property
+    def needs_tokens(self) -> bool:
+        """Whether the summary length still depends on the input length."""
+        return self.max_length is None or self.min_length is None
+
+    def describe(self) -> dict:
+        values = {name: getattr(self, name) for name in self.FIELDS}
+        return {name: value for name, value in values.items() if value is not None}
+
+
+def _bucket(length: int) -> int:
+    return LENGTH_BUCKET * math.ceil(length / LENGTH_BUCKET)
+
+
+def generation_params(input_tokens: int, format_type: str, options: Optional[GenerationOptions] = None) -> dict:
+    """
+    Generation keyword arguments for one summary. Without client options,
+    the maximum length is the format's share of the input tokens, bucketed
+    and capped at MAX_SUMMARY_LENGTH, and the minimum length is
+    MIN_SUMMARY_LENGTH or half the maximum, whichever is smaller; beam
+    search uses the GENERATION_* settings. Client options replace the
+    derived values but are clamped to MAX_SUMMARY_LENGTH, GENERATION_MAX_BEAMS
+    and GENERATION_MAX_NO_REPEAT_NGRAM_SIZE.
+    """
+    options = options or GenerationOptions()
+    ceiling = max(1, settings.max_summary_length)
+
+    if options.max_length is not None:
+        max_length = options.max_length
+    else:
+        ratio = FORMAT_LENGTH_RATIOS.get(format_type, DEFAULT_LENGTH_RATIO)
+        max_length = _bucket(max(1, round(input_tokens * ratio)))
+    max_length = min(max(1, max_length), ceiling)
+
+    if options.min_length is not None:
+        min_length = options.min_length
+    else:
+        min_length = min(settings.min_summary_length, max_length // 2)
+    min_length = min(max(0, min_length), max_length)
+
+    num_beams = options.num_beams if options.num_beams is not None else settings.generation_num_beams
+    no_repeat_ngram_size = (
+        options.no_repeat_ngram_size if options.no_repeat_ngram_size is not None
+        else settings.generation_no_repeat_ngram_size
+    )
+    return {
+        "max_length": max_length,
+        "min_length": min_length,
+        "num_beams": min(max(1, num_beams), max(1, settings.generation_max_beams)),
+        "length_penalty": (
+            options.length_penalty if options.length_penalty is not None else settings.generation_length_penalty
+        ),
+        "early_stopping": (
+            options.early_stopping if options.early_stopping is not None else settings.generation_early_stopping
+        ),
+        "no_repeat_ngram_size": min(max(0, no_repeat_ngram_size), settings.generation_max_no_repeat_ngram_size),
+        "do_sample": False
+    }
+
+
+def generation_signature(options: Optional[GenerationOptions] = None) -> dict:
+    """Everything generation_params depends on besides the input, for cache keys."""
+    signature = {
+        "max_length": settings.max_summary_length,
+        "min_length": settings.min_summary_length,
+        "num_beams": settings.generation_num_beams,
+        "max_beams": settings.generation_max_beams,
+        "length_penalty": settings.generation_length_penalty,
+        "early_stopping": settings.generation_early_stopping,
+        "no_repeat_ngram_size": settings.generation_no_repeat_ngram_size,
+        "max_no_repeat_ngram_size": settings.generation_max_no_repeat_ngram_size
+    }
+    if options is not None:
+        signature["requested"] = options.describe()
+    return signature
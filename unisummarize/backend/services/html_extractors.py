@@ -0,0 +1,204 @@
+import threading
+from html.parser import HTMLParser
+from typing import List, Tuple
+
+# Elements whose content is never part of the article text. Forms are not
+# skipped: many CMS and WebForms pages wrap their whole body in one, so
+# only the controls inside them are.
+SKIP_TAGS = {
+    "script", "style", "noscript", "template", "svg", "iframe",
+    "nav", "footer", "select", "button"
+}
+
+# Page banners and sidebars, skipped unless they are inside the main
+# content, where headers carry the article's headline and standfirst
+PAGE_CHROME_TAGS = {"header", "aside"}
+CONTENT_TAGS = {"article", "main"}
+
+# Elements that start a new block of text
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "li", "ul", "ol", "table", "tr",
+    "td", "th", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre", "br",
+    "dd", "dt", "figcaption", "body"
+}
+
+
+class _BlockCollector:
+    """Groups text into blocks and tracks how much of each block is link text."""
+    def __init__(self):
+        self.blocks: List[Tuple[str, int]] = []
+        self._parts: List[str] = []
+        self._link_chars = 0
+        self._skip_depth = 0
+        self._link_depth = 0
+        self._content_depth = 0
+
+    def _skips(self, tag: str) -> bool:
+        return tag in SKIP_TAGS or (tag in PAGE_CHROME_TAGS and not self._content_depth)
+
+    def start(self, tag: str) -> None:
+        if self._skips(tag):
+            self._skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self.flush()
+        if tag in CONTENT_TAGS:
+            self._content_depth += 1
+        if tag == "a":
+            self._link_depth += 1
+
+    def end(self, tag: str) -> None:
+        if tag in CONTENT_TAGS:
+            self._content_depth = max(0, self._content_depth - 1)
+        if self._skips(tag):
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in BLOCK_TAGS:
+            self.flush()
+        if tag == "a":
+            self._link_depth = max(0, self._link_depth - 1)
+
+    def data(self, text: str) -> None:
+        if self._skip_depth or not text:
+            return
+        self._parts.append(text)
+        if self._link_depth:
+            self._link_chars += len(text.strip())
+
+    def flush(self) -> None:
+        text = " ".join("".join(self._parts).split())
+        if text:
+            self.blocks.append((text, self._link_chars))
+        self._parts = []
+        self._link_chars = 0
+
+
+def remove_boilerplate(blocks: List[Tuple[str, int]], min_words: int = 3, max_link_density: float = 0.5) -> List[str]:
+    """
+    Drop navigation-like blocks: blocks that are mostly link text, and very
+    short fragments that are not sentences.
+    """
+    kept = []
+    for text, link_chars in blocks:
+        if link_chars / len(text) > max_link_density:
+            continue
+        if len(text.split()) < min_words and not text.endswith((".", "!", "?")):
+            continue
+        kept.append(text)
+    return kept
+
+
+class HTMLExtractor:
+    """Base class for HTML-to-text backends."""
+    name = "base"
+
+    def extract(self, html: str) -> str:
+        raise NotImplementedError
+
+
+class BeautifulSoupExtractor(HTMLExtractor):
+    """Original pure-Python backend: full BeautifulSoup tree, scripts and styles removed."""
+    name = "bs4"
+
+    def extract(self, html: str) -> str:
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, "html.parser")
+        for element in soup(["script", "style"]):
+            element.decompose()
+        return soup.get_text()
+
+
+class _StreamingParser(HTMLParser):
+    def __init__(self, collector: _BlockCollector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self.collector.flush()
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+
+class StreamingExtractor(HTMLExtractor):
+    """
+    Standard-library tokenizer that never builds a tree. Script, style and
+    navigation content is skipped while parsing, and boilerplate blocks are
+    dropped afterwards.
+    """
+    name = "streaming"
+
+    def extract(self, html: str) -> str:
+        collector = _BlockCollector()
+        parser = _StreamingParser(collector)
+        parser.feed(html)
+        parser.close()
+        collector.flush()
+        return "\n".join(remove_boilerplate(collector.blocks))
+
+
+class LxmlExtractor(HTMLExtractor):
+    """
+    libxml2-based backend. Parsing happens in C; the tree is walked once
+    with the same skip and boilerplate rules as the streaming backend.
+    """
+    name = "lxml"
+
+    def __init__(self):
+        from lxml import etree
+        import lxml.html
+        self._etree = etree
+        self._html = lxml.html
+        # lxml parser objects must not be shared between threads
+        self._local = threading.local()
+
+    def _parser(self):
+        parser = getattr(self._local, "parser", None)
+        if parser is None:
+            parser = self._html.HTMLParser(encoding="utf-8", remove_comments=True)
+            self._local.parser = parser
+        return parser
+
+    def extract(self, html: str) -> str:
+        root = self._etree.HTML(html.encode("utf-8"), parser=self._parser())
+        if root is None:
+            return ""
+
+        collector = _BlockCollector()
+        for event, element in self._etree.iterwalk(root, events=("start", "end")):
+            tag = element.tag if isinstance(element.tag, str) else None
+            if event == "start":
+                if tag is not None:
+                    collector.start(tag)
+                    collector.data(element.text)
+            else:
+                if tag is not None:
+                    collector.end(tag)
+                collector.data(element.tail)
+        collector.flush()
+        return "\n".join(remove_boilerplate(collector.blocks))
+
+
+HTML_EXTRACTORS = {
+    BeautifulSoupExtractor.name: BeautifulSoupExtractor,
+    StreamingExtractor.name: StreamingExtractor,
+    LxmlExtractor.name: LxmlExtractor,
+}
+
+
+def get_html_extractor(name: str) -> HTMLExtractor:
+    """
+    Create the named extractor. Falls back to the streaming backend if the
+    requested one is unknown or its dependency is not installed.
+    """
+    extractor_class = HTML_EXTRACTORS.get(name, StreamingExtractor)
+    try:
+        return extractor_class()
+    except ImportError:
+        return StreamingExtractor()
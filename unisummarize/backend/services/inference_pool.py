@@ -0,0 +1,106 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+from utils.metrics import observe_batch_stage
+
+
+def _noop() -> None:
+    """Trivial job used to start worker processes ahead of traffic."""
+
+
+def _timed_call(fn: Callable, enqueued_at: float, *args: Any) -> Tuple[float, float, Any]:
+    """Run fn(*args) on a worker, returning (queue wait, run time, result)."""
+    # Wall-clock time so the wait is measurable across processes
+    started_at = time.time()
+    result = fn(*args)
+    return started_at - enqueued_at, time.time() - started_at, result
+
+
+class InferenceQueueFull(Exception):
+    """Raised when the inference pool already holds its maximum number of jobs."""
+
+
+class InferencePool:
+    """
+    Bounded worker pool for blocking model inference.
+
+    Jobs run on a thread or process executor and are awaited as futures, so
+    the event loop stays free while the model is busy. The number of jobs
+    waiting or running is capped by max_queue_size; submissions past that
+    limit fail fast with InferenceQueueFull instead of piling up. Queue
+    wait and generation time of every job are recorded as stage metrics,
+    once per request of the micro-batch the job runs.
+    """
+    def __init__(
+        self,
+        kind: str = "thread",
+        max_workers: int = 1,
+        max_queue_size: int = 32,
+        initializer: Optional[Callable] = None,
+        initargs: Tuple = ()
+    ):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unsupported executor kind: {kind}")
+        self.kind = kind
+        self.max_workers = max(1, max_workers)
+        self.max_queue_size = max(1, max_queue_size)
+        self._initializer = initializer
+        self._initargs = initargs
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs currently queued or running."""
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        """Create the underlying executor on first use."""
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=self._initializer,
+                    initargs=self._initargs
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="inference",
+                    initializer=self._initializer,
+                    initargs=self._initargs
+                )
+        return self._executor
+
+    async def submit(self, fn: Callable, *args: Any) -> Any:
+        """Run fn(*args) on the pool and await its result."""
+        if self._pending >= self.max_queue_size:
+            raise InferenceQueueFull(
+                f"Inference queue is full ({self.max_queue_size} pending jobs). Please try again later."
+            )
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            wait, run, result = await loop.run_in_executor(
+                self._get_executor(), _timed_call, fn, time.time(), *args
+            )
+            observe_batch_stage("queue_wait", max(0.0, wait))
+            observe_batch_stage("generation", run)
+            return result
+        finally:
+            self._pending -= 1
+
+    def prestart(self) -> None:
+        """Start every worker (running its initializer) before the first request."""
+        executor = self._get_executor()
+        for future in [executor.submit(_noop) for _ in range(self.max_workers)]:
+            future.result()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the executor and release its workers."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
@@ -0,0 +1,321 @@
+import asyncio
+import itertools
+import json
+import os
+import shutil
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Awaitable, BinaryIO, Callable, Dict, Optional, Union
+
+from config import settings
+from utils.logger import log_error, log_info, log_warning
+
+# Queue order: lower values run first
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+def _noop() -> None:
+    """Queued behind pending writes to wait for them."""
+
+
+class JobQueueFull(Exception):
+    """Raised when the job queue already holds its maximum number of jobs."""
+
+
+class Job:
+    """A summarization job and its persisted state."""
+    def __init__(
+        self,
+        job_id: str,
+        filename: str,
+        domain: str,
+        format_type: str,
+        priority: str = "normal",
+        created_at: Optional[float] = None,
+        status: str = QUEUED,
+        stage: str = QUEUED,
+        started_at: Optional[float] = None,
+        finished_at: Optional[float] = None,
+        summary: Optional[str] = None,
+        error: Optional[str] = None
+    ):
+        self.id = job_id
+        self.filename = filename
+        self.domain = domain
+        self.format_type = format_type
+        self.priority = priority
+        self.created_at = created_at or time.time()
+        self.status = status
+        self.stage = stage
+        self.started_at = started_at
+        self.finished_at = finished_at
+        self.summary = summary
+        self.error = error
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (COMPLETED, FAILED)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "filename": self.filename,
+            "domain": self.domain,
+            "format_type": self.format_type,
+            "priority": self.priority,
+            "created_at": self.created_at,
+            "status": self.status,
+            "stage": self.stage,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "summary": self.summary,
+            "error": self.error
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Job":
+        data = dict(data)
+        return cls(data.pop("id"), **data)
+
+
+# Handlers receive the job and its input as an open binary file
+JobHandler = Callable[[Job, BinaryIO], Awaitable[str]]
+
+
+class JobManager:
+    """
+    Runs summarization jobs in the background.
+
+    Jobs wait in a priority queue (high, normal, low; first come first
+    served within a priority) bounded by max_queue_size, and are run by a
+    fixed number of worker tasks. Each job is a directory under `directory`
+    holding its metadata and uploaded input, so queued and interrupted jobs
+    are picked up again after a restart. Finished jobs, and their results,
+    are removed result_ttl seconds after they finish.
+    """
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        workers: int = 2,
+        max_queue_size: int = 100,
+        result_ttl: float = 3600
+    ):
+        self.directory = Path(directory)
+        self.workers = max(1, workers)
+        self.max_queue_size = max(1, max_queue_size)
+        self.result_ttl = result_ttl
+        self.jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._order = itertools.count()
+        self._tasks = []
+        self._handler: Optional[JobHandler] = None
+        # One writer thread keeps each job's metadata writes in order
+        self._io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jobs")
+
+    def _job_dir(self, job_id: str) -> Path:
+        return self.directory / job_id
+
+    def _save(self, job: Job) -> None:
+        """Write job metadata on the calling thread, while loading persisted jobs."""
+        self._write_metadata(job.id, job.to_dict())
+
+    def _write_metadata(self, job_id: str, data: dict) -> None:
+        """Write job metadata atomically."""
+        path = self._job_dir(job_id) / "job.json"
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def _persist(self, job: Job) -> asyncio.Future:
+        """
+        Write a snapshot of job metadata on the writer thread. Writes run in
+        the order they were requested, so the latest state always wins;
+        failures are logged.
+        """
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._io_executor, self._write_logged, job.id, job.to_dict())
+
+    def _write_logged(self, job_id: str, data: dict) -> None:
+        try:
+            self._write_metadata(job_id, data)
+        except OSError as e:
+            log_warning("Failed to persist job", {"job_id": job_id, "error": str(e)})
+
+    def _remove(self, job_id: str) -> None:
+        self.jobs.pop(job_id, None)
+        shutil.rmtree(self._job_dir(job_id), ignore_errors=True)
+
+    @property
+    def queued(self) -> int:
+        """Number of jobs waiting for a worker."""
+        return sum(1 for job in self.jobs.values() if job.status == QUEUED)
+
+    def _enqueue(self, job: Job) -> None:
+        priority = PRIORITIES.get(job.priority, PRIORITIES["normal"])
+        self._queue.put_nowait((priority, job.created_at, next(self._order), job.id))
+
+    def queue_position(self, job: Job) -> Optional[int]:
+        """1-based position of a queued job among the queued jobs."""
+        if job.status != QUEUED:
+            return None
+        key = (PRIORITIES.get(job.priority, 1), job.created_at)
+        return 1 + sum(
+            1 for other in self.jobs.values()
+            if other.status == QUEUED and (PRIORITIES.get(other.priority, 1), other.created_at) < key
+        )
+
+    def _load(self) -> None:
+        """Load persisted jobs; queued and interrupted jobs go back in the queue."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        requeued = 0
+        for path in self.directory.glob("*/job.json"):
+            try:
+                job = Job.from_dict(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError, TypeError) as e:
+                log_warning("Skipping unreadable job", {"path": str(path), "error": str(e)})
+                continue
+            if job.status == RUNNING:
+                job.status, job.stage, job.started_at = QUEUED, QUEUED, None
+                self._save(job)
+            self.jobs[job.id] = job
+            if job.status == QUEUED:
+                requeued += 1
+        for job in sorted(self.jobs.values(), key=lambda job: job.created_at):
+            if job.status == QUEUED:
+                self._enqueue(job)
+        if self.jobs:
+            log_info("Loaded persisted jobs", {"jobs": len(self.jobs), "queued": requeued})
+
+    async def start(self, handler: JobHandler) -> None:
+        """Load persisted jobs and start the workers and the cleanup task."""
+        self._handler = handler
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue()
+            self._load()
+        self.cleanup()
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.ensure_future(self._cleanup_loop()))
+
+    async def stop(self) -> None:
+        """Stop the workers. Running jobs stay persisted and are rerun on the next start."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Wait for metadata writes still queued on the writer thread
+        await asyncio.get_running_loop().run_in_executor(self._io_executor, _noop)
+
+    @staticmethod
+    def _write_input(path: Path, content: Union[bytes, BinaryIO]) -> None:
+        if isinstance(content, (bytes, bytearray)):
+            path.write_bytes(content)
+            return
+        content.seek(0)
+        with open(path, "wb") as output:
+            shutil.copyfileobj(content, output)
+
+    async def submit(self, content: Union[bytes, BinaryIO], filename: str, domain: str, format_type: str, priority: str = "normal") -> Job:
+        """Persist a new job and queue it."""
+        if self._queue is None:
+            raise RuntimeError("Job manager is not running")
+        if self.queued >= self.max_queue_size:
+            raise JobQueueFull(
+                f"Job queue is full ({self.max_queue_size} queued jobs). Please try again later."
+            )
+
+        job = Job(uuid.uuid4().hex, filename, domain, format_type, priority)
+        # Registered before writing so concurrent submissions see the slot as taken
+        self.jobs[job.id] = job
+        try:
+            job_dir = self._job_dir(job.id)
+            job_dir.mkdir(parents=True)
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._write_input, job_dir / "input", content)
+            await loop.run_in_executor(self._io_executor, self._write_metadata, job.id, job.to_dict())
+        except Exception:
+            self._remove(job.id)
+            raise
+        self._enqueue(job)
+        log_info("Job queued", {"job_id": job.id, "filename": filename, "priority": priority})
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job unless it is unknown or its result has expired."""
+        job = self.jobs.get(job_id)
+        if job is not None and self._expired(job):
+            self._remove(job_id)
+            return None
+        return job
+
+    def set_stage(self, job: Job, stage: str) -> None:
+        """Record progress of a running job; it is persisted in the background."""
+        job.stage = stage
+        self._persist(job)
+
+    async def _worker(self) -> None:
+        while True:
+            *_, job_id = await self._queue.get()
+            job = self.jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                continue
+
+            job.status, job.stage, job.started_at = RUNNING, RUNNING, time.time()
+            self._persist(job)
+            try:
+                with open(self._job_dir(job.id) / "input", "rb") as content:
+                    job.summary = await self._handler(job, content)
+                job.status = job.stage = COMPLETED
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log_error(e, {"job_id": job.id, "filename": job.filename})
+                job.status = job.stage = FAILED
+                job.error = str(e)
+            job.finished_at = time.time()
+            # Shielded: cancelling a queued executor call would drop the final state
+            await asyncio.shield(self._persist(job))
+            # The result is kept; the input is no longer needed
+            (self._job_dir(job.id) / "input").unlink(missing_ok=True)
+            log_info("Job finished", {
+                "job_id": job.id,
+                "status": job.status,
+                "seconds": round(job.finished_at - job.started_at, 2)
+            })
+
+    def _expired(self, job: Job, now: Optional[float] = None) -> bool:
+        return job.finished and (now or time.time()) - job.finished_at > self.result_ttl
+
+    def cleanup(self) -> int:
+        """Remove finished jobs whose results have expired."""
+        now = time.time()
+        expired = [job.id for job in self.jobs.values() if self._expired(job, now)]
+        for job_id in expired:
+            self._remove(job_id)
+        return len(expired)
+
+    async def _cleanup_loop(self) -> None:
+        while True:
+            await asyncio.sleep(max(1.0, min(self.result_ttl, 60.0)))
+            self.cleanup()
+
+    def stats(self) -> dict:
+        counts = {QUEUED: 0, RUNNING: 0, COMPLETED: 0, FAILED: 0}
+        for job in self.jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {**counts, "workers": self.workers, "max_queue_size": self.max_queue_size}
+
+
+# Job manager shared by the API; started from the application lifespan
+job_manager = JobManager(
+    settings.job_dir,
+    workers=settings.job_workers,
+    max_queue_size=settings.job_queue_size,
+    result_ttl=settings.temp_file_ttl
+)
@@ -0,0 +1,137 @@
+import importlib.util
+from abc import ABC, abstractmethod
+import os
+import shutil
+from pathlib import Path
+from typing import Optional, Union
+
+# Backends build a transformers summarization pipeline, so callers keep using
+# pipeline(texts), pipeline.tokenizer and pipeline.model.generate() unchanged.
+# torch, transformers and optimum are imported when a model is loaded.
+
+
+class ModelBackend(ABC):
+    """Base class for summarization model backends; subclasses implement load."""
+    name = "base"
+
+    @classmethod
+    def available(cls) -> bool:
+        """Whether the backend's dependencies are installed."""
+        return True
+
+    def cache_tag(self, model_name: str) -> str:
+        """Identifies the model and backend in summary cache keys."""
+        return f"{model_name}+{self.name}"
+
+    @abstractmethod
+    def load(self, model_name: str, tokenizer=None):
+        """Load the summarization pipeline for model_name, reusing tokenizer if given."""
+
+
+class TorchBackend(ModelBackend):
+    """Original backend: the fp32 PyTorch pipeline."""
+    name = "torch"
+
+    def cache_tag(self, model_name: str) -> str:
+        # Keeps the cache keys written before backends were selectable
+        return model_name
+
+    def load(self, model_name: str, tokenizer=None):
+        from transformers import pipeline
+        return pipeline("summarization", model=model_name, tokenizer=tokenizer)
+
+
+class QuantizedBackend(ModelBackend):
+    """
+    PyTorch model with dynamic int8 quantization of its Linear layers.
+    Weights are quantized once at load time and activations on the fly, so
+    no calibration data is needed; this roughly quarters the size of the
+    Linear weights and speeds up CPU matrix multiplies.
+    """
+    name = "quantized"
+
+    def load(self, model_name: str, tokenizer=None):
+        import torch
+        from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, pipeline
+
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+        model.eval()
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        tokenizer = tokenizer or AutoTokenizer.from_pretrained(model_name)
+        return pipeline("summarization", model=model, tokenizer=tokenizer)
+
+
+class OnnxBackend(ModelBackend):
+    """
+    ONNX Runtime model exported with optimum. The first load exports the
+    graph to cache_dir; later loads, and other worker processes, reuse the
+    exported graph.
+    """
+    name = "onnx"
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        self.cache_dir = Path(cache_dir)
+
+    @classmethod
+    def available(cls) -> bool:
+        return (
+            importlib.util.find_spec("optimum") is not None
+            and importlib.util.find_spec("onnxruntime") is not None
+        )
+
+    def export_dir(self, model_name: str) -> Path:
+        return self.cache_dir / "onnx" / model_name.replace("/", "--")
+
+    def load(self, model_name: str, tokenizer=None):
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        from transformers import AutoTokenizer, pipeline
+
+        path = self.export_dir(model_name)
+        if not (path / "config.json").exists():
+            model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True)
+            export_tokenizer = AutoTokenizer.from_pretrained(model_name)
+            # Export next to the final directory and move it in place, so a
+            # concurrent loader never sees a partial export
+            tmp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+            model.save_pretrained(tmp_path)
+            export_tokenizer.save_pretrained(tmp_path)
+            try:
+                os.replace(tmp_path, path)
+            except OSError:
+                # Another process finished its export first
+                shutil.rmtree(tmp_path, ignore_errors=True)
+        model = ORTModelForSeq2SeqLM.from_pretrained(path)
+        tokenizer = tokenizer or AutoTokenizer.from_pretrained(path)
+        return pipeline("summarization", model=model, tokenizer=tokenizer)
+
+
+def tokenizers_compatible(model_name: str, other_model_name: str) -> bool:
+    """
+    Whether two models can share a tokenizer: same architecture and
+    vocabulary size, as with distilled checkpoints of a model.
+    """
+    from transformers import AutoConfig
+
+    config = AutoConfig.from_pretrained(model_name)
+    other = AutoConfig.from_pretrained(other_model_name)
+    return (config.model_type, config.vocab_size) == (other.model_type, other.vocab_size)
+
+
+MODEL_BACKENDS = {
+    TorchBackend.name: TorchBackend,
+    QuantizedBackend.name: QuantizedBackend,
+    OnnxBackend.name: OnnxBackend,
+}
+
+
+def get_model_backend(name: str, cache_dir: Optional[Union[str, Path]] = None) -> ModelBackend:
+    """
+    Create the named backend. Falls back to the PyTorch backend if the
+    requested one is unknown or its dependencies are not installed.
+    """
+    backend_class = MODEL_BACKENDS.get(name, TorchBackend)
+    if not backend_class.available():
+        return TorchBackend()
+    if backend_class is OnnxBackend:
+        return OnnxBackend(cache_dir or "models")
+    return backend_class()
@@ -0,0 +1,154 @@
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import parse_qsl
+
+from utils.metrics import MODEL_GENERATION_SECONDS, MODEL_GENERATIONS, MODEL_REQUESTS, Counter
+
+
+class RouteRule:
+    """Send requests matching every given condition to model."""
+    def __init__(
+        self,
+        model: str,
+        min_tokens: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        domains: Optional[Sequence[str]] = None,
+        formats: Optional[Sequence[str]] = None
+    ):
+        self.model = model
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+        self.domains = set(domains) if domains else None
+        self.formats = set(formats) if formats else None
+
+    @property
+    def needs_tokens(self) -> bool:
+        return self.min_tokens is not None or self.max_tokens is not None
+
+    def matches(self, tokens: int, domain: str, format_type: str) -> bool:
+        if self.min_tokens is not None and tokens < self.min_tokens:
+            return False
+        if self.max_tokens is not None and tokens > self.max_tokens:
+            return False
+        if self.domains is not None and domain not in self.domains:
+            return False
+        if self.formats is not None and format_type not in self.formats:
+            return False
+        return True
+
+    def describe(self) -> dict:
+        conditions = {
+            "min_tokens": self.min_tokens,
+            "max_tokens": self.max_tokens,
+            "domains": sorted(self.domains) if self.domains else None,
+            "formats": sorted(self.formats) if self.formats else None
+        }
+        return {"model": self.model, **{name: value for name, value in conditions.items() if value is not None}}
+
+
+def parse_routes(spec: str) -> List[RouteRule]:
+    """
+    Parse MODEL_ROUTES. Rules are separated by ";" and written like a URL
+    query: model?condition&condition, with conditions min_tokens=N,
+    max_tokens=N, domain=a,b and format=a,b. For example:
+
+        sshleifer/distilbart-cnn-12-6?max_tokens=512;sshleifer/distilbart-cnn-12-6?format=paragraph
+    """
+    rules = []
+    for item in spec.split(";"):
+        item = item.strip()
+        if not item:
+            continue
+        model, _, query = item.partition("?")
+        conditions = {}
+        for name, value in parse_qsl(query, keep_blank_values=True):
+            if name in ("min_tokens", "max_tokens"):
+                conditions[name] = int(value)
+            elif name in ("domain", "format"):
+                conditions[name + "s"] = [part.strip() for part in value.split(",") if part.strip()]
+            else:
+                raise ValueError(f"Unknown model route condition '{name}' in '{item}'")
+        rules.append(RouteRule(model.strip(), **conditions))
+    return rules
+
+
+class ModelRouter:
+    """
+    Picks the model for a summary from an ordered list of rules; the first
+    matching rule wins and requests matching none go to the default model.
+
+    Routed requests and generation time are counted per model, and the
+    latency saved by routing is estimated from the mean generation time per
+    input of each model against the default model.
+    """
+    def __init__(
+        self,
+        default_model: str,
+        rules: Optional[List[RouteRule]] = None,
+        requests: Counter = MODEL_REQUESTS,
+        generations: Counter = MODEL_GENERATIONS,
+        generation_seconds: Counter = MODEL_GENERATION_SECONDS
+    ):
+        self.default_model = default_model
+        self.rules = list(rules or [])
+        self._requests = requests
+        self._generations = generations
+        self._generation_seconds = generation_seconds
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.rules)
+
+    @property
+    def needs_tokens(self) -> bool:
+        """Whether routing needs the input's token count."""
+        return any(rule.needs_tokens for rule in self.rules)
+
+    @property
+    def signature(self) -> str:
+        """Identifies the routing configuration in summary cache keys."""
+        return ";".join(str(sorted(rule.describe().items())) for rule in self.rules)
+
+    def route(self, tokens: int, domain: str, format_type: str) -> str:
+        """Return the model for a request and count it."""
+        model = next(
+            (rule.model for rule in self.rules if rule.matches(tokens, domain, format_type)),
+            self.default_model
+        )
+        self._requests.inc((model,))
+        return model
+
+    def record(self, model: str, inputs: int, seconds: float) -> None:
+        """Record a generation batch; every input in it waited the whole batch."""
+        self._generations.inc((model,), inputs)
+        self._generation_seconds.inc((model,), seconds * inputs)
+
+    def stats(self) -> dict:
+        requests = self._requests.collect()
+        generations = self._generations.collect()
+        seconds = self._generation_seconds.collect()
+
+        models: Dict[str, dict] = {}
+        for model in {self.default_model, *(rule.model for rule in self.rules)}:
+            count = generations.get((model,), 0)
+            total = seconds.get((model,), 0.0)
+            models[model] = {
+                "requests": requests.get((model,), 0),
+                "generations": count,
+                "generation_seconds": round(total, 4),
+                "mean_generation_ms": round(total / count * 1000, 2) if count else None
+            }
+
+        saved = None
+        default_mean = models[self.default_model]["mean_generation_ms"]
+        if default_mean is not None:
+            saved = sum(
+                stats["generations"] * (default_mean - stats["mean_generation_ms"]) / 1000
+                for model, stats in models.items()
+                if model != self.default_model and stats["generations"]
+            )
+        return {
+            "default_model": self.default_model,
+            "rules": [rule.describe() for rule in self.rules],
+            "models": models,
+            "estimated_seconds_saved": round(saved, 4) if saved is not None else None
+        }
@@ -0,0 +1,66 @@
+import re
+import unicodedata
+
+# Characters kept by normalization: letters, marks and numbers in any
+# script, all punctuation (quotes, apostrophes, brackets, dashes...), and
+# currency and math symbols. Other symbols (emoji, pictographs, box
+# drawing), control and format characters (zero-width spaces, soft
+# hyphens, BOMs) are dropped; whitespace runs collapse to one space.
+KEEP_CATEGORIES = ("L", "M", "N", "P", "Sc", "Sm")
+KEEP_CHARACTERS = "°§"
+
+
+class NormalizedText(str):
+    """Text returned by normalize_text; normalizing it again is a no-op."""
+    __slots__ = ()
+
+
+class _FilterTable(dict):
+    """
+    str.translate table built lazily: the first occurrence of a code point
+    decides whether it is kept (mapped to itself) or dropped (mapped to
+    None), and the decision is cached for every later occurrence.
+    """
+    def __missing__(self, codepoint: int):
+        character = chr(codepoint)
+        category = unicodedata.category(character)
+        keep = (
+            character.isspace()
+            or category.startswith(KEEP_CATEGORIES)
+            or character in KEEP_CHARACTERS
+        )
+        self[codepoint] = codepoint if keep else None
+        return self[codepoint]
+
+
+_FILTER = _FilterTable()
+
+
+def _drop_unwanted(text: str) -> str:
+    """
+    Remove the characters the filter table drops. ASCII text takes one
+    str.translate pass; translate is slow on wide strings, so other text is
+    scanned once for its distinct characters and only the dropped ones, if
+    any, are removed by a single regex substitution.
+    """
+    if text.isascii():
+        return text.translate(_FILTER)
+    dropped = [character for character in set(text) if _FILTER[ord(character)] is None]
+    if not dropped:
+        return text
+    return re.sub("[" + "".join(map(re.escape, dropped)) + "]+", "", text)
+
+
+def normalize_text(text: str) -> NormalizedText:
+    """
+    Normalize extracted text for summarization: NFKC (ligatures, full-width
+    forms) for non-ASCII text, one pass dropping unwanted characters, and
+    one split/join collapsing whitespace. The result is marked as
+    normalized, so text cleaned at extraction time is not scanned again
+    when it is summarized.
+    """
+    if isinstance(text, NormalizedText):
+        return text
+    if not text.isascii():
+        text = unicodedata.normalize("NFKC", text)
+    return NormalizedText(" ".join(_drop_unwanted(text).split()))
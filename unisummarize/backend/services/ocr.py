@@ -0,0 +1,126 @@
+import asyncio
+import io
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Union
+
+from services.batcher import MicroBatcher
+
+
+def preprocess_image(image_content: bytes, max_side: int):
+    """
+    Decode an image, convert it to grayscale and downscale it so its longest
+    side is at most max_side. Returns a 2-D uint8 array.
+    """
+    import numpy as np
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(image_content))
+    image = image.convert("L")
+    if max(image.size) > max_side:
+        image.thumbnail((max_side, max_side))
+    return np.asarray(image)
+
+
+def pad_images(images: list) -> list:
+    """Pad grayscale arrays with white to a common shape for batched recognition."""
+    import numpy as np
+
+    height = max(image.shape[0] for image in images)
+    width = max(image.shape[1] for image in images)
+    padded = []
+    for image in images:
+        canvas = np.full((height, width), 255, dtype=np.uint8)
+        canvas[:image.shape[0], :image.shape[1]] = image
+        padded.append(canvas)
+    return padded
+
+
+class OCREngine:
+    """
+    Thread-safe OCR on a pool of EasyOCR readers.
+
+    Each worker thread checks a reader out of the pool for the duration of a
+    job, so readers are never used concurrently. Images queued together are
+    preprocessed, padded to a common size and recognized as one batch.
+    """
+    def __init__(
+        self,
+        languages: List[str],
+        workers: int = 1,
+        max_side: int = 2048,
+        batch_size: int = 4,
+        batch_wait_ms: float = 20,
+        gpu: bool = False
+    ):
+        self.languages = languages
+        self.workers = max(1, workers)
+        self.max_side = max_side
+        self.gpu = gpu
+        self._readers: "queue.Queue" = queue.Queue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.batcher = MicroBatcher(
+            self._run_batch, max_batch_size=batch_size, max_wait_ms=batch_wait_ms, wait_stage="ocr_batch_wait"
+        )
+
+    def _create_reader(self):
+        import easyocr
+        return easyocr.Reader(self.languages, gpu=self.gpu)
+
+    def _checkout_reader(self):
+        """Take an idle reader, creating one if the pool is not full yet."""
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._reader_lock:
+            if self._reader_count < self.workers:
+                self._reader_count += 1
+                try:
+                    return self._create_reader()
+                except Exception:
+                    self._reader_count -= 1
+                    raise
+        return self._readers.get()
+
+    def _recognize(self, contents: List[bytes]) -> List[Union[str, Exception]]:
+        """
+        Preprocess and recognize a batch of images (runs on a worker thread).
+        An image that cannot be decoded gets its exception as its result, so
+        only its own caller fails; the others are still recognized.
+        """
+        results: List[Union[str, Exception]] = [None] * len(contents)
+        images, positions = [], []
+        for position, content in enumerate(contents):
+            try:
+                images.append(preprocess_image(content, self.max_side))
+                positions.append(position)
+            except Exception as e:
+                results[position] = e
+        if not images:
+            return results
+
+        reader = self._checkout_reader()
+        try:
+            if len(images) == 1:
+                detected = [reader.readtext(images[0])]
+            else:
+                detected = reader.readtext_batched(pad_images(images))
+        finally:
+            self._readers.put(reader)
+        for position, detections in zip(positions, detected):
+            results[position] = " ".join(result[1] for result in detections)
+        return results
+
+    async def _run_batch(self, contents: List[bytes], params: dict) -> List[Union[str, Exception]]:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ocr")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._recognize, contents)
+
+    async def read_text(self, image_content: bytes) -> str:
+        """Extract the text of an image."""
+        return await self.batcher.submit(image_content, {})
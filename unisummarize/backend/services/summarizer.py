@@ -1,29 +1,420 @@
-from transformers import pipeline
-from typing import List, Optional
-import requests
-from bs4 import BeautifulSoup
-import pytesseract
-from PIL import Image
-import io
-import docx
-import PyPDF2
-import easyocr
+from typing import AsyncIterator, BinaryIO, Callable, List, Optional, Tuple, Union
+import asyncio
+import threading
+import time
 import re
 
+from config import settings
+from services.batcher import MicroBatcher
+from services.cache import SummaryCache
+from services.chunker import count_tokens, split_text
+from services.extraction import extract_docx_text, extract_pdf_text
+from services.generation import GenerationOptions, estimate_tokens, generation_params, generation_signature
+from services.html_extractors import HTMLExtractor, get_html_extractor
+from services.inference_pool import InferencePool, InferenceQueueFull
+from services.model_backends import ModelBackend, get_model_backend, tokenizers_compatible
+from services.model_router import ModelRouter, parse_routes
+from services.normalize import normalize_text
+from services.ocr import OCREngine
+from utils.fetch_cache import FetchCache
+from utils.http_client import FetchError, http_fetcher
+from utils.logger import log_error, log_info
+from utils.metrics import count_cache_lookup, set_request_labels, stage_timer
+
+# Heavy dependencies (transformers, easyocr, PyPDF2, docx, lxml/bs4, and numpy
+# through services.extractive) are imported on first use so importing this
+# module stays cheap.
+
+MODEL_NAME = settings.summarization_model
+
+# Upper bound on reduce passes over chunk summaries
+MAX_REDUCE_PASSES = 3
+
+# Pre-selection picks from this many times its budget of extracted text,
+# so there is choice left without extracting pages that are never used
+PRESELECT_OVERSAMPLE = 4
+
+# Sentence boundaries used by the bullet format
+SENTENCE_END = re.compile(r'[.!?]+')
+
+# Pipelines owned by a worker process when the process executor is used
+_worker_summarizer = None
+_worker_backend = None
+_worker_routed = {}
+
+def _load_pipeline(model_name: str, backend: ModelBackend, tokenizer=None):
+    """Load the summarization pipeline with the given model backend."""
+    return backend.load(model_name, tokenizer=tokenizer)
+
+def _shared_tokenizer(primary, model_name: str):
+    """The primary pipeline's tokenizer if model_name can use it, else None."""
+    return primary.tokenizer if tokenizers_compatible(MODEL_NAME, model_name) else None
+
+def _init_worker(model_name: str, backend_name: str, model_cache_dir: str) -> None:
+    """Load the summarization model inside an inference worker process."""
+    global _worker_summarizer, _worker_backend
+    _worker_backend = get_model_backend(backend_name, model_cache_dir)
+    _worker_summarizer = _load_pipeline(model_name, _worker_backend)
+
+def _worker_pipeline(model_name: str):
+    """Pipeline for a routed model inside a worker process, loaded on first use."""
+    if model_name == MODEL_NAME:
+        return _worker_summarizer
+    if model_name not in _worker_routed:
+        _worker_routed[model_name] = _load_pipeline(
+            model_name, _worker_backend, _shared_tokenizer(_worker_summarizer, model_name)
+        )
+    return _worker_routed[model_name]
+
+def _run_pipeline(summarizer, texts: List[str], params: dict) -> List[str]:
+    """Run the summarization pipeline and return one summary per input."""
+    outputs = summarizer(texts, **params)
+    return [output['summary_text'] for output in outputs]
+
+def _worker_generate(texts: List[str], params: dict) -> List[str]:
+    """Entry point for generation jobs submitted to a worker process."""
+    params = dict(params)
+    return _run_pipeline(_worker_pipeline(params.pop("model_name", MODEL_NAME)), texts, params)
+
+def _text_streamer(tokenizer, emit: Callable[[str], None]):
+    """Streamer passing each piece of decoded text to emit as generation proceeds."""
+    from transformers import TextStreamer
+
+    class CallbackStreamer(TextStreamer):
+        def on_finalized_text(self, text: str, stream_end: bool = False) -> None:
+            if text:
+                emit(text)
+
+    return CallbackStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True)
+
+def _cancel_criteria(cancelled: threading.Event):
+    """Stopping criteria ending generation once cancelled is set."""
+    import torch
+    from transformers import StoppingCriteria, StoppingCriteriaList
+
+    class Cancelled(StoppingCriteria):
+        def __call__(self, input_ids, scores, **kwargs):
+            return torch.full((input_ids.shape[0],), cancelled.is_set(), dtype=torch.bool, device=input_ids.device)
+
+    return StoppingCriteriaList([Cancelled()])
+
+class StreamFormatter:
+    """
+    Applies a summary format incrementally while the summary is generated.
+
+    feed() returns the part of the formatted output that can no longer
+    change: paragraphs pass through, the detailed header goes out first and
+    bullets are emitted sentence by sentence. finish() formats the complete
+    summary and returns whatever was not streamed yet, so the streamed
+    pieces add up to the same text as the non-streaming endpoint.
+    """
+    def __init__(self, format_type: str, format_summary: Callable[[str, str], str]):
+        self.format_type = format_type
+        self._format_summary = format_summary
+        self.summary = ""
+        self.emitted = ""
+        self._pending = ""
+        self._bullets = 0
+
+    def _feed_bullets(self, text: str) -> str:
+        self._pending += text
+        out = ""
+        while True:
+            match = SENTENCE_END.search(self._pending)
+            # A terminator at the very end may still be followed by more
+            if match is None or match.end() == len(self._pending):
+                break
+            sentence = self._pending[:match.start()].strip()
+            self._pending = self._pending[match.end():]
+            if sentence:
+                out += ("\n" if self._bullets else "") + f"• {sentence}"
+                self._bullets += 1
+        return out
+
+    def feed(self, text: str) -> str:
+        """Add generated text and return the formatted output that is final."""
+        self.summary += text
+        if self.format_type == "bullet":
+            out = self._feed_bullets(text)
+        elif self.format_type == "detailed":
+            out = text if self.emitted else "Key Points:\n" + text
+        else:
+            out = text
+        self.emitted += out
+        return out
+
+    def finish(self) -> Tuple[str, str]:
+        """Return (remaining output, complete formatted summary)."""
+        final = self._format_summary(self.summary, self.format_type)
+        rest = final[len(self.emitted):] if final.startswith(self.emitted) else ""
+        self.emitted += rest
+        return rest, final
+
 class SummarizerService:
+    """
+    Summarization service with lazily loaded models.
+
+    Nothing heavy is loaded at construction time. The model is loaded on the
+    first request or by warm_up(), and `status` reports the loading state
+    (not_loaded, loading, ready, failed) for health checks.
+    """
     def __init__(self):
-        # Initialize the summarization model
-        self.summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
-        # Initialize EasyOCR for image text extraction
-        self.reader = easyocr.Reader(['en'])
+        # Unknown backends, or ones whose dependencies are missing, fall back to torch
+        self.model_backend = get_model_backend(settings.model_backend, settings.model_cache_dir)
+        # Rules sending some requests to other (e.g. distilled) models; empty sends all to MODEL_NAME
+        self.router = ModelRouter(MODEL_NAME, parse_routes(settings.model_routes))
+        if settings.inference_executor == "process":
+            # Each worker process loads its own copy of the model
+            self.inference_pool = InferencePool(
+                "process",
+                max_workers=settings.inference_workers,
+                max_queue_size=settings.inference_queue_size,
+                initializer=_init_worker,
+                initargs=(MODEL_NAME, self.model_backend.name, str(settings.model_cache_dir))
+            )
+        else:
+            self.inference_pool = InferencePool(
+                "thread",
+                max_workers=settings.inference_workers,
+                max_queue_size=settings.inference_queue_size
+            )
+        self.status = "not_loaded"
+        self._summarizer = None
+        self._routed = {}
+        self._tokenizer = None
+        self._html_extractor = None
+        self._ocr_engine = None
+        self._load_lock = threading.Lock()
+        # Cache generated summaries by content hash
+        self.cache = SummaryCache(
+            max_entries=settings.cache_max_entries,
+            ttl=settings.cache_ttl,
+            disk_path=settings.cache_disk_path,
+            max_disk_entries=settings.cache_disk_max_entries,
+            prune_interval=settings.cache_disk_prune_interval
+        ) if settings.cache_enabled else None
+        # HTTP validators and extracted text for fetched URLs
+        self.fetch_cache = FetchCache(
+            max_entries=settings.fetch_cache_max_entries,
+            max_bytes=settings.fetch_cache_max_bytes
+        ) if settings.fetch_cache_enabled else None
+        # Group concurrent requests into padded generation batches
+        self.batcher = MicroBatcher(
+            self._run_batch,
+            max_batch_size=settings.batch_max_size,
+            max_wait_ms=settings.batch_max_wait_ms
+        )
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the model is loaded and requests will not pay the load cost."""
+        return self.status == "ready"
+
+    def load_model(self) -> None:
+        """Load the summarization model if it is not loaded yet (blocking)."""
+        with self._load_lock:
+            if self.status == "ready":
+                return
+            self.status = "loading"
+            start = time.perf_counter()
+            try:
+                if self.inference_pool.kind == "process":
+                    self.inference_pool.prestart()
+                else:
+                    self._summarizer = _load_pipeline(MODEL_NAME, self.model_backend)
+            except Exception as e:
+                self.status = "failed"
+                log_error(e, {"model": MODEL_NAME, "backend": self.model_backend.name})
+                raise
+            self.status = "ready"
+            log_info("Summarization model loaded", {
+                "model": MODEL_NAME,
+                "backend": self.model_backend.name,
+                "executor": self.inference_pool.kind,
+                "seconds": round(time.perf_counter() - start, 2)
+            })
+
+    def warm_up(self) -> threading.Thread:
+        """Load the model on a background thread."""
+        def _warm_up():
+            try:
+                self.load_model()
+            except Exception:
+                pass  # already logged; the next request retries the load
+
+        thread = threading.Thread(target=_warm_up, name="model-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    @property
+    def summarizer(self):
+        """Summarization pipeline for the thread executor, loaded on first use."""
+        if self.inference_pool.kind == "process":
+            return None
+        if self._summarizer is None:
+            self.load_model()
+        return self._summarizer
+
+    def _pipeline_for(self, model_name: str):
+        """Pipeline for the thread executor, loading routed models on first use."""
+        if model_name == MODEL_NAME:
+            return self.summarizer
+        summarizer = self._routed.get(model_name)
+        if summarizer is None:
+            # Loads the primary model first when it shares its tokenizer
+            tokenizer = _shared_tokenizer(self.summarizer, model_name)
+            with self._load_lock:
+                summarizer = self._routed.get(model_name)
+                if summarizer is None:
+                    start = time.perf_counter()
+                    summarizer = _load_pipeline(model_name, self.model_backend, tokenizer)
+                    self._routed[model_name] = summarizer
+                    log_info("Routed summarization model loaded", {
+                        "model": model_name,
+                        "backend": self.model_backend.name,
+                        "shared_tokenizer": tokenizer is not None,
+                        "seconds": round(time.perf_counter() - start, 2)
+                    })
+        return summarizer
+
+    @property
+    def ocr_engine(self) -> OCREngine:
+        """OCR engine for image uploads, created the first time an image is processed."""
+        if self._ocr_engine is None:
+            self._ocr_engine = OCREngine(
+                settings.ocr_languages,
+                workers=settings.ocr_workers,
+                max_side=settings.ocr_max_image_side,
+                batch_size=settings.ocr_batch_size,
+                batch_wait_ms=settings.ocr_batch_wait_ms,
+                gpu=settings.ocr_gpu
+            )
+        return self._ocr_engine
+
+    @property
+    def tokenizer(self):
+        """Tokenizer matching the summarization model."""
+        if self._tokenizer is None:
+            if self.summarizer is not None:
+                self._tokenizer = self.summarizer.tokenizer
+            else:
+                from transformers import AutoTokenizer
+                self._tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+        return self._tokenizer
+
+    async def _generate(self, texts: List[str], **params) -> List[str]:
+        """Run model generation on the inference pool without blocking the event loop."""
+        if self.inference_pool.kind == "process":
+            summaries = await self.inference_pool.submit(_worker_generate, texts, params)
+            self.status = "ready"
+            return summaries
+        return await self.inference_pool.submit(self._run_local, texts, params)
+
+    def _run_local(self, texts: List[str], params: dict) -> List[str]:
+        """Run generation in the current worker thread, loading the model if needed."""
+        params = dict(params)
+        return _run_pipeline(self._pipeline_for(params.pop("model_name", MODEL_NAME)), texts, params)
+
+    async def _run_batch(self, texts: List[str], params: dict) -> List[str]:
+        """Generate summaries for a batch collected by the micro-batcher."""
+        start = time.perf_counter()
+        summaries = await self._generate(texts, batch_size=len(texts), truncation=True, **params)
+        self.router.record(params.get("model_name", MODEL_NAME), len(texts), time.perf_counter() - start)
+        return summaries
+
+    async def _route(self, text: str, domain: str, format_type: str, params: dict) -> Optional[int]:
+        """
+        Pick the model for a summary. Routed models are requested through
+        params["model_name"], which also keeps them in separate batches.
+        Returns the token count of text if routing had to count it.
+        """
+        if not self.router.enabled:
+            return None
+        tokens = None
+        if self.router.needs_tokens:
+            loop = asyncio.get_running_loop()
+            with stage_timer("tokenization"):
+                # The tokenizer may still have to be loaded
+                tokens = await loop.run_in_executor(None, lambda: count_tokens(text, self.tokenizer))
+        model_name = self.router.route(tokens or 0, domain, format_type)
+        if model_name != MODEL_NAME:
+            params["model_name"] = model_name
+        return tokens
+
+    async def _generation_params(
+        self,
+        text: str,
+        domain: str,
+        format_type: str,
+        options: Optional[GenerationOptions] = None
+    ) -> dict:
+        """
+        Generation settings for a summary of text: the routed model, and
+        lengths and beam search settings from the input size, format and
+        client options. Inputs are only tokenized when routing needs it;
+        otherwise their size is estimated from the word count.
+        """
+        params = {}
+        tokens = await self._route(text, domain, format_type, params)
+        if tokens is None:
+            tokens = estimate_tokens(text) if options is None or options.needs_tokens else 0
+        params.update(generation_params(tokens, format_type, options))
+        return params
+
+    def _cache_key(
+        self,
+        kind: str,
+        content,
+        domain: str,
+        format_type: str,
+        mode: str = "abstractive",
+        options: Optional[GenerationOptions] = None
+    ) -> Optional[str]:
+        """Build the cache key for an input, or None when caching is disabled."""
+        if self.cache is None:
+            return None
+        if mode == "extractive":
+            return SummaryCache.make_key(
+                content, f"{kind}:extractive", domain, format_type, settings.extractive_method,
+                {"sentences": settings.extractive_sentences}
+            )
+        model_tag = self.model_backend.cache_tag(MODEL_NAME)
+        if self.router.enabled:
+            model_tag += f"|routes={self.router.signature}"
+        if settings.chunking_enabled:
+            model_tag += (
+                f"|chunks={settings.chunk_tokens}:{settings.chunk_overlap}:{settings.max_chunks}"
+            )
+        if settings.extractive_preselect_tokens > 0:
+            model_tag += f"|preselect={settings.extractive_method}:{settings.extractive_preselect_tokens}"
+        return SummaryCache.make_key(content, kind, domain, format_type, model_tag, generation_signature(options))
+
+    async def _upload_cache_key(self, kind: str, content, *args) -> Optional[str]:
+        """_cache_key for uploaded bytes or streams, hashed off the event loop."""
+        if self.cache is None:
+            return None
+        if isinstance(content, str):
+            return self._cache_key(kind, content, *args)
+        loop = asyncio.get_running_loop()
+        with stage_timer("cache_key"):
+            return await loop.run_in_executor(None, self._cache_key, kind, content, *args)
+
+    async def _cache_get(self, key: Optional[str]) -> Optional[str]:
+        """Look up a cached summary; disk lookups run off the event loop."""
+        if key is None:
+            return None
+        summary = await self.cache.get_async(key)
+        count_cache_lookup("summary", "miss" if summary is None else "hit")
+        return summary
+
+    def _cache_set(self, key: Optional[str], summary: str) -> None:
+        """Store a generated summary in the cache; the disk write happens in the background."""
+        if key is not None:
+            self.cache.set_deferred(key, summary)
 
     def _clean_text(self, text: str) -> str:
-        """Clean and preprocess text."""
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        # Remove special characters but keep punctuation
-        text = re.sub(r'[^\w\s.,!?-]', '', text)
-        return text.strip()
+        """Clean and preprocess text; text that is already clean is returned as is."""
+        return normalize_text(text)
 
     def _format_summary(self, summary: str, format_type: str) -> str:
         """Format the summary based on the requested format."""
@@ -61,78 +452,517 @@ Main Themes:
         }
         return f"{domain_prefixes.get(domain, '')}{text}"
 
-    async def summarize_text(self, text: str, domain: str, format_type: str) -> str:
-        """Summarize plain text input."""
-        cleaned_text = self._clean_text(text)
+    async def summarize_text(
+        self,
+        text: str,
+        domain: str,
+        format_type: str,
+        mode: str = "abstractive",
+        options: Optional[GenerationOptions] = None
+    ) -> str:
+        """
+        Summarize plain text input. The "extractive" mode returns the most
+        salient sentences without running the model; options override the
+        generation settings derived by the server.
+        """
+        with stage_timer("cleaning"):
+            cleaned_text = self._clean_text(text)
+        cache_key = self._cache_key("text", cleaned_text, domain, format_type, mode, options)
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            return cached
         
         # Generate summary
-        summary = self.summarizer(cleaned_text, max_length=130, min_length=30, do_sample=False)[0]['summary_text']
+        if mode == "extractive":
+            summary = await self._extract_sentences(cleaned_text)
+        else:
+            cleaned_text = await self._preselect(cleaned_text)
+            params = await self._generation_params(cleaned_text, domain, format_type, options)
+            if settings.chunking_enabled:
+                summary = await self._summarize_chunked(cleaned_text, params)
+            else:
+                summary = await self.batcher.submit(cleaned_text, params)
         
         # Adapt to domain and format
-        summary = self._adapt_to_domain(summary, domain)
-        formatted_summary = self._format_summary(summary, format_type)
+        with stage_timer("formatting"):
+            summary = self._adapt_to_domain(summary, domain)
+            formatted_summary = self._format_summary(summary, format_type)
         
+        self._cache_set(cache_key, formatted_summary)
         return formatted_summary
 
-    async def summarize_file(self, file_content: bytes, filename: str, domain: str, format_type: str) -> str:
-        """Extract and summarize text from files (PDF, DOCX)."""
-        text = ""
-        
+    def _token_budget(self) -> int:
+        """
+        Number of input tokens worth extracting for a single summary. With
+        pre-selection enabled that is PRESELECT_OVERSAMPLE times its budget,
+        not everything the chunks could hold.
+        """
+        if settings.chunking_enabled:
+            budget = settings.chunk_tokens * settings.max_chunks
+        else:
+            budget = settings.chunk_tokens
+        if settings.extractive_preselect_tokens > 0:
+            budget = min(budget, settings.extractive_preselect_tokens * PRESELECT_OVERSAMPLE)
+        return budget
+
+    async def _split(self, text: str) -> List[str]:
+        """Tokenize and chunk text off the event loop."""
+        loop = asyncio.get_running_loop()
+        with stage_timer("tokenization"):
+            return await loop.run_in_executor(
+                None, lambda: split_text(text, self.tokenizer, settings.chunk_tokens, settings.chunk_overlap)
+            )
+
+    def _count_sentence_tokens(self, sentences: List[str]) -> List[int]:
+        """Count model tokens in each sentence with one tokenizer call."""
+        return [len(ids) for ids in self.tokenizer(sentences, add_special_tokens=False)["input_ids"]]
+
+    async def _preselect(self, text: str) -> str:
+        """
+        Shrink text longer than EXTRACTIVE_PRESELECT_TOKENS to its most
+        salient sentences, so long documents need fewer chunk generations.
+        Without chunking the budget is the model window, since generation
+        truncates anything longer.
+        """
+        budget = settings.extractive_preselect_tokens
+        if budget <= 0:
+            return text
+        if not settings.chunking_enabled:
+            budget = min(budget, settings.chunk_tokens)
+        # Text shorter than the budget in characters always fits
+        if len(text) <= budget:
+            return text
+
+        def select() -> str:
+            from services.extractive import select_salient
+            return select_salient(text, budget, count=self._count_sentence_tokens, method=settings.extractive_method)
+
+        loop = asyncio.get_running_loop()
+        with stage_timer("extractive"):
+            return await loop.run_in_executor(None, select)
+
+    async def _extract_sentences(self, text: str) -> str:
+        """Extractive summary of text; no model is involved."""
+        def summarize() -> str:
+            from services.extractive import extractive_summary
+            return extractive_summary(text, settings.extractive_sentences, settings.extractive_method)
+
+        loop = asyncio.get_running_loop()
+        with stage_timer("extractive"):
+            return await loop.run_in_executor(None, summarize)
+
+    def _count_tokens(self, text: str) -> int:
+        """Count model tokens in text."""
+        with stage_timer("tokenization"):
+            return count_tokens(text, self.tokenizer)
+
+    async def _summarize_chunked(self, text: str, params: dict) -> str:
+        """
+        Map-reduce summarization for text longer than the model context.
+        Chunks are summarized concurrently (and batched together by the
+        micro-batcher), then the joined chunk summaries are reduced until
+        they fit in a single generation.
+        """
+        return await self.batcher.submit(await self._reduce_chunks(text, params), params)
+
+    async def _reduce_chunks(
+        self,
+        text: str,
+        params: dict,
+        on_partial: Optional[Callable[[int, str], None]] = None
+    ) -> str:
+        """
+        Map and reduce passes of chunked summarization. Returns the text for
+        the final generation, which fits in the model window; on_partial is
+        called with each chunk summary as soon as it is generated.
+        """
+        # Text shorter than the chunk size in characters always fits
+        if len(text) <= settings.chunk_tokens:
+            return text
+
+        start = time.perf_counter()
+        chunks = await self._split(text)
+        chunking_seconds = time.perf_counter() - start
+        if len(chunks) <= 1:
+            return text
+
+        total_chunks = len(chunks)
+        chunks = chunks[:settings.max_chunks]
+
+        async def summarize_chunk(index: int, chunk: str) -> str:
+            partial = await self.batcher.submit(chunk, params)
+            if on_partial is not None:
+                on_partial(index, partial)
+            return partial
+
+        # Map: summarize every chunk
+        start = time.perf_counter()
+        partials = await asyncio.gather(*(summarize_chunk(i, chunk) for i, chunk in enumerate(chunks)))
+        map_seconds = time.perf_counter() - start
+
+        # Reduce: combine chunk summaries until they fit the model window
+        start = time.perf_counter()
+        combined = " ".join(partials)
+        reduce_passes = 1
+        while reduce_passes < MAX_REDUCE_PASSES and self._count_tokens(combined) > settings.chunk_tokens:
+            groups = await self._split(combined)
+            partials = await asyncio.gather(*(self.batcher.submit(group, params) for group in groups))
+            combined = " ".join(partials)
+            reduce_passes += 1
+        reduce_seconds = time.perf_counter() - start
+
+        log_info("Chunked summarization completed", {
+            "chunks": len(chunks),
+            "chunks_total": total_chunks,
+            "reduce_passes": reduce_passes,
+            "chunking_seconds": round(chunking_seconds, 4),
+            "map_seconds": round(map_seconds, 4),
+            "reduce_seconds": round(reduce_seconds, 4)
+        })
+        return combined
+
+    def _generate_streaming(
+        self,
+        text: str,
+        params: dict,
+        emit: Callable[[str], None],
+        cancelled: threading.Event
+    ) -> None:
+        """
+        Generate one summary, passing decoded text to emit as it is produced
+        (runs on an inference worker). Generation stops at the next token
+        once cancelled is set, which frees the worker for other requests.
+        """
+        if cancelled.is_set():
+            return
+        params = dict(params)
+        summarizer = self._pipeline_for(params.pop("model_name", MODEL_NAME))
+        inputs = summarizer.tokenizer(text, return_tensors="pt", truncation=True)
+        inputs = {name: tensor.to(summarizer.device) for name, tensor in inputs.items()}
+        # Streamers do not support beam search, so beam settings do not apply
+        for name in ("num_beams", "length_penalty", "early_stopping"):
+            params.pop(name, None)
+        summarizer.model.generate(
+            **inputs,
+            streamer=_text_streamer(summarizer.tokenizer, emit),
+            stopping_criteria=_cancel_criteria(cancelled),
+            num_beams=1,
+            **params
+        )
+
+    async def _stream_tokens(self, text: str, params: dict) -> AsyncIterator[str]:
+        """
+        Yield the text of a single generation as it is decoded. The worker
+        hands text to the event loop directly, so no thread waits on each
+        stream; when the consumer goes away, generation is cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        deltas: asyncio.Queue = asyncio.Queue()
+        cancelled = threading.Event()
+
+        def emit(delta: str) -> None:
+            # Called on the inference worker; the loop may be gone after a cancel
+            try:
+                loop.call_soon_threadsafe(deltas.put_nowait, delta)
+            except RuntimeError:
+                cancelled.set()
+
+        async def generate():
+            try:
+                await self.inference_pool.submit(self._generate_streaming, text, params, emit, cancelled)
+            finally:
+                # Wake the reader even if generation failed; queued after every delta
+                loop.call_soon(deltas.put_nowait, None)
+
+        job = asyncio.ensure_future(generate())
+        try:
+            while True:
+                delta = await deltas.get()
+                if delta is None:
+                    break
+                yield delta
+            await job
+        finally:
+            cancelled.set()
+            if not job.done():
+                # The job finishes at the next token and keeps its inference slot counted until then
+                job.add_done_callback(lambda done: done.cancelled() or done.exception())
+
+    async def _stream_generation(self, text: str, params: dict) -> AsyncIterator[Tuple[str, object]]:
+        """
+        Yield ("partial", {"index", "text"}) for each chunk summary in chunked
+        mode, then ("token", text) pieces of the final summary.
+        """
+        if settings.chunking_enabled:
+            partials: asyncio.Queue = asyncio.Queue()
+            task = asyncio.ensure_future(self._reduce_chunks(
+                text, params, on_partial=lambda index, partial: partials.put_nowait((index, partial))
+            ))
+            try:
+                while not task.done() or not partials.empty():
+                    get = asyncio.ensure_future(partials.get())
+                    await asyncio.wait({get, task}, return_when=asyncio.FIRST_COMPLETED)
+                    if get.done():
+                        index, partial = get.result()
+                        yield "partial", {"index": index, "text": partial}
+                    else:
+                        get.cancel()
+                text = task.result()
+            finally:
+                if not task.done():
+                    task.cancel()
+
+        if self.inference_pool.kind == "process":
+            # Worker processes cannot hand back a token stream
+            yield "token", await self.batcher.submit(text, params)
+            return
+        async for delta in self._stream_tokens(text, params):
+            yield "token", delta
+
+    async def stream_summary(
+        self,
+        text: str,
+        domain: str,
+        format_type: str,
+        mode: str = "abstractive",
+        options: Optional[GenerationOptions] = None
+    ) -> AsyncIterator[Tuple[str, dict]]:
+        """
+        Summarize text as a stream of (event, data) pairs: "partial" chunk
+        summaries, "delta" pieces of the formatted summary and a final "done"
+        with the complete summary. Nothing is yielded before the model
+        produces its first output, so setup errors surface to the caller.
+        Extractive summaries are sent as a single delta.
+        """
+        if mode == "extractive":
+            summary = await self.summarize_text(text, domain, format_type, mode)
+            yield "delta", {"text": summary}
+            yield "done", {"summary": summary}
+            return
+
+        with stage_timer("cleaning"):
+            cleaned_text = self._clean_text(text)
+        cached = await self._cache_get(self._cache_key("text", cleaned_text, domain, format_type, options=options))
+        if cached is not None:
+            yield "delta", {"text": cached}
+            yield "done", {"summary": cached}
+            return
+
+        formatter = StreamFormatter(format_type, self._format_summary)
+        prefix = self._adapt_to_domain("", domain)
+        generated = ""
+        cleaned_text = await self._preselect(cleaned_text)
+        params = await self._generation_params(cleaned_text, domain, format_type, options)
+        async for kind, value in self._stream_generation(cleaned_text, params):
+            if kind == "partial":
+                yield "partial", value
+                continue
+            if not generated:
+                value = value.lstrip()
+                if not value:
+                    continue
+                out = formatter.feed(prefix) + formatter.feed(value)
+            else:
+                out = formatter.feed(value)
+            generated += value
+            if out:
+                yield "delta", {"text": out}
+
+        if not generated:
+            formatter.feed(prefix)
+        # Streamed summaries use greedy decoding, so they are not cached
+        with stage_timer("formatting"):
+            rest, summary = formatter.finish()
+        if rest:
+            yield "delta", {"text": rest}
+        yield "done", {"summary": summary}
+
+    async def summarize_file(
+        self,
+        file_content: Union[bytes, BinaryIO],
+        filename: str,
+        domain: str,
+        format_type: str,
+        on_stage: Optional[Callable[[str], None]] = None,
+        mode: str = "abstractive",
+        options: Optional[GenerationOptions] = None
+    ) -> str:
+        """
+        Extract and summarize text from files (PDF, DOCX). The file may be
+        passed as bytes or as a seekable stream (an open file or an mmap),
+        which extractors read in place. on_stage is called with
+        "extracting" and "summarizing" as the work progresses.
+        """
+        # A cache hit skips extraction as well as inference
+        cache_key = await self._upload_cache_key("file", file_content, domain, format_type, mode, options)
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        if on_stage is not None:
+            on_stage("extracting")
+        loop = asyncio.get_running_loop()
         if filename.endswith('.pdf'):
-            # Handle PDF files
-            pdf_file = io.BytesIO(file_content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            for page in pdf_reader.pages:
-                text += page.extract_text()
+            # Stream pages off the event loop, stopping at the token budget
+            with stage_timer("extract_pdf"):
+                text = await loop.run_in_executor(
+                    None, extract_pdf_text, file_content, self._token_budget()
+                )
         
         elif filename.endswith('.docx'):
             # Handle DOCX files
-            doc = docx.Document(io.BytesIO(file_content))
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
+            with stage_timer("extract_docx"):
+                text = await loop.run_in_executor(None, extract_docx_text, file_content)
         
         else:
             raise ValueError("Unsupported file format")
 
-        return await self.summarize_text(text, domain, format_type)
+        if on_stage is not None:
+            on_stage("summarizing")
+        summary = await self.summarize_text(text, domain, format_type, mode, options)
+        self._cache_set(cache_key, summary)
+        return summary
+
+    @property
+    def html_extractor(self) -> HTMLExtractor:
+        """HTML-to-text backend selected by HTML_EXTRACTOR, created on first use."""
+        if self._html_extractor is None:
+            self._html_extractor = get_html_extractor(settings.html_extractor)
+        return self._html_extractor
+
+    def _extract_html_text(self, html: str) -> str:
+        """Extract and clean the visible text of an HTML page."""
+        return self._clean_text(self.html_extractor.extract(html))
+
+    async def fetch_url_text(self, url: str) -> str:
+        """
+        Fetch a URL and return its extracted text, reusing the fetch cache.
+        Fresh entries skip the request entirely; stale entries are
+        revalidated and a 304 reuses the previously extracted text.
+        """
+        entry = self.fetch_cache.get(url) if self.fetch_cache is not None else None
+        if entry is not None and entry.is_fresh():
+            self.fetch_cache.record_fresh_hit()
+            count_cache_lookup("fetch", "hit")
+            return entry.text
+
+        headers = entry.conditional_headers() if entry is not None else None
+        response = await http_fetcher.fetch(url, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            self.fetch_cache.revalidated(url, response.headers)
+            count_cache_lookup("fetch", "revalidated")
+            return entry.text
 
-    async def summarize_url(self, url: str, domain: str, format_type: str) -> str:
+        loop = asyncio.get_running_loop()
+        with stage_timer("extract_html"):
+            text = await loop.run_in_executor(None, self._extract_html_text, response.text)
+        if self.fetch_cache is not None:
+            self.fetch_cache.record_miss()
+            count_cache_lookup("fetch", "miss")
+            self.fetch_cache.store(url, response.headers, response.content, text)
+        return text
+
+    async def summarize_url(
+        self,
+        url: str,
+        domain: str,
+        format_type: str,
+        mode: str = "abstractive",
+        options: Optional[GenerationOptions] = None
+    ) -> str:
         """Extract and summarize text from a URL."""
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            
-            # Parse HTML and extract text
-            soup = BeautifulSoup(response.text, 'html.parser')
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Get text content
-            text = soup.get_text()
-            text = self._clean_text(text)
-            
-            return await self.summarize_text(text, domain, format_type)
+            # Summaries are cached by page text, so unchanged pages
+            # still skip inference after a cheap revalidation
+            text = await self.fetch_url_text(url)
+            return await self.summarize_text(text, domain, format_type, mode, options)
         
+        except (InferenceQueueFull, FetchError):
+            raise
         except Exception as e:
             raise Exception(f"Error processing URL: {str(e)}")
 
-    async def summarize_image(self, image_content: bytes, domain: str, format_type: str) -> str:
-        """Extract and summarize text from images using OCR."""
+    async def summarize_many(
+        self,
+        items: List[Tuple[str, ...]],
+        concurrency: int = 16
+    ) -> AsyncIterator[Tuple[int, Optional[str], Optional[Exception]]]:
+        """
+        Summarize many (input_type, content, domain, format_type[, mode[, options]])
+        items of type text or url, yielding (position, summary, error) as each item
+        completes. Up to `concurrency` items are in flight at once, so URLs
+        are fetched concurrently and their generations arrive together at
+        the micro-batcher, which runs them as padded batches.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(
+            position: int,
+            input_type: str,
+            content: str,
+            domain: str,
+            format_type: str,
+            mode: str = "abstractive",
+            options: Optional[GenerationOptions] = None
+        ):
+            async with semaphore:
+                set_request_labels(input_type, domain, format_type)
+                try:
+                    if input_type == "url":
+                        summary = await self.summarize_url(content, domain, format_type, mode, options)
+                    else:
+                        summary = await self.summarize_text(content, domain, format_type, mode, options)
+                    return position, summary, None
+                except Exception as e:
+                    return position, None, e
+
+        tasks = [asyncio.ensure_future(run(position, *item)) for position, item in enumerate(items)]
         try:
-            # Convert bytes to PIL Image
-            image = Image.open(io.BytesIO(image_content))
-            
-            # Use EasyOCR to extract text
-            results = self.reader.readtext(image)
-            text = " ".join([result[1] for result in results])
+            for completed in asyncio.as_completed(tasks):
+                yield await completed
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def summarize_image(
+        self,
+        image_content: bytes,
+        domain: str,
+        format_type: str,
+        on_stage: Optional[Callable[[str], None]] = None,
+        mode: str = "abstractive",
+        options: Optional[GenerationOptions] = None
+    ) -> str:
+        """
+        Extract and summarize text from images using OCR. on_stage is
+        called with "extracting" and "summarizing" as the work progresses.
+        """
+        cache_key = await self._upload_cache_key("image", image_content, domain, format_type, mode, options)
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            if on_stage is not None:
+                on_stage("extracting")
+            # Preprocess and recognize on the OCR worker pool
+            with stage_timer("ocr"):
+                text = await self.ocr_engine.read_text(image_content)
             
             if not text.strip():
                 raise ValueError("No text could be extracted from the image")
             
-            return await self.summarize_text(text, domain, format_type)
+            if on_stage is not None:
+                on_stage("summarizing")
+            summary = await self.summarize_text(text, domain, format_type, mode, options)
+            self._cache_set(cache_key, summary)
+            return summary
         
+        except InferenceQueueFull:
+            raise
         except Exception as e:
             raise Exception(f"Error processing image: {str(e)}")
 
-# Create a singleton instance
+# Create a singleton instance (models load lazily)
 summarizer_service = SummarizerService()
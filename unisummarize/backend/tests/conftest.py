@@ -1,6 +1,8 @@
 import pytest
 import os
 import shutil
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from fastapi.testclient import TestClient
 from main import app
@@ -76,6 +78,55 @@ def sample_url():
     """Sample URL for testing"""
     return "https://example.com/test-article"
 
+class LocalHTTPServer:
+    """Local HTTP server serving canned pages, for offline URL tests and benchmarks"""
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.requests.append({
+                    "path": self.path,
+                    "headers": dict(self.headers),
+                    "client_port": self.client_address[1]
+                })
+                status, headers, body = server.routes.get(self.path, (404, {}, b"Not found"))
+                if callable(body):
+                    status, headers, body = body(self.headers)
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def add_page(self, path, body, status=200, headers=None):
+        """Serve body (bytes, str or a callable taking request headers) at path"""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.routes[path] = (status, {"Content-Type": "text/html; charset=utf-8", **(headers or {})}, body)
+        return self.base_url + path
+
+@pytest.fixture
+def http_server():
+    """Local HTTP server fixture"""
+    server = LocalHTTPServer()
+    server.thread.start()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
+
 class MockSummarizer:
     """Mock summarizer for testing"""
     def __init__(self):
@@ -22,6 +22,13 @@ def test_health_check():
     assert response.status_code == 200
     assert response.json()["status"] == "healthy"
 
+def test_health_reports_model_readiness():
+    """Health check should report model loading state without loading it"""
+    response = client.get("/api/health")
+    data = response.json()
+    assert data["services"]["summarizer"] in ("not_loaded", "loading", "ready", "failed")
+    assert data["ready"] == (data["services"]["summarizer"] == "ready")
+
 def test_summarize_text(api_headers):
     """Test text summarization endpoint"""
     test_data = {
@@ -182,4 +189,12 @@ def test_large_file(api_headers):
         data=test_data,
         headers=api_headers
     )
-    assert response.status_code == 400  # Bad request
+    assert response.status_code == 413  # Rejected before the body is received
+
+def test_metrics_endpoint(api_headers):
+    """Metrics are exposed in the Prometheus text format"""
+    response = client.get("/api/metrics", headers=api_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE unisummarize_stage_seconds histogram" in response.text
+    assert "unisummarize_inference_queue_pending" in response.text
@@ -0,0 +1,72 @@
+import asyncio
+import json
+from fastapi.testclient import TestClient
+from main import app
+from config import settings
+from services.summarizer import summarizer_service
+
+settings.api_key = "test-api-key"
+client = TestClient(app)
+HEADERS = {"X-API-Key": "test-api-key"}
+
+def _items(*contents, input_type="text"):
+    return [
+        {"input_type": input_type, "content": content, "domain": "research", "format": "paragraph"}
+        for content in contents
+    ]
+
+def _patch_generation(monkeypatch, batch_sizes):
+    async def generate(texts, **params):
+        batch_sizes.append(len(texts))
+        if any("fail" in text for text in texts):
+            raise RuntimeError("generation failed")
+        return [text.upper() for text in texts]
+
+    monkeypatch.setattr(summarizer_service, "_generate", generate)
+    monkeypatch.setattr(summarizer_service, "cache", None)
+    monkeypatch.setattr(settings, "chunking_enabled", False)
+
+def test_bulk_items_share_generation_batches(monkeypatch):
+    """Concurrent items reach the model as batches, not one call per item"""
+    batch_sizes = []
+    _patch_generation(monkeypatch, batch_sizes)
+
+    async def collect():
+        items = [("text", f"text {i}", "research", "paragraph") for i in range(8)]
+        return [result async for result in summarizer_service.summarize_many(items, concurrency=8)]
+
+    results = asyncio.run(collect())
+    assert sorted(position for position, _, _ in results) == list(range(8))
+    assert all(error is None for _, _, error in results)
+    assert max(batch_sizes) > 1
+
+def test_bulk_endpoint_orders_results_with_item_errors(monkeypatch):
+    """Results keep item order and failures are reported per item"""
+    _patch_generation(monkeypatch, [])
+    items = _items("first text") + _items("not a url", input_type="url") + _items("second text")
+
+    response = client.post("/api/summarize/batch", json={"items": items}, headers=HEADERS)
+    assert response.status_code == 200
+    results = response.json()["results"]
+
+    assert [result["index"] for result in results] == [0, 1, 2]
+    assert results[0]["summary"] == "The research demonstrates that FIRST TEXT"
+    assert results[1]["error"]["status_code"] == 400
+    assert results[2]["summary"] == "The research demonstrates that SECOND TEXT"
+
+def test_bulk_endpoint_streams_ndjson(monkeypatch):
+    """With stream=true every item is sent as its own JSON line"""
+    _patch_generation(monkeypatch, [])
+    items = _items("one", "two")
+
+    response = client.post("/api/summarize/batch?stream=true", json={"items": items}, headers=HEADERS)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["index"] for line in lines) == [0, 1]
+
+def test_bulk_endpoint_rejects_too_many_items(monkeypatch):
+    """Requests above BULK_MAX_ITEMS are rejected"""
+    monkeypatch.setattr(settings, "bulk_max_items", 2)
+    response = client.post("/api/summarize/batch", json={"items": _items("a", "b", "c")}, headers=HEADERS)
+    assert response.status_code == 400
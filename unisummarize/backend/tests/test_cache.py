@@ -0,0 +1,90 @@
+import asyncio
+import time
+from services.cache import SummaryCache
+
+def test_cache_key_depends_on_every_part():
+    """Keys should change with content and with generation settings"""
+    key = SummaryCache.make_key("text", "academic", "bullet")
+    assert key == SummaryCache.make_key("text", "academic", "bullet")
+    assert key != SummaryCache.make_key("text", "legal", "bullet")
+    assert key != SummaryCache.make_key(b"other", "academic", "bullet")
+
+def test_cache_lru_eviction():
+    """The least recently used entry should be evicted first"""
+    cache = SummaryCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+def test_cache_ttl_expiry():
+    """Expired entries should be reported as misses"""
+    cache = SummaryCache(ttl=0.01)
+    cache.set("a", "1")
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+def test_cache_disk_tier_survives_restart(tmp_path):
+    """Entries written to disk should be visible to a new cache instance"""
+    path = tmp_path / "summaries.sqlite3"
+    SummaryCache(disk_path=path).set("a", "1")
+
+    cache = SummaryCache(disk_path=path)
+    assert cache.get("a") == "1"
+    assert cache.stats()["disk_hits"] == 1
+
+def test_cache_disk_writes_are_deferred_and_batched(tmp_path):
+    """Deferred writes are served before they reach disk and committed together"""
+    path = tmp_path / "summaries.sqlite3"
+    cache = SummaryCache(max_entries=1, disk_path=path)
+    cache.set_deferred("a", "1")
+    cache.set_deferred("b", "2")
+    # "a" was evicted from memory; the lookup still sees the queued or written value
+    assert asyncio.run(cache.get_async("a")) == "1"
+    cache.flush()
+    assert cache.stats()["disk_pending_writes"] == 0
+    assert SummaryCache(disk_path=path).get("b") == "2"
+
+def test_cache_disk_tier_is_capped(tmp_path):
+    """Pruning keeps the newest max_disk_entries rows"""
+    path = tmp_path / "summaries.sqlite3"
+    cache = SummaryCache(max_entries=1, disk_path=path, max_disk_entries=2, prune_interval=0)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+        time.sleep(0.001)
+    reopened = SummaryCache(disk_path=path)
+    assert [reopened.get(key) for key in ("a", "b", "c")] == [None, "b", "c"]
+    assert cache.stats()["disk_pruned"] >= 1
+
+def test_upload_cache_keys_are_hashed_off_the_event_loop(monkeypatch):
+    """File and image content is hashed on an executor thread; text is hashed inline"""
+    import threading
+    from services.summarizer import summarizer_service
+
+    threads = []
+    make_key = SummaryCache.make_key
+
+    def recording_make_key(content, *parts):
+        threads.append(threading.current_thread())
+        return make_key(content, *parts)
+
+    monkeypatch.setattr(summarizer_service, "cache", SummaryCache())
+    monkeypatch.setattr(SummaryCache, "make_key", staticmethod(recording_make_key))
+
+    async def keys():
+        upload = await summarizer_service._upload_cache_key("file", b"%PDF-1.4", "legal", "paragraph")
+        text = await summarizer_service._upload_cache_key("text", "Some text", "legal", "paragraph")
+        return upload, text
+
+    upload, text = asyncio.run(keys())
+    assert upload == summarizer_service._cache_key("file", b"%PDF-1.4", "legal", "paragraph")
+    assert text == summarizer_service._cache_key("text", "Some text", "legal", "paragraph")
+    assert threads[0] is not threading.main_thread() and threads[1] is threading.main_thread()
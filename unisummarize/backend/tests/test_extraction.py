@@ -0,0 +1,164 @@
+import mmap
+import pytest
+from config import settings
+from services.cache import SummaryCache
+from services.extraction import extract_pdf_text
+from services.html_extractors import get_html_extractor
+
+def _make_pdf(page_texts):
+    """Build a minimal multi-page PDF with one line of text per page"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in page_texts:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objects))
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF" % (len(objects) + 1, xref)
+    return pdf
+
+def test_extract_pdf_text_joins_pages():
+    """Every page should be extracted in order"""
+    text = extract_pdf_text(_make_pdf(["First page", "Second page", "Third page"]))
+    assert [line.strip() for line in text.splitlines()] == ["First page", "Second page", "Third page"]
+
+def test_extract_pdf_text_stops_at_token_budget():
+    """Extraction should stop once the token budget is covered"""
+    pdf = _make_pdf([f"Page number {i} with some words" for i in range(20)])
+    text = extract_pdf_text(pdf, max_tokens=10)
+    assert 0 < len(text.splitlines()) < 20
+
+def test_extract_pdf_text_parallel(monkeypatch):
+    """Page-parallel extraction should preserve page order"""
+    monkeypatch.setattr(settings, "extraction_workers", 2)
+    monkeypatch.setattr(settings, "pdf_parallel_min_pages", 4)
+    monkeypatch.setattr(settings, "pdf_pages_per_task", 3)
+    pages = [f"Page {i}" for i in range(10)]
+    text = extract_pdf_text(_make_pdf(pages))
+    assert [line.strip() for line in text.splitlines()] == pages
+
+def test_extract_pdf_text_from_spooled_upload():
+    """Uploads spooled to disk are memory-mapped and read in place"""
+    from tempfile import SpooledTemporaryFile
+    from starlette.datastructures import UploadFile
+    from utils.file_handler import FileHandler
+
+    pdf = _make_pdf(["Mapped page"])
+    spooled = SpooledTemporaryFile(max_size=16)
+    spooled.write(pdf)
+    upload = UploadFile(spooled, size=len(pdf), filename="doc.pdf")
+
+    assert FileHandler.get_upload_size(upload) == len(pdf)
+    with FileHandler.open_upload(upload) as stream:
+        assert isinstance(stream, mmap.mmap)
+        assert extract_pdf_text(stream).strip() == "Mapped page"
+        key = SummaryCache.make_key(stream, "file")
+    assert key == SummaryCache.make_key(pdf, "file")
+
+def test_extract_pdf_text_from_in_memory_upload():
+    """Small uploads are read from the spool buffer without rolling to disk"""
+    from tempfile import SpooledTemporaryFile
+    from starlette.datastructures import UploadFile
+    from utils.file_handler import FileHandler
+
+    pdf = _make_pdf(["Buffered page"])
+    spooled = SpooledTemporaryFile(max_size=1024 * 1024)
+    spooled.write(pdf)
+    upload = UploadFile(spooled, filename="doc.pdf")
+
+    assert FileHandler.get_upload_size(upload) == len(pdf)
+    with FileHandler.open_upload(upload) as stream:
+        assert extract_pdf_text(stream).strip() == "Buffered page"
+        assert SummaryCache.make_key(stream, "file") == SummaryCache.make_key(pdf, "file")
+    assert not spooled._rolled
+
+SAMPLE_HTML = """
+<html><head><title>Title</title><script>var tracking = "ignore me";</script>
+<style>p { color: red; }</style></head>
+<body>
+<nav><a href="/">Home</a> <a href="/news">News</a></nav>
+<article>
+<h1>Headline</h1>
+<p>The committee approved the new budget on Tuesday after a long debate.</p>
+<p>Funding for schools will rise by ten percent next year, officials said.</p>
+<ul><li><a href="/a">Related story one</a></li><li><a href="/b">Related story two</a></li></ul>
+</article>
+<footer>Copyright 2024 Example News</footer>
+</body></html>
+"""
+
+@pytest.mark.parametrize("name", ["streaming", "lxml"])
+def test_html_extractors_skip_boilerplate(name):
+    """Fast backends should keep article text and drop scripts, navigation and link lists"""
+    extractor = get_html_extractor(name)
+    text = extractor.extract(SAMPLE_HTML)
+    assert text.splitlines() == [
+        "The committee approved the new budget on Tuesday after a long debate.",
+        "Funding for schools will rise by ten percent next year, officials said.",
+    ]
+
+FORM_WRAPPED_HTML = """
+<html><body><form method="post" action="./article.aspx">
+<header><a href="/">Example News</a> <a href="/login">Sign in</a></header>
+<input type="hidden" name="__VIEWSTATE" value="abc" />
+<div id="content"><article>
+<header><h1>Council backs new budget</h1><p>The vote ends a month of debate over school funding.</p></header>
+<p>The committee approved the new budget on Tuesday after a long debate.</p>
+</article></div>
+<aside><p>Subscribe to our newsletter for daily updates on local news.</p></aside>
+<button type="submit">Search the site</button>
+</form></body></html>
+"""
+
+@pytest.mark.parametrize("name", ["streaming", "lxml"])
+def test_html_extractors_keep_content_wrapped_in_form(name):
+    """Pages wrapped in a form keep their article, including the header inside it"""
+    text = get_html_extractor(name).extract(FORM_WRAPPED_HTML)
+    assert text.splitlines() == [
+        "Council backs new budget",
+        "The vote ends a month of debate over school funding.",
+        "The committee approved the new budget on Tuesday after a long debate.",
+    ]
+
+def test_get_html_extractor_falls_back_to_streaming():
+    """Unknown backends should fall back to the streaming extractor"""
+    assert get_html_extractor("unknown").name == "streaming"
+
+def test_extract_pdf_text_parallel_submits_lazily(monkeypatch):
+    """Parallel extraction keeps one range per worker in flight and stops submitting at the budget"""
+    import services.extraction as extraction
+    from concurrent.futures import Future
+
+    submitted = []
+
+    class InlineExecutor:
+        def submit(self, fn, content, start, stop):
+            submitted.append(start)
+            future = Future()
+            future.set_result(fn(content, start, stop))
+            return future
+
+    monkeypatch.setattr(extraction, "_get_pdf_executor", lambda: InlineExecutor())
+    monkeypatch.setattr(settings, "extraction_workers", 2)
+    monkeypatch.setattr(settings, "pdf_parallel_min_pages", 4)
+    monkeypatch.setattr(settings, "pdf_pages_per_task", 2)
+    pdf = _make_pdf([f"Page number {i} with some words" for i in range(20)])
+
+    text = extract_pdf_text(pdf, max_tokens=10)
+    assert 0 < len(text.splitlines()) < 20
+    # One range per worker in flight; the first meets the budget, so no more are queued
+    assert submitted == [0, 2]
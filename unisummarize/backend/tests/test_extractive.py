@@ -0,0 +1,122 @@
+import asyncio
+import time
+from config import settings
+from services.extractive import (
+    extractive_summary,
+    score_sentences,
+    select_salient,
+    split_sentences
+)
+from services.summarizer import summarizer_service
+
+ON_TOPIC = [
+    "The vaccine trial enrolled four thousand patients across twelve hospitals.",
+    "Patients in the vaccine trial reported fewer hospital admissions.",
+    "Hospital admissions fell by half among vaccinated trial patients.",
+]
+OFF_TOPIC = [
+    "The cafeteria menu changed on Tuesday.",
+    "Parking near the campus remains difficult.",
+]
+TEXT = " ".join([ON_TOPIC[0], OFF_TOPIC[0], ON_TOPIC[1], OFF_TOPIC[1], ON_TOPIC[2]])
+
+def test_split_sentences():
+    """Cleaned text is split after sentence punctuation"""
+    assert split_sentences("One. Two! Three? Four") == ["One.", "Two!", "Three?", "Four"]
+    assert split_sentences("") == []
+
+def test_central_sentences_score_highest():
+    """Both scoring methods rank on-topic sentences above off-topic ones"""
+    sentences = split_sentences(TEXT)
+    for method in ("textrank", "tfidf"):
+        scores = score_sentences(sentences, method)
+        on_topic = [scores[sentences.index(sentence)] for sentence in ON_TOPIC]
+        off_topic = [scores[sentences.index(sentence)] for sentence in OFF_TOPIC]
+        assert min(on_topic) > max(off_topic), method
+
+def test_select_salient_respects_budget_and_order():
+    """Selected sentences fit the budget and keep their document order"""
+    selected = select_salient(TEXT, budget=22)
+    assert sum(len(sentence.split()) for sentence in split_sentences(selected)) <= 22
+    assert all(sentence in ON_TOPIC for sentence in split_sentences(selected))
+    positions = [TEXT.index(sentence) for sentence in split_sentences(selected)]
+    assert positions == sorted(positions)
+
+    assert select_salient(TEXT, budget=1000) == TEXT
+
+def test_extractive_summary_is_fast_on_long_text():
+    """Large inputs fall back to TF-IDF scoring and stay fast"""
+    long_text = " ".join(f"Sentence {i} covers the vaccine trial topic {i % 50}." for i in range(3000))
+    start = time.perf_counter()
+    summary = extractive_summary(long_text, max_sentences=5)
+    assert time.perf_counter() - start < 2
+    assert len(split_sentences(summary)) == 5
+
+def test_extractive_mode_skips_the_model(monkeypatch):
+    """mode=extractive returns formatted salient sentences without generation"""
+    async def generate(texts, **params):
+        raise AssertionError("the model must not run in extractive mode")
+
+    monkeypatch.setattr(summarizer_service, "_generate", generate)
+    monkeypatch.setattr(summarizer_service, "cache", None)
+    monkeypatch.setattr(settings, "extractive_sentences", 3)
+
+    summary = asyncio.run(summarizer_service.summarize_text(TEXT, "research", "bullet", "extractive"))
+    bullets = summary.split("\n")
+    assert len(bullets) == 3
+    assert "cafeteria" not in summary
+
+def test_long_text_is_preselected_before_generation(monkeypatch):
+    """Text over the preselection budget reaches the model as its salient subset"""
+    seen = []
+
+    async def generate(texts, **params):
+        seen.extend(texts)
+        return ["summary"] * len(texts)
+
+    monkeypatch.setattr(summarizer_service, "_generate", generate)
+    monkeypatch.setattr(summarizer_service, "cache", None)
+    monkeypatch.setattr(summarizer_service, "_count_sentence_tokens", lambda sentences: [len(s.split()) for s in sentences])
+    monkeypatch.setattr(settings, "chunking_enabled", False)
+    monkeypatch.setattr(settings, "extractive_preselect_tokens", 22)
+
+    asyncio.run(summarizer_service.summarize_text(TEXT, "research", "paragraph"))
+    assert len(seen) == 1
+    assert "cafeteria" not in seen[0] and "Parking" not in seen[0]
+
+def test_extraction_budget_follows_preselection(monkeypatch):
+    """With pre-selection on, extraction stops at its oversampled budget"""
+    from services.summarizer import PRESELECT_OVERSAMPLE
+
+    monkeypatch.setattr(settings, "chunking_enabled", True)
+    monkeypatch.setattr(settings, "chunk_tokens", 900)
+    monkeypatch.setattr(settings, "max_chunks", 64)
+    monkeypatch.setattr(settings, "extractive_preselect_tokens", 3600)
+    assert summarizer_service._token_budget() == 3600 * PRESELECT_OVERSAMPLE
+
+    monkeypatch.setattr(settings, "extractive_preselect_tokens", 0)
+    assert summarizer_service._token_budget() == 900 * 64
+
+def test_many_sentences_fall_back_to_centroid_scoring(monkeypatch):
+    """Inputs over TEXTRANK_MAX_SENTENCES never build the sentence x sentence matrix"""
+    import services.extractive as extractive
+
+    def textrank(*args):
+        raise AssertionError("TextRank must not run above the sentence cap")
+
+    monkeypatch.setattr(extractive, "_textrank_scores", textrank)
+    sentences = ["Short repeated sentence."] * (extractive.TEXTRANK_MAX_SENTENCES + 1)
+    assert len(score_sentences(sentences, "textrank")) == len(sentences)
+
+def test_importing_the_app_does_not_import_numpy():
+    """numpy is loaded with services.extractive on the first extractive call"""
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    check = "import sys, main; print('numpy' in sys.modules, 'services.extractive' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", check], cwd=Path(__file__).resolve().parent.parent,
+        capture_output=True, text=True, check=True
+    )
+    assert result.stdout.split() == ["False", "False"]
@@ -0,0 +1,72 @@
+import asyncio
+from config import settings
+from main import SummarizeRequest
+from services.generation import GenerationOptions, generation_params
+from services.summarizer import summarizer_service
+
+def test_lengths_follow_input_size_and_format():
+    """Short inputs get short summaries; long ones hit the configured lengths"""
+    tiny = generation_params(20, "paragraph")
+    assert tiny["max_length"] == 16 and tiny["min_length"] == 8
+
+    assert generation_params(200, "bullet")["max_length"] < generation_params(200, "detailed")["max_length"]
+
+    long = generation_params(5000, "paragraph")
+    assert (long["max_length"], long["min_length"]) == (settings.max_summary_length, settings.min_summary_length)
+    assert long["num_beams"] == settings.generation_num_beams
+    assert long["no_repeat_ngram_size"] == settings.generation_no_repeat_ngram_size
+
+def test_similar_inputs_share_generation_params():
+    """Derived lengths are bucketed, so similar requests batch together"""
+    assert generation_params(50, "paragraph") == generation_params(58, "paragraph")
+
+def test_client_options_are_capped(monkeypatch):
+    """Requested values replace the derived ones but never exceed the ceilings"""
+    monkeypatch.setattr(settings, "generation_max_beams", 6)
+    options = GenerationOptions(
+        max_length=10_000, min_length=20_000, num_beams=64, length_penalty=1.0,
+        early_stopping=False, no_repeat_ngram_size=50
+    )
+    params = generation_params(20, "paragraph", options)
+    assert params["max_length"] == settings.max_summary_length
+    assert params["min_length"] == settings.max_summary_length
+    assert params["num_beams"] == 6
+    assert params["no_repeat_ngram_size"] == settings.generation_max_no_repeat_ngram_size
+    assert params["length_penalty"] == 1.0 and params["early_stopping"] is False
+
+def test_request_generation_options():
+    """Only fields the client sets become generation options"""
+    request = SummarizeRequest(input_type="text", content="Text", domain="legal", format="bullet")
+    assert request.generation_options() is None
+
+    request = SummarizeRequest(input_type="text", content="Text", domain="legal", format="bullet", num_beams=2)
+    assert request.generation_options().describe() == {"num_beams": 2}
+
+def test_summaries_use_request_generation_params(monkeypatch):
+    """Generation receives the derived lengths and the client's overrides"""
+    calls = []
+
+    async def generate(texts, **params):
+        calls.append(params)
+        return ["summary"] * len(texts)
+
+    monkeypatch.setattr(summarizer_service, "_generate", generate)
+    monkeypatch.setattr(summarizer_service, "cache", None)
+    monkeypatch.setattr(settings, "chunking_enabled", False)
+
+    async def run():
+        await summarizer_service.summarize_text("A short note about the merger.", "corporate", "paragraph")
+        await summarizer_service.summarize_text(
+            "A short note about the merger.", "corporate", "paragraph", options=GenerationOptions(num_beams=1)
+        )
+
+    asyncio.run(run())
+    assert [(call["max_length"], call["num_beams"]) for call in calls] == [
+        (16, settings.generation_num_beams), (16, 1)
+    ]
+
+def test_cache_key_depends_on_options():
+    """Summaries generated with different client options are cached apart"""
+    default = summarizer_service._cache_key("text", "Some text", "legal", "paragraph")
+    greedy = summarizer_service._cache_key("text", "Some text", "legal", "paragraph", options=GenerationOptions(num_beams=1))
+    assert default != greedy
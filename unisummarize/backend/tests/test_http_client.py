@@ -0,0 +1,154 @@
+import asyncio
+import time
+import pytest
+from utils.fetch_cache import FetchCache
+from utils.http_client import FetchError, HttpFetcher
+
+def _run(fetcher, coro):
+    async def scenario():
+        try:
+            return await coro
+        finally:
+            await fetcher.close()
+    return asyncio.run(scenario())
+
+def test_fetch_returns_body(http_server):
+    """Fetching a page should return its decoded body"""
+    url = http_server.add_page("/article", "<html><body>Café news</body></html>")
+    fetcher = HttpFetcher()
+    result = _run(fetcher, fetcher.fetch(url))
+    assert result.status_code == 200
+    assert "Café news" in result.text
+    assert len(http_server.requests) == 1
+
+def test_fetch_rejects_error_status(http_server):
+    """HTTP errors should raise FetchError"""
+    fetcher = HttpFetcher()
+    with pytest.raises(FetchError):
+        _run(fetcher, fetcher.fetch(http_server.base_url + "/missing"))
+
+def test_fetch_enforces_size_cap(http_server):
+    """Responses larger than the cap should be rejected"""
+    url = http_server.add_page("/large", "x" * 5000)
+    fetcher = HttpFetcher(max_response_bytes=1000)
+    with pytest.raises(FetchError):
+        _run(fetcher, fetcher.fetch(url))
+
+def test_fetch_reuses_connections(http_server):
+    """Repeated fetches should share keep-alive connections"""
+    url = http_server.add_page("/page", "<p>hello</p>")
+    fetcher = HttpFetcher(max_connections_per_host=4)
+
+    async def fetch_many():
+        return await asyncio.gather(*(fetcher.fetch(url) for _ in range(20)))
+
+    start = time.perf_counter()
+    results = _run(fetcher, fetch_many())
+    elapsed = time.perf_counter() - start
+    assert all(result.status_code == 200 for result in results)
+    assert elapsed < 5
+    assert len({request["client_port"] for request in http_server.requests}) <= 4
+
+def test_fetch_drops_idle_host_limits(http_server):
+    """Per-host semaphores exist only while the host has requests in flight"""
+    url = http_server.add_page("/page", "<p>hello</p>")
+    fetcher = HttpFetcher(max_connections_per_host=2)
+    seen = []
+
+    async def fetch_many():
+        fetches = asyncio.gather(*(fetcher.fetch(url) for _ in range(5)))
+        await asyncio.sleep(0)
+        seen.append(len(fetcher._host_limits))
+        await fetches
+        with pytest.raises(FetchError):
+            await fetcher.fetch(http_server.base_url + "/missing")
+
+    _run(fetcher, fetch_many())
+    assert seen == [1]
+    assert fetcher._host_limits == {}
+
+def test_fetch_cache_revalidates_with_etag(http_server):
+    """A stale entry should be revalidated and a 304 should reuse the cached text"""
+    def page(headers):
+        if headers.get("If-None-Match") == '"v1"':
+            return 304, {"ETag": '"v1"'}, b""
+        return 200, {"ETag": '"v1"', "Content-Type": "text/html"}, b"<p>Original article text</p>"
+
+    http_server.routes["/etag"] = (200, {}, page)
+    url = http_server.base_url + "/etag"
+    fetcher = HttpFetcher()
+    cache = FetchCache()
+
+    async def fetch_twice():
+        first = await fetcher.fetch(url)
+        cache.store(url, first.headers, first.content, "Original article text")
+        entry = cache.get(url)
+        assert not entry.is_fresh()
+        second = await fetcher.fetch(url, headers=entry.conditional_headers())
+        return second
+
+    second = _run(fetcher, fetch_twice())
+    assert second.status_code == 304
+    assert http_server.requests[1]["headers"]["If-None-Match"] == '"v1"'
+    cache.revalidated(url, second.headers)
+    assert cache.get(url).text == "Original article text"
+    assert cache.stats()["revalidations"] == 1
+
+def test_summarize_url_reuses_extracted_text_after_304(monkeypatch):
+    """A revalidated URL skips extraction and generation and hits the summary cache"""
+    import httpx
+    import services.summarizer as summarizer
+    from config import settings
+    from services.cache import SummaryCache
+
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        headers = {"ETag": '"v1"', "Last-Modified": "Tue, 01 Oct 2024 10:00:00 GMT", "Cache-Control": "no-cache"}
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(
+            200, headers={**headers, "Content-Type": "text/html"},
+            content=b"<html><body><p>The council approved the new budget on Tuesday.</p></body></html>"
+        )
+
+    fetcher = HttpFetcher()
+    fetcher._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    service = summarizer.summarizer_service
+    extracted, generated = [], []
+    extract = service._extract_html_text
+
+    async def generate(texts, **params):
+        generated.extend(texts)
+        return ["Budget approved"] * len(texts)
+
+    monkeypatch.setattr(summarizer, "http_fetcher", fetcher)
+    monkeypatch.setattr(service, "fetch_cache", FetchCache())
+    monkeypatch.setattr(service, "cache", SummaryCache())
+    monkeypatch.setattr(service, "_generate", generate)
+    monkeypatch.setattr(service, "_extract_html_text", lambda html: extracted.append(html) or extract(html))
+    monkeypatch.setattr(settings, "chunking_enabled", False)
+
+    async def summarize_twice():
+        return [await service.summarize_url("http://news.test/budget", "legal", "paragraph") for _ in range(2)]
+
+    first, second = _run(fetcher, summarize_twice())
+    assert first == second
+    assert requests[1].headers["If-None-Match"] == '"v1"'
+    assert requests[1].headers["If-Modified-Since"] == "Tue, 01 Oct 2024 10:00:00 GMT"
+    assert len(extracted) == 1 and len(generated) == 1
+    assert service.fetch_cache.stats()["revalidations"] == 1
+    assert service.cache.stats()["hits"] == 1
+
+def test_fetch_cache_honors_cache_control():
+    """max-age should make entries fresh and no-store should skip caching"""
+    cache = FetchCache()
+    cache.store("http://a", {"Cache-Control": "public, max-age=60"}, b"body", "text")
+    assert cache.get("http://a").is_fresh()
+
+    cache.store("http://b", {"Cache-Control": "no-store", "ETag": '"x"'}, b"body", "text")
+    assert cache.get("http://b") is None
+
+    cache.store("http://c", {"Cache-Control": "no-cache", "ETag": '"x"'}, b"body", "text")
+    assert not cache.get("http://c").is_fresh()
@@ -0,0 +1,213 @@
+import asyncio
+import threading
+import time
+import pytest
+from services.batcher import MicroBatcher
+from services.chunker import chunk_token_ids
+from services.inference_pool import InferencePool, InferenceQueueFull
+
+def _slow_job(delay, value):
+    time.sleep(delay)
+    return value
+
+def test_inference_pool_runs_off_event_loop():
+    """Blocking jobs should not stall other coroutines"""
+    pool = InferencePool("thread", max_workers=1, max_queue_size=4)
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        result, _ = await asyncio.gather(pool.submit(_slow_job, 0.2, "done"), ticker())
+        return result, ticks
+
+    result, ticks = asyncio.run(scenario())
+    pool.shutdown()
+    assert result == "done"
+    assert ticks == 5
+
+def test_inference_pool_rejects_when_full():
+    """Submissions beyond the queue depth should fail fast"""
+    pool = InferencePool("thread", max_workers=1, max_queue_size=2)
+    release = threading.Event()
+
+    async def scenario():
+        first = asyncio.ensure_future(pool.submit(release.wait))
+        second = asyncio.ensure_future(pool.submit(release.wait))
+        await asyncio.sleep(0.05)
+        assert pool.pending == 2
+        with pytest.raises(InferenceQueueFull):
+            await pool.submit(release.wait)
+        release.set()
+        await asyncio.gather(first, second)
+
+    asyncio.run(scenario())
+    pool.shutdown()
+    assert pool.pending == 0
+
+def test_micro_batcher_groups_concurrent_requests():
+    """Concurrent requests with equal parameters should share one batch"""
+    batches = []
+
+    async def run_batch(texts, params):
+        batches.append((list(texts), dict(params)))
+        return [f"summary of {text}" for text in texts]
+
+    batcher = MicroBatcher(run_batch, max_batch_size=8, max_wait_ms=10)
+    short = {"max_length": 60, "min_length": 10}
+    long = {"max_length": 130, "min_length": 30}
+
+    async def scenario():
+        return await asyncio.gather(
+            batcher.submit("a", short),
+            batcher.submit("b", long),
+            batcher.submit("c", short),
+        )
+
+    results = asyncio.run(scenario())
+    assert results == ["summary of a", "summary of b", "summary of c"]
+    assert sorted(batches, key=lambda b: len(b[0])) == [(["b"], long), (["a", "c"], short)]
+
+def test_micro_batcher_flushes_at_max_size():
+    """A full batch should dispatch without waiting for the window"""
+    batches = []
+
+    async def run_batch(texts, params):
+        batches.append(list(texts))
+        return list(texts)
+
+    batcher = MicroBatcher(run_batch, max_batch_size=2, max_wait_ms=10_000)
+
+    async def scenario():
+        return await asyncio.wait_for(
+            asyncio.gather(batcher.submit("a", {}), batcher.submit("b", {})),
+            timeout=1
+        )
+
+    assert asyncio.run(scenario()) == ["a", "b"]
+    assert batches == [["a", "b"]]
+
+def test_micro_batcher_propagates_errors():
+    """A failing batch should fail every caller in it"""
+    async def run_batch(texts, params):
+        raise RuntimeError("model failure")
+
+    batcher = MicroBatcher(run_batch, max_batch_size=4, max_wait_ms=5)
+
+    async def scenario():
+        return await asyncio.gather(
+            batcher.submit("a", {}), batcher.submit("b", {}), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+def test_chunk_token_ids_overlap():
+    """Chunks should respect the size limit and share overlapping tokens"""
+    chunks = chunk_token_ids(list(range(10)), chunk_size=4, overlap=1)
+    assert chunks == [[0, 1, 2, 3], [3, 4, 5, 6], [6, 7, 8, 9]]
+    assert chunk_token_ids(list(range(3)), chunk_size=4, overlap=1) == [[0, 1, 2]]
+
+class WordTokenizer:
+    """Tokenizer stand-in with one token per word"""
+    def __init__(self):
+        self.words = []
+
+    def __call__(self, text, add_special_tokens=False):
+        ids = []
+        for word in text.split():
+            self.words.append(word)
+            ids.append(len(self.words) - 1)
+        return {"input_ids": ids}
+
+    def decode(self, ids, skip_special_tokens=True):
+        return " ".join(self.words[i] for i in ids)
+
+class RecordingBatcher:
+    """Batcher stand-in summarizing every input to four words"""
+    def __init__(self):
+        self.inputs = []
+
+    async def submit(self, item, params):
+        self.inputs.append(item)
+        return f"summary {len(self.inputs)} of {len(item.split())}"
+
+def test_chunked_summarization_maps_and_reduces(monkeypatch):
+    """Chunks are capped at MAX_CHUNKS, reported as partials and reduced until they fit"""
+    from config import settings
+    from services.summarizer import summarizer_service
+
+    batcher = RecordingBatcher()
+    monkeypatch.setattr(summarizer_service, "_tokenizer", WordTokenizer())
+    monkeypatch.setattr(summarizer_service, "batcher", batcher)
+    monkeypatch.setattr(settings, "chunk_tokens", 10)
+    monkeypatch.setattr(settings, "chunk_overlap", 0)
+    monkeypatch.setattr(settings, "max_chunks", 4)
+    text = " ".join(f"word{i}" for i in range(50))
+    partials = []
+
+    async def scenario():
+        combined = await summarizer_service._reduce_chunks(
+            text, {}, on_partial=lambda index, partial: partials.append(index)
+        )
+        return combined, await summarizer_service._summarize_chunked(text, {})
+
+    combined, summary = asyncio.run(scenario())
+    # Map: 5 chunks of 10 words, capped at 4
+    assert [len(item.split()) for item in batcher.inputs[:4]] == [10, 10, 10, 10]
+    assert sorted(partials) == [0, 1, 2, 3]
+    # Reduce: 16 words of partials exceed the window and are summarized again in two groups
+    assert [len(item.split()) for item in batcher.inputs[4:6]] == [10, 6]
+    assert len(combined.split()) == 8
+    # _summarize_chunked runs the same passes plus the final generation
+    assert len(batcher.inputs) == 6 + 7
+    assert summary == "summary 13 of 8"
+
+def test_chunk_settings_are_part_of_the_cache_key(monkeypatch):
+    """Summaries made under other chunking settings are not served from the cache"""
+    from config import settings
+    from services.summarizer import summarizer_service
+
+    key = summarizer_service._cache_key("text", "Some text", "legal", "paragraph")
+    monkeypatch.setattr(settings, "chunk_tokens", settings.chunk_tokens // 2)
+    assert summarizer_service._cache_key("text", "Some text", "legal", "paragraph") != key
+
+def test_micro_batcher_fails_callers_on_missing_results():
+    """A runner returning too few results fails every caller instead of leaving some waiting"""
+    async def run_batch(items, params):
+        return ["only one"]
+
+    batcher = MicroBatcher(run_batch, max_batch_size=2, max_wait_ms=5)
+
+    async def scenario():
+        return await asyncio.wait_for(
+            asyncio.gather(batcher.submit("a", {}), batcher.submit("b", {}), return_exceptions=True), 2
+        )
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+def test_micro_batcher_keeps_dispatch_tasks_alive():
+    """Running dispatch tasks are referenced by the batcher and released once done"""
+    import gc
+
+    async def run_batch(items, params):
+        await asyncio.sleep(0.05)
+        return items
+
+    batcher = MicroBatcher(run_batch, max_batch_size=2, max_wait_ms=5)
+
+    async def scenario():
+        pending = asyncio.gather(batcher.submit("a", {}), batcher.submit("b", {}))
+        await asyncio.sleep(0.01)
+        gc.collect()
+        assert len(batcher._dispatches) == 1
+        return await asyncio.wait_for(pending, 2)
+
+    assert asyncio.run(scenario()) == ["a", "b"]
+    assert not batcher._dispatches
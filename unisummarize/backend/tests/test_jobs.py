@@ -0,0 +1,146 @@
+import asyncio
+from services.jobs import JobManager, JobQueueFull
+
+def _run(coro):
+    return asyncio.run(coro)
+
+def test_jobs_run_in_priority_order(tmp_path):
+    """High priority jobs run before earlier normal ones"""
+    order = []
+
+    async def handler(job, content):
+        text = content.read().decode()
+        order.append(text)
+        return text.upper()
+
+    async def main():
+        manager = JobManager(tmp_path, workers=1)
+        # Queue everything before the worker starts
+        await manager.start(handler)
+        await manager.stop()
+        low = await _submit(manager, b"low", "low")
+        normal = await _submit(manager, b"normal", "normal")
+        high = await _submit(manager, b"high", "high")
+        assert manager.queue_position(high) == 1
+        assert manager.queue_position(low) == 3
+
+        await manager.start(handler)
+        while manager.stats()["completed"] < 3:
+            await asyncio.sleep(0.01)
+        await manager.stop()
+        return manager.get(normal.id)
+
+    job = _run(main())
+    assert order == ["high", "normal", "low"]
+    assert job.status == "completed"
+    assert job.summary == "NORMAL"
+
+async def _submit(manager, content, priority):
+    return await manager.submit(content, "doc.pdf", "academic", "paragraph", priority)
+
+def test_queued_jobs_survive_restart(tmp_path):
+    """Jobs persisted on disk are queued again by a new manager"""
+    async def never_run(job, content):
+        raise AssertionError("should not run")
+
+    async def first_process():
+        manager = JobManager(tmp_path, workers=1)
+        await manager.start(never_run)
+        await manager.stop()
+        return (await manager.submit(b"data", "doc.pdf", "legal", "bullet")).id
+
+    job_id = _run(first_process())
+
+    async def handler(job, content):
+        return f"{job.domain}:{content.read().decode()}"
+
+    async def second_process():
+        manager = JobManager(tmp_path, workers=1)
+        await manager.start(handler)
+        while manager.get(job_id).status != "completed":
+            await asyncio.sleep(0.01)
+        await manager.stop()
+        return manager.get(job_id)
+
+    job = _run(second_process())
+    assert job.summary == "legal:data"
+    assert not (tmp_path / job_id / "input").exists()
+
+def test_failed_jobs_record_error(tmp_path):
+    """Handler errors mark the job failed with the error message"""
+    async def handler(job, content):
+        raise ValueError("Unsupported file format")
+
+    async def main():
+        manager = JobManager(tmp_path, workers=1)
+        await manager.start(handler)
+        job = await manager.submit(b"data", "doc.txt", "legal", "bullet")
+        while not job.finished:
+            await asyncio.sleep(0.01)
+        await manager.stop()
+        return job
+
+    job = _run(main())
+    assert job.status == "failed"
+    assert job.error == "Unsupported file format"
+
+def test_queue_bound_and_result_expiry(tmp_path):
+    """Submissions past the queue size fail; expired results are removed"""
+    async def handler(job, content):
+        return "summary"
+
+    async def main():
+        manager = JobManager(tmp_path, workers=1, max_queue_size=1, result_ttl=0)
+        await manager.start(handler)
+        await manager.stop()
+        job = await manager.submit(b"a", "doc.pdf", "legal", "bullet")
+        try:
+            await manager.submit(b"b", "doc.pdf", "legal", "bullet")
+            raise AssertionError("expected JobQueueFull")
+        except JobQueueFull:
+            pass
+
+        await manager.start(handler)
+        while not job.finished:
+            await asyncio.sleep(0.01)
+        await manager.stop()
+        await asyncio.sleep(0.01)
+        return manager, job
+
+    manager, job = _run(main())
+    assert manager.get(job.id) is None
+    assert not (tmp_path / job.id).exists()
+
+def test_job_metadata_is_written_off_the_event_loop(tmp_path):
+    """Stage changes are persisted on the writer thread, in order"""
+    import json
+    import threading
+
+    writes = []
+
+    async def handler(job, content):
+        manager.set_stage(job, "extracting")
+        manager.set_stage(job, "summarizing")
+        return "summary"
+
+    manager = JobManager(tmp_path, workers=1)
+    write_metadata = manager._write_metadata
+
+    def recording_write(job_id, data):
+        writes.append((threading.current_thread(), data["stage"]))
+        write_metadata(job_id, data)
+
+    manager._write_metadata = recording_write
+
+    async def main():
+        await manager.start(handler)
+        job = await manager.submit(b"data", "doc.pdf", "legal", "bullet")
+        while manager.get(job.id).status != "completed":
+            await asyncio.sleep(0.01)
+        await manager.stop()
+        return job
+
+    job = _run(main())
+    assert [stage for _, stage in writes] == ["queued", "running", "extracting", "summarizing", "completed"]
+    assert all(thread is not threading.main_thread() for thread, _ in writes)
+    assert json.loads((tmp_path / job.id / "job.json").read_text())["status"] == "completed"
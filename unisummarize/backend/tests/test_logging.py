@@ -0,0 +1,120 @@
+import io
+import json
+import logging
+import queue
+from utils.logger import (
+    BatchStreamHandler,
+    BatchingQueueListener,
+    BoundedQueueHandler,
+    JSONFormatter,
+    redact_headers
+)
+
+def _record(message, level=logging.INFO, name="test"):
+    return logging.LogRecord(name, level, __file__, 1, message, None, None)
+
+def test_json_formatter_includes_static_and_extra_fields():
+    """Static fields are merged into every line and the output is valid JSON"""
+    formatter = JSONFormatter({"service": "unisummarize"})
+    record = _record("hello")
+    record.extra_fields = {"context": {"a": 1}}
+
+    data = json.loads(formatter.format(record))
+    assert data["service"] == "unisummarize"
+    assert data["message"] == "hello"
+    assert data["context"] == {"a": 1}
+    assert data["timestamp"].count(".") == 1
+
+def test_drop_policy_discards_info_when_full():
+    """A full queue drops INFO records but keeps warnings"""
+    log_queue = queue.Queue(maxsize=1)
+    handler = BoundedQueueHandler(log_queue, policy="drop")
+    handler.handle(_record("first"))
+    handler.handle(_record("second"))
+    assert handler.dropped == 1
+    assert log_queue.get_nowait().getMessage() == "first"
+
+    handler.handle(_record("warning", level=logging.WARNING))
+    assert log_queue.get_nowait().getMessage() == "warning"
+
+def test_listener_writes_batches_to_logger_handlers():
+    """Queued records are written by the listener in order"""
+    log_queue = queue.Queue()
+    stream = io.StringIO()
+    handler = BatchStreamHandler(stream)
+    handler.setFormatter(JSONFormatter())
+    listener = BatchingQueueListener(log_queue, batch_size=2)
+    listener.handlers["test"] = [handler]
+
+    queue_handler = BoundedQueueHandler(log_queue)
+    for i in range(5):
+        queue_handler.handle(_record(f"message {i}"))
+    listener.start()
+    listener.stop()
+
+    lines = [json.loads(line)["message"] for line in stream.getvalue().splitlines()]
+    assert lines == [f"message {i}" for i in range(5)]
+
+def test_redact_headers_masks_credentials():
+    """API keys never reach the request log"""
+    headers = redact_headers({"X-API-Key": "secret", "Accept": "text/plain"})
+    assert headers == {"X-API-Key": "***", "Accept": "text/plain"}
+
+class _RecordingLogger:
+    def __init__(self):
+        self.records = []
+
+    def info(self, message, extra=None):
+        self.records.append(("info", message, extra["extra_fields"]))
+
+    def warning(self, message, extra=None):
+        self.records.append(("warning", message, extra["extra_fields"]))
+
+def _streaming_app():
+    from starlette.applications import Starlette
+    from starlette.responses import StreamingResponse
+    from starlette.routing import Route
+
+    async def chunks():
+        for _ in range(3):
+            yield b"x" * 100
+
+    async def stream(request):
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return Starlette(routes=[Route("/stream", stream)])
+
+def test_request_log_middleware_counts_streamed_bytes(monkeypatch):
+    """Status, size and timings are recorded without buffering the body"""
+    from starlette.testclient import TestClient
+    import utils.logger as logger_module
+
+    recorder = _RecordingLogger()
+    monkeypatch.setattr(logger_module, "request_logger", recorder)
+    app = logger_module.RequestLogMiddleware(_streaming_app(), sample_rate=0.0, slow_request_ms=0)
+
+    response = TestClient(app).get("/stream?q=1", headers={"X-API-Key": "secret"})
+    assert response.content == b"x" * 300
+
+    level, message, fields = recorder.records[0]
+    assert level == "info"
+    assert fields["status_code"] == 200
+    assert fields["response_bytes"] == 300
+    assert fields["path"] == "/stream?q=1"
+    assert 0 <= fields["ttfb"] <= fields["duration"]
+    assert "headers" not in fields
+
+def test_request_log_middleware_details_for_slow_requests(monkeypatch):
+    """Slow requests are logged as warnings with redacted headers"""
+    from starlette.testclient import TestClient
+    import utils.logger as logger_module
+
+    recorder = _RecordingLogger()
+    monkeypatch.setattr(logger_module, "request_logger", recorder)
+    app = logger_module.RequestLogMiddleware(_streaming_app(), sample_rate=0.0, slow_request_ms=0.0001)
+
+    TestClient(app).get("/stream", headers={"X-API-Key": "secret"})
+
+    level, message, fields = recorder.records[0]
+    assert level == "warning"
+    assert fields["headers"]["x-api-key"] == "***"
@@ -0,0 +1,104 @@
+import pytest
+import asyncio
+import threading
+from services.batcher import MicroBatcher
+from services.inference_pool import InferencePool
+from utils.metrics import (
+    STAGE_SECONDS,
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    current_request_labels,
+    set_request_labels
+)
+
+def test_histogram_merges_thread_shards():
+    """Observations from several threads are merged at collection time"""
+    histogram = Histogram("test_seconds", "Test.", labelnames=("stage",), buckets=(0.1, 1.0))
+
+    def observe():
+        for _ in range(100):
+            histogram.observe(0.05, ("a",))
+            histogram.observe(5.0, ("a",))
+
+    threads = [threading.Thread(target=observe) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    counts = histogram.collect()[("a",)]
+    assert counts[0] == 400  # <= 0.1
+    assert counts[1] == 0    # <= 1.0
+    assert counts[2] == 400  # +Inf
+    assert counts[-1] == pytest.approx(400 * 0.05 + 400 * 5.0)
+
+def test_registry_renders_prometheus_text():
+    """Histograms render cumulative buckets, sum and count"""
+    registry = MetricsRegistry()
+    histogram = registry.register(Histogram("test_seconds", "Test.", labelnames=("stage",), buckets=(0.1, 1.0)))
+    counter = registry.register(Counter("test_total", "Test.", labelnames=("result",)))
+    histogram.observe(0.5, ("generation",))
+    counter.inc(("hit",))
+    counter.inc(("hit",))
+
+    text = registry.render()
+    assert "# TYPE test_seconds histogram" in text
+    assert 'test_seconds_bucket{stage="generation",le="0.1"} 0' in text
+    assert 'test_seconds_bucket{stage="generation",le="1.0"} 1' in text
+    assert 'test_seconds_bucket{stage="generation",le="+Inf"} 1' in text
+    assert 'test_seconds_count{stage="generation"} 1' in text
+    assert 'test_total{result="hit"} 2' in text
+
+def test_request_labels_use_enum_values():
+    """Labels are set per task from the request's enums"""
+    from main import Domain, Format, InputType
+
+    async def handle():
+        set_request_labels(InputType.url, Domain.legal, Format.bullet)
+        return current_request_labels()
+
+    assert asyncio.run(handle()) == ("url", "legal", "bullet")
+    assert current_request_labels() == ("unknown", "unknown", "unknown")
+
+def test_batch_wait_labeled_per_caller():
+    """Each caller's batch wait is recorded with its own request labels"""
+    async def run_batch(items, params):
+        return items
+
+    async def caller(batcher, domain):
+        set_request_labels("text", domain, "paragraph")
+        return await batcher.submit(domain, {})
+
+    async def main():
+        batcher = MicroBatcher(run_batch, max_batch_size=2, max_wait_ms=50, wait_stage="test_wait")
+        return await asyncio.gather(caller(batcher, "legal"), caller(batcher, "medical"))
+
+    assert asyncio.run(main()) == ["legal", "medical"]
+    collected = STAGE_SECONDS.collect()
+    assert ("test_wait", "text", "legal", "paragraph") in collected
+    assert ("test_wait", "text", "medical", "paragraph") in collected
+
+def test_batch_generation_labeled_per_caller():
+    """Queue wait and generation of a shared batch are recorded once for each caller"""
+    pool = InferencePool(max_workers=1)
+
+    async def run_batch(items, params):
+        return await pool.submit(list, items)
+
+    async def caller(batcher, domain):
+        set_request_labels("text", domain, "detailed")
+        return await batcher.submit(domain, {})
+
+    async def main():
+        batcher = MicroBatcher(run_batch, max_batch_size=2, max_wait_ms=50)
+        return await asyncio.gather(caller(batcher, "tax"), caller(batcher, "energy"))
+
+    try:
+        assert asyncio.run(main()) == ["tax", "energy"]
+    finally:
+        pool.shutdown()
+    collected = STAGE_SECONDS.collect()
+    for stage in ("queue_wait", "generation"):
+        for domain in ("tax", "energy"):
+            assert sum(collected[(stage, "text", domain, "detailed")][:-1]) == 1
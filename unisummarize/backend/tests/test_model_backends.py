@@ -0,0 +1,60 @@
+import pytest
+from services.model_backends import (
+    ModelBackend,
+    OnnxBackend,
+    QuantizedBackend,
+    TorchBackend,
+    get_model_backend
+)
+from services.summarizer import MODEL_NAME, SummarizerService, summarizer_service
+from config import settings
+
+def test_get_model_backend_selects_by_name():
+    """Backends are chosen by name; unknown names fall back to torch"""
+    assert isinstance(get_model_backend("quantized"), QuantizedBackend)
+    assert isinstance(get_model_backend("torch"), TorchBackend)
+    assert isinstance(get_model_backend("tensorrt"), TorchBackend)
+
+def test_backend_without_load_cannot_be_created():
+    """An incomplete backend fails when it is created, not at the first model load"""
+    class Incomplete(ModelBackend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+def test_onnx_falls_back_without_optimum(monkeypatch):
+    """The ONNX backend needs optimum and onnxruntime installed"""
+    monkeypatch.setattr(OnnxBackend, "available", classmethod(lambda cls: False))
+    assert isinstance(get_model_backend("onnx"), TorchBackend)
+
+    monkeypatch.setattr(OnnxBackend, "available", classmethod(lambda cls: True))
+    backend = get_model_backend("onnx", "/tmp/models")
+    assert isinstance(backend, OnnxBackend)
+    assert str(backend.export_dir("facebook/bart-large-cnn")) == "/tmp/models/onnx/facebook--bart-large-cnn"
+
+def test_cache_keys_depend_on_backend(monkeypatch):
+    """Summaries from different backends are cached separately; torch keeps its old keys"""
+    assert TorchBackend().cache_tag("model") == "model"
+    assert QuantizedBackend().cache_tag("model") == "model+quantized"
+
+    torch_key = summarizer_service._cache_key("text", "Some text", "legal", "paragraph")
+    monkeypatch.setattr(summarizer_service, "model_backend", QuantizedBackend())
+    assert summarizer_service._cache_key("text", "Some text", "legal", "paragraph") != torch_key
+
+def test_service_loads_configured_model_with_backend(monkeypatch):
+    """load_model uses SUMMARIZATION_MODEL and the configured backend"""
+    loaded = []
+
+    class FakeBackend(TorchBackend):
+        name = "fake"
+
+        def load(self, model_name, tokenizer=None):
+            loaded.append(model_name)
+            return object()
+
+    service = SummarizerService()
+    service.model_backend = FakeBackend()
+    service.load_model()
+    assert loaded == [settings.summarization_model] == [MODEL_NAME]
+    assert service.is_ready
@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+from config import settings
+from services.model_router import ModelRouter, RouteRule, parse_routes
+from services.summarizer import MODEL_NAME, summarizer_service
+from utils.metrics import Counter
+
+DISTIL = "sshleifer/distilbart-cnn-12-6"
+
+def _router(rules):
+    return ModelRouter(
+        "facebook/bart-large-cnn",
+        rules,
+        requests=Counter("requests", ""),
+        generations=Counter("generations", ""),
+        generation_seconds=Counter("seconds", "")
+    )
+
+def test_parse_routes():
+    """Rules are read in order with their conditions"""
+    rules = parse_routes(f"{DISTIL}?max_tokens=512; {DISTIL}?format=paragraph,bullet&domain=corporate;")
+    assert [rule.describe() for rule in rules] == [
+        {"model": DISTIL, "max_tokens": 512},
+        {"model": DISTIL, "formats": ["bullet", "paragraph"], "domains": ["corporate"]}
+    ]
+    assert parse_routes("") == []
+    with pytest.raises(ValueError):
+        parse_routes(f"{DISTIL}?language=en")
+
+def test_first_matching_rule_wins():
+    """Requests go to the first matching rule's model, else the default"""
+    router = _router([
+        RouteRule("small", max_tokens=100),
+        RouteRule("medium", max_tokens=900, formats=["paragraph"]),
+    ])
+    assert router.route(50, "legal", "bullet") == "small"
+    assert router.route(500, "legal", "paragraph") == "medium"
+    assert router.route(500, "legal", "bullet") == "facebook/bart-large-cnn"
+    assert router.route(5000, "legal", "paragraph") == "facebook/bart-large-cnn"
+
+def test_stats_estimate_latency_saved():
+    """Per-model counters and the saving against the default model's mean latency"""
+    router = _router([RouteRule("small", max_tokens=100)])
+    router.route(50, "legal", "bullet")
+    router.route(500, "legal", "bullet")
+    router.record("facebook/bart-large-cnn", 2, 1.0)
+    router.record("small", 4, 0.25)
+
+    stats = router.stats()
+    assert stats["models"]["small"] == {
+        "requests": 1, "generations": 4, "generation_seconds": 1.0, "mean_generation_ms": 250.0
+    }
+    assert stats["models"]["facebook/bart-large-cnn"]["mean_generation_ms"] == 1000.0
+    assert stats["estimated_seconds_saved"] == pytest.approx(3.0)
+
+def test_summaries_are_generated_by_routed_model(monkeypatch):
+    """Routed requests carry their model to generation and never share a batch with others"""
+    calls = []
+
+    async def generate(texts, **params):
+        calls.append((params.get("model_name", MODEL_NAME), len(texts)))
+        return ["summary"] * len(texts)
+
+    monkeypatch.setattr(summarizer_service, "_generate", generate)
+    monkeypatch.setattr(summarizer_service, "cache", None)
+    monkeypatch.setattr(summarizer_service, "router", _router([RouteRule(DISTIL, formats=["paragraph"])]))
+    monkeypatch.setattr(settings, "chunking_enabled", False)
+
+    async def run():
+        return await asyncio.gather(
+            summarizer_service.summarize_text("First text.", "legal", "paragraph"),
+            summarizer_service.summarize_text("Second text.", "legal", "bullet"),
+        )
+
+    asyncio.run(run())
+    assert sorted(calls) == sorted([(DISTIL, 1), (MODEL_NAME, 1)])
+    assert summarizer_service.router.stats()["models"][DISTIL]["generations"] == 1
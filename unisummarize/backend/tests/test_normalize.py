@@ -0,0 +1,44 @@
+import asyncio
+from config import settings
+from services.normalize import NormalizedText, normalize_text
+from services.summarizer import summarizer_service
+
+def test_whitespace_is_collapsed():
+    """Runs of whitespace, including non-breaking spaces, become single spaces"""
+    assert normalize_text("  One\n\ttwo  three\r\n") == "One two three"
+    assert normalize_text("") == ""
+
+def test_text_in_any_script_and_punctuation_are_kept():
+    """Accents, CJK, quotes, apostrophes and symbols survive normalization"""
+    text = "Café “déjà vu” — it’s 20°C; 東京は晴れ。 Cost: $5 (approx.) + 10%"
+    assert normalize_text(text) == text
+
+def test_unwanted_characters_are_dropped():
+    """Emoji, zero-width, soft hyphen and control characters are removed"""
+    assert normalize_text("Good​ news­! 🎉\x00\x07 Done ﻿") == "Good news! Done"
+
+def test_compatibility_forms_are_folded():
+    """NFKC folds ligatures and full-width forms"""
+    assert normalize_text("ﬁnal ＡＢＣ１２３") == "final ABC123"
+
+def test_normalization_is_idempotent():
+    """Normalized text is returned as is and normalizing twice changes nothing"""
+    once = normalize_text("A  messy​ text ✨ here.")
+    assert isinstance(once, NormalizedText)
+    assert normalize_text(once) is once
+    assert normalize_text(str(once)) == once
+
+def test_summarizer_receives_normalized_text(monkeypatch):
+    """summarize_text hands the model normalized text"""
+    seen = []
+
+    async def generate(texts, **params):
+        seen.extend(texts)
+        return ["summary"] * len(texts)
+
+    monkeypatch.setattr(summarizer_service, "_generate", generate)
+    monkeypatch.setattr(summarizer_service, "cache", None)
+    monkeypatch.setattr(settings, "chunking_enabled", False)
+
+    asyncio.run(summarizer_service.summarize_text("The  “new” policy​ starts today 🚀.", "legal", "paragraph"))
+    assert seen == ["The “new” policy starts today ."]
@@ -0,0 +1,67 @@
+import asyncio
+import io
+from PIL import Image
+from services.ocr import OCREngine, preprocess_image
+
+class FakeReader:
+    """Stand-in for easyocr.Reader that records how it was called"""
+    def __init__(self, calls):
+        self.calls = calls
+
+    def readtext(self, image):
+        self.calls.append(("single", [image.shape]))
+        return [([], "single text", 0.9)]
+
+    def readtext_batched(self, images):
+        self.calls.append(("batched", [image.shape for image in images]))
+        return [[([], f"text {i}", 0.9)] for i in range(len(images))]
+
+class FakeOCREngine(OCREngine):
+    def __init__(self, **kwargs):
+        super().__init__(["en"], **kwargs)
+        self.calls = []
+        self.created = 0
+
+    def _create_reader(self):
+        self.created += 1
+        return FakeReader(self.calls)
+
+def _png(width, height, color="RGB"):
+    buffer = io.BytesIO()
+    Image.new(color, (width, height), "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+def test_preprocess_image_downscales_and_grays():
+    """Large color images should become grayscale within the size limit"""
+    image = preprocess_image(_png(4000, 1000), max_side=1000)
+    assert image.ndim == 2
+    assert max(image.shape) == 1000
+
+def test_ocr_engine_batches_queued_images():
+    """Images submitted together should be padded and recognized as one batch"""
+    engine = FakeOCREngine(workers=2, batch_size=4, batch_wait_ms=10)
+
+    async def scenario():
+        return await asyncio.gather(engine.read_text(_png(100, 50)), engine.read_text(_png(60, 80)))
+
+    assert asyncio.run(scenario()) == ["text 0", "text 1"]
+    assert engine.calls == [("batched", [(80, 100), (80, 100)])]
+    assert engine.created == 1
+
+def test_ocr_engine_honors_languages():
+    """Configured languages should be passed to the readers"""
+    assert OCREngine(["en", "fr"]).languages == ["en", "fr"]
+
+def test_invalid_image_fails_only_its_own_request():
+    """A corrupt upload batched with valid images fails alone; the rest are recognized"""
+    engine = FakeOCREngine(workers=1, batch_size=4, batch_wait_ms=10)
+
+    async def scenario():
+        return await asyncio.gather(
+            engine.read_text(_png(100, 50)), engine.read_text(b"garbage"), return_exceptions=True
+        )
+
+    valid, invalid = asyncio.run(scenario())
+    assert valid == "single text"
+    assert isinstance(invalid, Exception)
+    assert engine.calls == [("single", [(50, 100)])]
@@ -0,0 +1,190 @@
+import asyncio
+import socket
+import threading
+import time
+import pytest
+from middleware.auth import RateLimiter, rate_limit_store
+from middleware.rate_limit_store import BatchingRateLimitStore, RedisRateLimitStore, SQLiteRateLimitStore
+
+@pytest.fixture(autouse=True)
+def clear_store():
+    rate_limit_store.clear()
+    yield
+    rate_limit_store.clear()
+
+def test_rate_limiter_blocks_after_limit():
+    """Requests beyond the limit within one window should be rejected"""
+    limiter = RateLimiter(requests_per_hour=3)
+    results = [limiter.hit("client", current_time=100 + i) for i in range(4)]
+    assert [r.limited for r in results] == [False, False, False, True]
+    assert [r.remaining for r in results] == [2, 1, 0, 0]
+
+def test_rate_limiter_weights_previous_window():
+    """Half way into a window, half of the previous window still counts"""
+    limiter = RateLimiter(requests_per_hour=10, window_size=100)
+    for _ in range(10):
+        limiter.hit("client", current_time=150)
+
+    result = limiter.hit("client", current_time=250)
+    assert not result.limited
+    # 10 * 0.5 from the previous window + 1 in the current one
+    assert result.remaining == 4
+    for _ in range(4):
+        assert not limiter.hit("client", current_time=250).limited
+    assert limiter.hit("client", current_time=250).limited
+
+def test_rate_limiter_reset_time():
+    """Reset should be the earliest moment another request is allowed"""
+    limiter = RateLimiter(requests_per_hour=2, window_size=100)
+    limiter.hit("client", current_time=10)
+    limiter.hit("client", current_time=20)
+    result = limiter.hit("client", current_time=30)
+    assert result.limited
+    assert result.reset_at == pytest.approx(100)
+    assert not limiter.hit("client", current_time=result.reset_at + 1).limited
+
+def test_rate_limiter_state_is_constant_size():
+    """Per-client state should not grow with the number of requests"""
+    limiter = RateLimiter(requests_per_hour=1000)
+    for i in range(500):
+        limiter.hit("client", current_time=100 + i * 0.01)
+    assert len(rate_limit_store["client"]) == 3
+
+def test_rate_limiter_evicts_idle_clients():
+    """Clients idle for two windows should be evicted by the periodic sweep"""
+    limiter = RateLimiter(requests_per_hour=10, window_size=100, eviction_interval=50)
+    limiter.hit("idle", current_time=10)
+    limiter.hit("active", current_time=290)
+    assert "idle" not in rate_limit_store
+    assert "active" in rate_limit_store
+
+class FakeRedisServer:
+    """Local stand-in speaking enough of the Redis protocol for the rate limit store"""
+    def __init__(self):
+        self.data = {}
+        self.commands = []
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen()
+        self.url = f"redis://127.0.0.1:{self.sock.getsockname()[1]}/0"
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        reader = conn.makefile("rb")
+        while True:
+            line = reader.readline()
+            if not line:
+                return
+            args = []
+            for _ in range(int(line[1:])):
+                length = int(reader.readline()[1:])
+                args.append(reader.read(length + 2)[:-2].decode())
+            self.commands.append(args[0].upper())
+            conn.sendall(self._execute(args))
+
+    def _execute(self, args):
+        name = args[0].upper()
+        if name == "INCRBY":
+            self.data[args[1]] = self.data.get(args[1], 0) + int(args[2])
+            return b":%d\r\n" % self.data[args[1]]
+        if name == "EXPIRE":
+            return b":1\r\n"
+        if name == "MGET":
+            out = [b"*%d\r\n" % (len(args) - 1)]
+            for key in args[1:]:
+                value = self.data.get(key)
+                out.append(b"$-1\r\n" if value is None else b"$%d\r\n%d\r\n" % (len(str(value)), value))
+            return b"".join(out)
+        return b"-ERR unknown command\r\n"
+
+    def close(self):
+        self.sock.close()
+
+def test_sqlite_store_shares_limits_between_limiters(tmp_path):
+    """Two limiters (as in two workers) on one sqlite store should share a budget"""
+    path = tmp_path / "limits.sqlite3"
+    first = RateLimiter(requests_per_hour=4, store=SQLiteRateLimitStore(path))
+    second = RateLimiter(requests_per_hour=4, store=SQLiteRateLimitStore(path))
+    results = [limiter.hit("client", current_time=100).limited for limiter in (first, second) * 3]
+    assert results == [False, False, False, False, True, True]
+
+def test_redis_store_against_local_stand_in():
+    """The Redis-protocol backend should count through a RESP server"""
+    server = FakeRedisServer()
+    try:
+        limiter = RateLimiter(requests_per_hour=2, store=RedisRateLimitStore(server.url))
+        results = [limiter.hit("client", current_time=100).limited for _ in range(3)]
+        assert results == [False, False, True]
+        assert server.data == {"ratelimit:client:0": 2}
+    finally:
+        server.close()
+
+def test_batching_store_reduces_shared_writes():
+    """Increments should reach the shared store in batches"""
+    server = FakeRedisServer()
+    try:
+        store = BatchingRateLimitStore(RedisRateLimitStore(server.url), batch_size=5, flush_interval=60)
+        limiter = RateLimiter(requests_per_hour=100, store=store)
+        for _ in range(10):
+            assert not limiter.hit("client", current_time=100).limited
+        assert server.commands.count("INCRBY") == 2
+        assert server.data["ratelimit:client:0"] == 10
+        assert limiter.hit("client", current_time=100).remaining == 89
+    finally:
+        server.close()
+
+class FailingStore(SQLiteRateLimitStore):
+    """Shared store whose every call fails, counting the attempts"""
+    def __init__(self):
+        self.calls = 0
+        self.threads = []
+
+    def counts(self, client_id, window_start, window_size):
+        self.calls += 1
+        self.threads.append(threading.current_thread().name)
+        raise ConnectionError("store down")
+
+    def evict(self, before):
+        pass
+
+def test_unavailable_store_fails_open_and_backs_off():
+    """A failing shared store is called off the event loop once, then skipped for a while"""
+    store = FailingStore()
+    limiter = RateLimiter(requests_per_hour=1, store=store, retry_interval=60)
+
+    async def scenario():
+        return [await limiter.hit_async("client") for _ in range(3)]
+
+    assert asyncio.run(scenario()) == [None, None, None]
+    assert store.calls == 1
+    assert store.threads[0].startswith("rate-limit")
+
+def test_memory_store_is_checked_inline():
+    """The in-process store needs no thread hop"""
+    limiter = RateLimiter(requests_per_hour=1)
+
+    async def scenario():
+        return [await limiter.hit_async("client") for _ in range(2)]
+
+    assert [result.limited for result in asyncio.run(scenario())] == [False, True]
+
+def test_batching_store_flushes_idle_increments(tmp_path):
+    """Buffered increments reach the shared store on a timer, without further requests"""
+    shared = SQLiteRateLimitStore(tmp_path / "limits.sqlite3")
+    store = BatchingRateLimitStore(shared, batch_size=100, flush_interval=0.05)
+    try:
+        store.add("client", 0)
+        deadline = time.monotonic() + 2
+        while shared.counts("client", 0, 100)[0] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert shared.counts("client", 0, 100) == (1, 0)
+    finally:
+        store.close()
@@ -0,0 +1,110 @@
+import asyncio
+import json
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from config import settings
+from services.summarizer import StreamFormatter, summarizer_service
+
+SUMMARY = "The study found three effects. Results were robust!  Further work is needed... Done"
+
+def _pieces(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+@pytest.mark.parametrize("format_type", ["bullet", "paragraph", "detailed"])
+@pytest.mark.parametrize("size", [1, 3, 50])
+def test_stream_formatter_matches_full_formatting(format_type, size):
+    """Streamed pieces add up to the same text as formatting the whole summary"""
+    formatter = StreamFormatter(format_type, summarizer_service._format_summary)
+    streamed = "".join(formatter.feed(piece) for piece in _pieces(SUMMARY, size))
+    rest, final = formatter.finish()
+
+    assert streamed + rest == final
+    assert final == summarizer_service._format_summary(SUMMARY, format_type)
+
+def test_stream_formatter_emits_bullets_before_the_end():
+    """Completed sentences are emitted as bullets while generation continues"""
+    formatter = StreamFormatter("bullet", summarizer_service._format_summary)
+    assert formatter.feed("First point. Sec") == "• First point"
+    assert formatter.feed("ond point") == ""
+
+def _fake_generation(events):
+    async def stream_generation(text, params):
+        for event in events:
+            yield event
+    return stream_generation
+
+def test_stream_summary_events(monkeypatch):
+    """Partial and delta events are followed by the complete summary"""
+    monkeypatch.setattr(summarizer_service, "cache", None)
+    monkeypatch.setattr(summarizer_service, "_stream_generation", _fake_generation([
+        ("partial", {"index": 0, "text": "chunk"}),
+        ("token", " Alpha"),
+        ("token", " beta."),
+    ]))
+
+    async def collect():
+        return [event async for event in summarizer_service.stream_summary("Some text", "legal", "paragraph")]
+
+    events = asyncio.run(collect())
+    assert events[0] == ("partial", {"index": 0, "text": "chunk"})
+    assert events[1] == ("delta", {"text": "From a legal perspective, Alpha"})
+    assert events[-1] == ("done", {"summary": "From a legal perspective, Alpha beta."})
+
+def test_stream_endpoint_sends_sse(monkeypatch):
+    """The streaming endpoint frames events as server-sent events"""
+    monkeypatch.setattr(summarizer_service, "cache", None)
+    monkeypatch.setattr(summarizer_service, "_stream_generation", _fake_generation([
+        ("token", "One. "),
+        ("token", "Two."),
+    ]))
+    settings.api_key = "test-api-key"
+    client = TestClient(app)
+
+    response = client.post(
+        "/api/summarize/stream",
+        json={"input_type": "text", "content": "Some text", "domain": "research", "format": "bullet"},
+        headers={"X-API-Key": "test-api-key"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = [block.split("\n") for block in response.text.strip().split("\n\n")]
+    assert events[-1][0] == "event: done"
+    done = json.loads(events[-1][1][len("data: "):])
+    assert done["summary"] == "• The research demonstrates that One\n• Two"
+
+def test_stream_tokens_use_no_reader_threads_and_cancel_generation(monkeypatch):
+    """Deltas reach the loop without a default-executor thread; closing the stream stops generation"""
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    stopped = threading.Event()
+
+    def generate_streaming(text, params, emit, cancelled):
+        for i in range(1000):
+            if cancelled.is_set():
+                stopped.set()
+                return
+            emit(f"token{i} ")
+            time.sleep(0.005)
+
+    monkeypatch.setattr(summarizer_service, "_generate_streaming", generate_streaming)
+
+    async def scenario():
+        # Occupy the only default-executor thread: a reader thread would hang the stream
+        loop = asyncio.get_running_loop()
+        blocker = threading.Event()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=1))
+        loop.run_in_executor(None, blocker.wait)
+        try:
+            stream = summarizer_service._stream_tokens("Some text", {})
+            deltas = [await asyncio.wait_for(stream.__anext__(), 2) for _ in range(3)]
+            await stream.aclose()
+            return deltas
+        finally:
+            blocker.set()
+
+    assert asyncio.run(scenario()) == ["token0 ", "token1 ", "token2 "]
+    assert stopped.wait(2)
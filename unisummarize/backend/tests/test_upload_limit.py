@@ -0,0 +1,101 @@
+import asyncio
+import json
+from middleware.upload_limit import UploadBudget, UploadLimitMiddleware
+
+async def _echo_length_app(scope, receive, send):
+    """Reads the whole body and answers with its length."""
+    size = 0
+    while True:
+        message = await receive()
+        size += len(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": str(size).encode()})
+
+def _scope(path="/upload", content_length=None):
+    headers = [(b"content-length", str(content_length).encode())] if content_length is not None else []
+    return {"type": "http", "method": "POST", "path": path, "headers": headers}
+
+def _call(app, scope, chunks):
+    """Run one request; returns (status, body, number of chunks the app received)."""
+    pending = list(chunks)
+    sent = []
+
+    async def receive():
+        body = pending.pop(0) if pending else b""
+        return {"type": "http.request", "body": body, "more_body": bool(pending)}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    body = b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+    return sent[0]["status"], body, len(chunks) - len(pending)
+
+def test_declared_content_length_over_limit_is_rejected_unread():
+    """A Content-Length above the limit gets 413 before any body is received"""
+    app = UploadLimitMiddleware(_echo_length_app, max_body_size=100, route_limits={}, budget=UploadBudget())
+    status, body, received = _call(app, _scope(content_length=500), [b"x" * 500])
+    assert status == 413
+    assert json.loads(body)["error"]["status_code"] == 413
+    assert received == 0
+
+def test_streamed_body_is_aborted_once_limit_is_crossed():
+    """Without a Content-Length the body is cut off at the chunk that crosses the limit"""
+    app = UploadLimitMiddleware(_echo_length_app, max_body_size=100, route_limits={}, budget=UploadBudget())
+    status, _, received = _call(app, _scope(), [b"x" * 60] * 10)
+    assert status == 413
+    assert received == 2
+
+    status, body, _ = _call(app, _scope(), [b"x" * 50, b"x" * 50])
+    assert (status, body) == (200, b"100")
+
+def test_route_limits_override_default():
+    """Per-route limits apply to their exact path; 0 means no limit"""
+    app = UploadLimitMiddleware(
+        _echo_length_app,
+        max_body_size=100,
+        route_limits={"/small": 10, "/unlimited": 0},
+        budget=UploadBudget()
+    )
+    assert _call(app, _scope("/small", 20), [b"x" * 20])[0] == 413
+    assert _call(app, _scope("/unlimited", 500), [b"x" * 500])[0] == 200
+    assert _call(app, _scope("/other", 50), [b"x" * 50])[0] == 200
+
+def test_budget_caps_bytes_in_flight():
+    """Uploads beyond the in-flight budget get 503 until earlier ones finish"""
+    budget = UploadBudget(max_bytes=100)
+    app = UploadLimitMiddleware(_echo_length_app, max_body_size=0, route_limits={}, budget=budget)
+
+    assert budget.acquire(80)
+    status, _, received = _call(app, _scope(content_length=50), [b"x" * 50])
+    assert (status, received) == (503, 0)
+
+    budget.release(80)
+    assert _call(app, _scope(content_length=50), [b"x" * 50])[0] == 200
+    assert budget.in_flight == 0
+
+def test_budget_is_released_once_the_body_is_received():
+    """Processing a received body, e.g. inference or a streamed response, holds no budget"""
+    budget = UploadBudget(max_bytes=100)
+    seen = []
+
+    async def slow_app(scope, receive, send):
+        while (await receive()).get("more_body"):
+            pass
+        seen.append(budget.in_flight)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"done"})
+
+    app = UploadLimitMiddleware(slow_app, max_body_size=0, route_limits={}, budget=budget)
+    assert _call(app, _scope(content_length=80), [b"x" * 40, b"x" * 40])[0] == 200
+    assert _call(app, _scope(), [b"x" * 30, b"x" * 30])[0] == 200
+    assert seen == [0, 0]
+    assert budget.in_flight == 0
+
+def test_budget_admits_single_oversized_request():
+    """A request larger than the budget still runs when nothing else is in flight"""
+    budget = UploadBudget(max_bytes=10)
+    assert budget.acquire(50)
+    assert not budget.acquire(1)
@@ -0,0 +1,138 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Mapping, Optional
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Parse a Cache-Control header into a dict of lowercase directives."""
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip().strip('"') or None
+    return directives
+
+
+class FetchCacheEntry:
+    """Cached response for one URL along with its HTTP validators."""
+    def __init__(self, body: bytes, text: str, etag: Optional[str], last_modified: Optional[str], expires_at: float):
+        self.body = body
+        self.text = text
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + len(self.text)
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        """Whether the entry can be used without revalidation."""
+        return (now or time.time()) < self.expires_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers for revalidating the entry with the origin server."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class FetchCache:
+    """
+    HTTP cache for fetched URLs.
+
+    Stores response bodies and their extracted text. Entries are served
+    directly while fresh per Cache-Control max-age, and revalidated with
+    If-None-Match/If-Modified-Since afterwards, so a 304 reuses the
+    extracted text without re-parsing. Total size is bounded by max_bytes
+    with LRU eviction.
+    """
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, FetchCacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.fresh_hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, url: str) -> Optional[FetchCacheEntry]:
+        """Return the cached entry for url, fresh or not."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def record_fresh_hit(self) -> None:
+        with self._lock:
+            self.fresh_hits += 1
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def store(self, url: str, headers: Mapping[str, str], body: bytes, text: str) -> None:
+        """Cache a 200 response unless its Cache-Control forbids it."""
+        directives = parse_cache_control(headers.get("Cache-Control"))
+        if "no-store" in directives or "private" in directives:
+            return
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        max_age = self._max_age(directives)
+        if not etag and not last_modified and max_age <= 0:
+            return  # nothing that would let us reuse it
+
+        entry = FetchCacheEntry(body, text, etag, last_modified, time.time() + max_age)
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(url, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[url] = entry
+            self._bytes += entry.size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self.evictions += 1
+
+    def revalidated(self, url: str, headers: Mapping[str, str]) -> None:
+        """Refresh an entry after a 304 Not Modified response."""
+        with self._lock:
+            entry = self._entries.get(url)
+            self.revalidations += 1
+            if entry is None:
+                return
+            entry.expires_at = time.time() + self._max_age(parse_cache_control(headers.get("Cache-Control")))
+            entry.etag = headers.get("ETag") or entry.etag
+            entry.last_modified = headers.get("Last-Modified") or entry.last_modified
+
+    @staticmethod
+    def _max_age(directives: Dict[str, Optional[str]]) -> int:
+        """Freshness lifetime in seconds from parsed Cache-Control directives."""
+        if "no-cache" in directives:
+            return 0
+        value = directives.get("s-maxage") or directives.get("max-age")
+        try:
+            return max(0, int(value)) if value else 0
+        except ValueError:
+            return 0
+
+    def stats(self) -> dict:
+        """Return fetch cache counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "fresh_hits": self.fresh_hits,
+                "revalidations": self.revalidations,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
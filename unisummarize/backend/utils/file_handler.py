@@ -1,7 +1,11 @@
 from fastapi import HTTPException, UploadFile
-from typing import List
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, List
+import io
 import magic
+import mmap
 import os
+import re
 
 # Allowed file types and their MIME types
 ALLOWED_FILE_TYPES = {
@@ -21,6 +25,9 @@ class FileHandler:
         """
         Validate file type and size.
         Returns True if valid, raises HTTPException if not.
+
+        Only the first 2048 bytes are read (for MIME type detection); the
+        size comes from the spooled upload without reading it.
         """
         try:
             # Read first 2048 bytes for MIME type detection
@@ -38,16 +45,12 @@ class FileHandler:
                 )
             
             # Check file size
-            file_size = 0
-            while chunk := await file.read(8192):
-                file_size += len(chunk)
-                if file_size > MAX_FILE_SIZE:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"File size too large. Maximum size allowed: {MAX_FILE_SIZE/1024/1024}MB"
-                    )
+            if FileHandler.get_upload_size(file) > MAX_FILE_SIZE:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"File size too large. Maximum size allowed: {MAX_FILE_SIZE/1024/1024}MB"
+                )
             
-            await file.seek(0)  # Reset file pointer
             return True
             
         except Exception as e:
@@ -55,6 +58,42 @@ class FileHandler:
                 raise HTTPException(status_code=500, detail=f"Error validating file: {str(e)}")
             raise e
 
+    @staticmethod
+    def get_upload_size(file: UploadFile) -> int:
+        """Size of an upload, as counted while it was spooled or from the spooled file."""
+        if file.size is not None:
+            return file.size
+        position = file.file.tell()
+        size = file.file.seek(0, os.SEEK_END)
+        file.file.seek(position)
+        return size
+
+    @staticmethod
+    @contextmanager
+    def open_upload(file: UploadFile) -> Iterator[BinaryIO]:
+        """
+        Give extractors read access to an upload without copying it.
+
+        Uploads spooled to disk are memory-mapped; small uploads still held
+        in memory are read from the spool buffer directly.
+        """
+        spooled = file.file
+        mapped = None
+        # SpooledTemporaryFile keeps small files in memory until they roll over;
+        # asking an in-memory spool for fileno() would force it to disk
+        if getattr(spooled, "_rolled", True) and FileHandler.get_upload_size(file) > 0:
+            try:
+                mapped = mmap.mmap(spooled.fileno(), 0, access=mmap.ACCESS_READ)
+            except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+                mapped = None
+        try:
+            stream = mapped if mapped is not None else spooled
+            stream.seek(0)
+            yield stream
+        finally:
+            if mapped is not None:
+                mapped.close()
+
     @staticmethod
     def get_file_extension(filename: str) -> str:
         """Get file extension from filename."""
@@ -96,30 +135,20 @@ class FileHandler:
             print(f"Error cleaning up temporary file: {str(e)}")
 
 # URL validation
+URL_PATTERN = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
 def validate_url(url: str) -> bool:
     """
-    Validate URL format and accessibility.
-    Returns True if valid, raises HTTPException if not.
+    Validate URL format.
+    Returns True if valid, raises HTTPException if not. Accessibility is
+    checked by the fetch itself, so no extra request is made here.
     """
-    import re
-    import requests
-    
-    # Basic URL format validation
-    url_pattern = re.compile(
-        r'^https?://'  # http:// or https://
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-        r'localhost|'  # localhost...
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-        r'(?::\d+)?'  # optional port
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-    
-    if not url_pattern.match(url):
+    if not URL_PATTERN.match(url):
         raise HTTPException(status_code=400, detail="Invalid URL format")
-    
-    try:
-        # Check if URL is accessible
-        response = requests.head(url, timeout=5)
-        response.raise_for_status()
-        return True
-    except requests.RequestException as e:
-        raise HTTPException(status_code=400, detail=f"URL not accessible: {str(e)}")
+    return True
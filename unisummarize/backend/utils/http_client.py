@@ -0,0 +1,133 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from config import settings
+
+
+class FetchError(Exception):
+    """Raised when a URL cannot be fetched."""
+
+
+class FetchResult:
+    """Body and metadata of a fetched URL."""
+    def __init__(self, url: str, status_code: int, headers: httpx.Headers, content: bytes, encoding: Optional[str]):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding or "utf-8"
+
+    @property
+    def text(self) -> str:
+        """Body decoded with the response charset."""
+        return self.content.decode(self.encoding, errors="replace")
+
+
+class HttpFetcher:
+    """
+    Async URL fetcher on a shared, pooled HTTP client.
+
+    Connections are kept alive between requests, concurrent requests per
+    host are capped (per-host state exists only while the host has
+    requests in flight), and response bodies are streamed with a size limit so
+    an oversized page is rejected without being read into memory.
+    """
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        max_connections: int = 100,
+        max_connections_per_host: int = 10,
+        max_response_bytes: int = 5 * 1024 * 1024
+    ):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.max_response_bytes = max_response_bytes
+        self._client: Optional[httpx.AsyncClient] = None
+        # host -> [semaphore, requests holding or waiting for it]
+        self._host_limits: Dict[str, List] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Create the pooled client on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                follow_redirects=True,
+                headers={"User-Agent": "UniSummarize/1.0"}
+            )
+        return self._client
+
+    @asynccontextmanager
+    async def _host_slot(self, url: str) -> AsyncIterator[None]:
+        """
+        Hold one of the URL host's concurrent request slots. The host's
+        semaphore is dropped once no request holds or waits for it, so
+        fetching many distinct hosts does not grow state without bound.
+        """
+        host = urlsplit(url).netloc.lower()
+        entry = self._host_limits.get(host)
+        if entry is None:
+            entry = self._host_limits[host] = [asyncio.Semaphore(self.max_connections_per_host), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and self._host_limits.get(host) is entry:
+                del self._host_limits[host]
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchResult:
+        """GET a URL and return its body, raising FetchError on failure."""
+        async with self._host_slot(url):
+            try:
+                async with self._get_client().stream("GET", url, headers=headers) as response:
+                    if response.status_code >= 400:
+                        raise FetchError(f"HTTP {response.status_code} for {url}")
+
+                    declared = response.headers.get("Content-Length")
+                    if declared and declared.isdigit() and int(declared) > self.max_response_bytes:
+                        raise FetchError(f"Response too large ({declared} bytes)")
+
+                    chunks = []
+                    size = 0
+                    async for chunk in response.aiter_bytes():
+                        size += len(chunk)
+                        if size > self.max_response_bytes:
+                            raise FetchError(
+                                f"Response too large (over {self.max_response_bytes} bytes)"
+                            )
+                        chunks.append(chunk)
+
+                    return FetchResult(
+                        str(response.url),
+                        response.status_code,
+                        response.headers,
+                        b"".join(chunks),
+                        response.charset_encoding
+                    )
+            except httpx.HTTPError as e:
+                raise FetchError(str(e) or type(e).__name__)
+
+    async def close(self) -> None:
+        """Close pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Shared fetcher used by the summarizer
+http_fetcher = HttpFetcher(
+    timeout=settings.http_timeout,
+    max_connections=settings.http_max_connections,
+    max_connections_per_host=settings.http_max_connections_per_host,
+    max_response_bytes=settings.http_max_response_bytes
+)
@@ -1,9 +1,14 @@
+import atexit
 import logging
+import os
+import queue
+import random
 import sys
+import threading
+import time
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, RotatingFileHandler
 import json
-from datetime import datetime
 from config import settings
 
 # Create logs directory if it doesn't exist
@@ -16,54 +21,194 @@ ERROR_LOG_FILE = LOGS_DIR / "error.log"
 REQUEST_LOG_FILE = LOGS_DIR / "requests.log"
 
 class JSONFormatter(logging.Formatter):
-    """Custom JSON formatter for structured logging"""
+    """
+    Custom JSON formatter for structured logging.
+
+    Timestamps are built from record.created with the date-time part cached
+    per second, static fields are serialized once, and the JSON string is
+    memoized on the record so several handlers share one serialization.
+    """
+    def __init__(self, static_fields: dict = None):
+        super().__init__()
+        static = json.dumps(static_fields or {})
+        self._static_fragment = static[1:-1]
+        self._cached_second = None
+        self._cached_prefix = ""
+
+    def _timestamp(self, created: float) -> str:
+        second = int(created)
+        if second != self._cached_second:
+            self._cached_second = second
+            self._cached_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        return f"{self._cached_prefix}.{int((created - second) * 1_000_000):06d}"
+
     def format(self, record):
+        cached = getattr(record, "_json", None)
+        if cached is not None:
+            return cached
+
         log_obj = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "message": record.getMessage(),
             "module": record.module,
             "function": record.funcName,
             "line": record.lineno
         }
-        
+
         # Add exception info if present
-        if record.exc_info:
+        if record.exc_info and record.exc_info[0] is not None:
             log_obj["exception"] = {
                 "type": str(record.exc_info[0].__name__),
                 "message": str(record.exc_info[1]),
                 "traceback": self.formatException(record.exc_info)
             }
-        
+
         # Add extra fields if present
         if hasattr(record, "extra_fields"):
             log_obj.update(record.extra_fields)
-        
-        return json.dumps(log_obj)
+
+        output = json.dumps(log_obj, default=str)
+        if self._static_fragment:
+            output = f"{{{self._static_fragment}, {output[1:]}"
+        record._json = output
+        return output
+
+class BatchStreamHandler(logging.StreamHandler):
+    """Stream handler that can write a batch of records with one write and flush."""
+    def emit_batch(self, records):
+        data = "".join(self.format(record) + self.terminator for record in records)
+        with self.lock:
+            self.stream.write(data)
+            self.flush()
+
+class BatchRotatingFileHandler(RotatingFileHandler):
+    """Rotating file handler that can write a batch of records with one write and flush."""
+    def emit_batch(self, records):
+        data = "".join(self.format(record) + self.terminator for record in records)
+        with self.lock:
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0 and self.stream.tell() + len(data) >= self.maxBytes:
+                self.doRollover()
+            self.stream.write(data)
+            self.flush()
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Queue handler with a drop-or-block policy for a bounded queue.
+
+    With the "drop" policy, records below WARNING are discarded when the
+    queue is full so the event loop never waits on logging; warnings and
+    errors always block until there is room.
+    """
+    def __init__(self, log_queue: queue.Queue, policy: str = "drop"):
+        super().__init__(log_queue)
+        self.policy = policy
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Formatting happens on the listener thread; only resolve the message here
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        return record
+
+    def enqueue(self, record):
+        if self.policy == "drop" and record.levelno < logging.WARNING:
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+        else:
+            self.queue.put(record)
+
+class BatchingQueueListener:
+    """
+    Background thread that drains the log queue in batches and hands each
+    batch to the destination handlers of the record's logger.
+    """
+    _sentinel = None
+
+    def __init__(self, log_queue: queue.Queue, batch_size: int = 256):
+        self.queue = log_queue
+        self.batch_size = batch_size
+        self.handlers = {}
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="log-listener", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            record = self.queue.get()
+            batch = [record]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = self._sentinel in batch
+            self._write([record for record in batch if record is not self._sentinel])
+            if stop:
+                return
+
+    def _write(self, records):
+        by_logger = {}
+        for record in records:
+            by_logger.setdefault(record.name, []).append(record)
+        for name, group in by_logger.items():
+            for handler in self.handlers.get(name, []):
+                accepted = [record for record in group if record.levelno >= handler.level]
+                if not accepted:
+                    continue
+                try:
+                    handler.emit_batch(accepted)
+                except Exception:
+                    for record in accepted:
+                        handler.handleError(record)
+
+    def stop(self):
+        """Write out everything queued and stop the thread."""
+        if self._thread is not None:
+            self.queue.put(self._sentinel)
+            self._thread.join()
+            self._thread = None
+
+# Shared queue and listener for all loggers
+log_queue = queue.Queue(maxsize=settings.log_queue_size)
+log_listener = BatchingQueueListener(log_queue, batch_size=settings.log_batch_size)
+_queue_handler = BoundedQueueHandler(log_queue, policy=settings.log_queue_policy)
+
+STATIC_FIELDS = {"service": "unisummarize", "pid": os.getpid()}
 
 def setup_logger(name: str, log_file: Path, level=logging.INFO):
-    """Set up a logger with both file and console handlers"""
+    """Set up a logger whose file and console output is written by the log listener"""
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    
+
     # Prevent duplicate handlers
     if logger.handlers:
         return logger
-    
+
+    formatter = JSONFormatter(STATIC_FIELDS)
+
     # File handler with rotation
-    file_handler = RotatingFileHandler(
+    file_handler = BatchRotatingFileHandler(
         log_file,
         maxBytes=10*1024*1024,  # 10MB
         backupCount=5
     )
-    file_handler.setFormatter(JSONFormatter())
-    logger.addHandler(file_handler)
-    
+    file_handler.setFormatter(formatter)
+
     # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(JSONFormatter())
-    logger.addHandler(console_handler)
-    
+    console_handler = BatchStreamHandler(sys.stdout)
+    console_handler.setFormatter(formatter)
+
+    log_listener.handlers[name] = [file_handler, console_handler]
+    logger.addHandler(_queue_handler)
+
     return logger
 
 # Create loggers
@@ -71,65 +216,101 @@ app_logger = setup_logger("app", APP_LOG_FILE)
 error_logger = setup_logger("error", ERROR_LOG_FILE, level=logging.ERROR)
 request_logger = setup_logger("request", REQUEST_LOG_FILE)
 
+log_listener.start()
+atexit.register(log_listener.stop)
+
+def get_log_stats() -> dict:
+    """Return logging queue counters."""
+    return {
+        "queued": log_queue.qsize(),
+        "capacity": log_queue.maxsize,
+        "dropped": _queue_handler.dropped,
+        "policy": _queue_handler.policy
+    }
+
+SENSITIVE_HEADERS = {"x-api-key", "authorization", "cookie"}
+
+def redact_headers(headers) -> dict:
+    """Copy request headers, masking credentials."""
+    return {
+        name: "***" if name.lower() in SENSITIVE_HEADERS else value
+        for name, value in headers.items()
+    }
+
+def _scope_headers(scope) -> dict:
+    """Decode the raw ASGI header list of a request."""
+    return {name.decode("latin-1"): value.decode("latin-1") for name, value in scope.get("headers", [])}
+
 class RequestLogMiddleware:
-    """Middleware to log all requests"""
-    async def __call__(self, request, call_next):
-        # Start timer
-        start_time = datetime.utcnow()
-        
-        # Get request details
+    """
+    ASGI middleware to log all requests.
+
+    `send` is wrapped to record the status, response size, time to first
+    byte and total duration; response bodies are passed through untouched,
+    so streaming responses stay streaming. Headers are only logged for
+    sampled requests, for slow requests, or when LOG_REQUEST_DETAILS is set.
+    """
+    def __init__(self, app, sample_rate: float = None, slow_request_ms: float = None):
+        self.app = app
+        self.sample_rate = settings.log_sample_rate if sample_rate is None else sample_rate
+        self.slow_request_ms = settings.log_slow_request_ms if slow_request_ms is None else slow_request_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        response = {"status_code": None, "response_bytes": 0, "ttfb": None}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status_code"] = message["status"]
+                response["ttfb"] = round(time.perf_counter() - start, 6)
+            elif message["type"] == "http.response.body":
+                response["response_bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        query = scope.get("query_string", b"")
         request_details = {
-            "method": request.method,
-            "url": str(request.url),
-            "client_ip": request.client.host,
-            "headers": dict(request.headers),
-            "timestamp": start_time.isoformat()
+            "method": scope["method"],
+            "path": scope["path"] + ("?" + query.decode("latin-1") if query else ""),
+            "client_ip": scope["client"][0] if scope.get("client") else None
         }
-        
+
         try:
-            # Process request
-            response = await call_next(request)
-            
-            # Debug log response type and content
-            request_logger.info(
-                f"Response type: {type(response)}"
-            )
-            if hasattr(response, "body"):
-                body = await response.body()
-                request_logger.info(
-                    f"Response body: {body.decode('utf-8') if body else 'empty'}"
-                )
-            
-            # Calculate duration
-            duration = (datetime.utcnow() - start_time).total_seconds()
-            
-            # Log request details
-            request_logger.info(
-                "Request processed",
-                extra={
-                    "extra_fields": {
-                        **request_details,
-                        "status_code": response.status_code,
-                        "duration": duration
-                    }
-                }
-            )
-            
-            return response
-            
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            # Log error details
+            request_details["headers"] = redact_headers(_scope_headers(scope))
             error_logger.exception(
                 "Request failed",
                 extra={
                     "extra_fields": {
                         **request_details,
+                        "duration": round(time.perf_counter() - start, 6),
                         "error": str(e)
                     }
                 }
             )
             raise
 
+        duration = time.perf_counter() - start
+        slow = self.slow_request_ms > 0 and duration * 1000 >= self.slow_request_ms
+        if slow or settings.log_request_details or random.random() < self.sample_rate:
+            request_details["headers"] = redact_headers(_scope_headers(scope))
+
+        log = request_logger.warning if slow else request_logger.info
+        log(
+            "Slow request processed" if slow else "Request processed",
+            extra={
+                "extra_fields": {
+                    **request_details,
+                    **response,
+                    "duration": round(duration, 6)
+                }
+            }
+        )
+
 def log_error(error: Exception, context: dict = None):
     """Helper function to log errors with context"""
     error_logger.exception(
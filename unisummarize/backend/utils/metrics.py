@@ -0,0 +1,254 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Request labels (input_type, domain, format) for everything measured in the current task
+REQUEST_LABEL_NAMES = ("input_type", "domain", "format")
+_request_labels: ContextVar[Tuple[str, str, str]] = ContextVar(
+    "request_labels", default=("unknown", "unknown", "unknown")
+)
+
+
+def _label_value(value) -> str:
+    """Use the value of enum members (InputType, Domain, Format) as label values."""
+    return str(getattr(value, "value", value))
+
+
+def set_request_labels(input_type, domain, format_type) -> None:
+    """Label the metrics recorded while handling the current request."""
+    _request_labels.set((_label_value(input_type), _label_value(domain), _label_value(format_type)))
+
+
+def current_request_labels() -> Tuple[str, str, str]:
+    """Labels of the request being handled in the current task."""
+    return _request_labels.get()
+
+
+# Labels of every request in the micro-batch the current task dispatches, if any
+_batch_labels: ContextVar[Optional[List[Tuple[str, str, str]]]] = ContextVar("batch_labels", default=None)
+
+
+def set_batch_labels(labels: List[Tuple[str, str, str]]) -> None:
+    """Attribute the batch stages recorded in the current task to each of these requests."""
+    _batch_labels.set(labels)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class _PerThread:
+    """
+    Per-thread shards of metric values.
+
+    Each thread updates only its own dict, so recording takes no lock; the
+    shards are merged when the metrics are rendered.
+    """
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._lock = threading.Lock()
+
+    def shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            self._local.shard = shard
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def shards(self) -> List[dict]:
+        with self._lock:
+            return list(self._shards)
+
+
+class Counter:
+    """Monotonic counter with labels."""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = _PerThread()
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1) -> None:
+        shard = self._values.shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def collect(self) -> Dict[Tuple[str, ...], float]:
+        totals: Dict[Tuple[str, ...], float] = {}
+        for shard in self._values.shards():
+            for labels, value in list(shard.items()):
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+            for labels, value in sorted(self.collect().items())
+        ]
+
+
+class Histogram:
+    """Histogram with fixed buckets and labels."""
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = _PerThread()
+
+    def observe(self, value: float, labels: Tuple[str, ...] = ()) -> None:
+        shard = self._values.shard()
+        counts = shard.get(labels)
+        if counts is None:
+            # One slot per bucket, one for +Inf, then the running sum
+            counts = [0] * (len(self.buckets) + 2)
+            shard[labels] = counts
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def collect(self) -> Dict[Tuple[str, ...], List[float]]:
+        totals: Dict[Tuple[str, ...], List[float]] = {}
+        for shard in self._values.shards():
+            for labels, counts in list(shard.items()):
+                merged = totals.setdefault(labels, [0] * len(counts))
+                for i, value in enumerate(counts):
+                    merged[i] += value
+        return totals
+
+    def render(self) -> List[str]:
+        lines = []
+        bounds = [repr(float(bound)) for bound in self.buckets] + ["+Inf"]
+        for labels, counts in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                bucket_labels = _format_labels(self.labelnames + ("le",), labels + (bound,))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {counts[-1]}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """Gauge whose value is read from a callback at render time."""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, read: Callable[[], float]):
+        self.name = name
+        self.documentation = documentation
+        self._read = read
+
+    def render(self) -> List[str]:
+        return [f"{self.name} {self._read()}"]
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered in the Prometheus text format."""
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def register(self, metric):
+        """Add a metric; registering a name twice replaces the earlier metric."""
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.register(Histogram(
+    "unisummarize_stage_seconds",
+    "Time spent in each summarization stage.",
+    labelnames=("stage",) + REQUEST_LABEL_NAMES
+))
+
+CACHE_LOOKUPS = registry.register(Counter(
+    "unisummarize_cache_lookups_total",
+    "Summary and URL fetch cache lookups by result.",
+    labelnames=("cache", "result") + REQUEST_LABEL_NAMES
+))
+
+UPLOAD_REJECTIONS = registry.register(Counter(
+    "unisummarize_upload_rejections_total",
+    "Request bodies rejected before being received, by reason (too_large, busy).",
+    labelnames=("reason",)
+))
+
+MODEL_REQUESTS = registry.register(Counter(
+    "unisummarize_model_requests_total",
+    "Summaries routed to each model.",
+    labelnames=("model",)
+))
+
+MODEL_GENERATIONS = registry.register(Counter(
+    "unisummarize_model_generations_total",
+    "Inputs generated by each model, chunks included.",
+    labelnames=("model",)
+))
+
+MODEL_GENERATION_SECONDS = registry.register(Counter(
+    "unisummarize_model_generation_seconds_total",
+    "Generation time summed over the inputs of each model.",
+    labelnames=("model",)
+))
+
+
+def observe_stage(stage: str, seconds: float, labels: Optional[Tuple[str, str, str]] = None) -> None:
+    """Record the duration of a stage for the current request."""
+    STAGE_SECONDS.observe(seconds, (stage,) + (labels or _request_labels.get()))
+
+
+def observe_batch_stage(stage: str, seconds: float) -> None:
+    """
+    Record a stage shared by a whole batch once for every request in it,
+    or for the current request outside a batch.
+    """
+    for labels in _batch_labels.get() or [_request_labels.get()]:
+        STAGE_SECONDS.observe(seconds, (stage,) + labels)
+
+
+def count_cache_lookup(cache: str, result: str) -> None:
+    """Count a cache lookup for the current request."""
+    CACHE_LOOKUPS.inc((cache, result) + _request_labels.get())
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """Time the enclosed block as a stage of the current request."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start)
@@ -75,6 +75,45 @@ const Summarize = () => {
     }
   };
 
+  // Read server-sent events from a streaming response, showing the summary as it is generated
+  const readSummaryStream = async (response) => {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let summary = '';
+
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const rawEvent = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+
+        let event = 'message';
+        let data = '';
+        for (const line of rawEvent.split('\n')) {
+          if (line.startsWith('event: ')) event = line.slice(7);
+          else if (line.startsWith('data: ')) data += line.slice(6);
+        }
+        const payload = data ? JSON.parse(data) : {};
+
+        if (event === 'delta') {
+          summary += payload.text;
+          setResult(summary);
+          setIsLoading(false);
+        } else if (event === 'done') {
+          setResult(payload.summary);
+          setIsLoading(false);
+        } else if (event === 'error') {
+          throw new Error(payload.detail || 'Failed to get summary.');
+        }
+      }
+    }
+  };
+
   const handleSubmit = async (e) => {
     e.preventDefault();
     setIsLoading(true);
@@ -92,13 +131,18 @@ const Summarize = () => {
           domain,
           format,
         };
-        response = await fetch('/api/summarize', {
+        response = await fetch('/api/summarize/stream', {
           method: 'POST',
           headers: {
             'Content-Type': 'application/json',
+            Accept: 'text/event-stream',
           },
           body: JSON.stringify(payload),
         });
+        if (response.ok) {
+          await readSummaryStream(response);
+          return;
+        }
       } else if (inputType === 'file' || inputType === 'image') {
         if (!file) {
           throw new Error('Please select a file to upload.');